@@ -0,0 +1,368 @@
+"""
+Servidor HTTP local que substitui o books.toscrape.com nos benchmarks.
+
+Três modos de operação:
+- synthetic: gera um catálogo sintético com a mesma estrutura do site
+  (categorias, listagens paginadas de 20 livros e páginas de detalhe), com
+  quantidade de categorias/livros, latência e taxa de erros configuráveis;
+- record: funciona como proxy para o site real e grava cada resposta em disco;
+- replay: serve apenas as respostas gravadas, sem acesso à rede.
+
+Uso:
+    python -m benchmarks.catalog_server synthetic --categories 50 --books 10000
+    python -m benchmarks.catalog_server record --upstream https://books.toscrape.com/ --dir recorded
+    python -m benchmarks.catalog_server replay --dir recorded
+
+Depois aponte URL_TO_SCRAPE para http://127.0.0.1:8765/.
+GET /__stats__ retorna os contadores de requisições do servidor em JSON.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urljoin, urlsplit
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+import requests
+
+BOOKS_PER_PAGE = 20
+RATING_WORDS = ["One", "Two", "Three", "Four", "Five"]
+STATS_PATH = "/__stats__"
+
+# Página servida: status, corpo e content-type
+Response = Tuple[int, bytes, str]
+
+
+class SyntheticCatalog:
+    """
+    Gera as páginas de um catálogo sintético de forma determinística.
+    Nada é mantido em memória: cada página é montada a partir da URL, então o
+    catálogo pode ter milhões de livros. O site real envia UTF-8 sem charset
+    no Content-Type, e o catálogo sintético faz o mesmo.
+    Com revision > 0, o preço de um a cada sete livros muda, simulando
+    alterações no site entre duas ingestões.
+    """
+
+    def __init__(self, categories: int, books: int, revision: int = 0):
+        self.categories = max(1, categories)
+        self.books = max(self.categories, books)
+        self.revision = revision
+
+    # Livros da categoria: fatias contíguas de ids, a última leva o resto
+    def category_range(self, category: int) -> range:
+        per_category = self.books // self.categories
+        start = category * per_category
+        end = self.books if category == self.categories - 1 else start + per_category
+        return range(start, end)
+
+    @staticmethod
+    def category_slug(category: int) -> str:
+        # O id 1 é a categoria raiz ("books_1"), como no site real
+        return f"category-{category + 1}_{category + 2}"
+
+    @staticmethod
+    def book_slug(book: int) -> str:
+        return f"book-{book + 1}_{book + 1}"
+
+    def book_price(self, book: int) -> str:
+        cents = (book * 7919) % 5000 + 1000
+        if self.revision and book % 7 == 0:
+            cents += self.revision * 17
+        return f"£{cents // 100}.{cents % 100:02d}"
+
+    def render(self, path: str) -> Optional[str]:
+        """Retorna o HTML da página do caminho, ou None se não existir"""
+        path = path.split("?", 1)[0]
+        if path in ("/", "/index.html"):
+            return self.__listing(range(self.books), "Books", 1, depth=0)
+
+        match = re.fullmatch(
+            r"/catalogue/category/books(?:_1|/category-(\d+)_\d+)/"
+            r"(?:index|page-(\d+))\.html",
+            path,
+        )
+        if match:
+            page = int(match.group(2) or 1)
+            if match.group(1) is None:
+                return self.__listing(range(self.books), "Books", page, depth=3)
+            category = int(match.group(1)) - 1
+            if not 0 <= category < self.categories:
+                return None
+            return self.__listing(
+                self.category_range(category), f"Category {category + 1}", page
+            )
+
+        match = re.fullmatch(r"/catalogue/book-(\d+)_\d+/index\.html", path)
+        if match and 0 < int(match.group(1)) <= self.books:
+            return self.__book(int(match.group(1)) - 1)
+        return None
+
+    def __sidebar(self, prefix: str) -> str:
+        links = "".join(
+            f'<li><a href="{prefix}catalogue/category/books/'
+            f'{self.category_slug(category)}/index.html">'
+            f"Category {category + 1}</a></li>"
+            for category in range(self.categories)
+        )
+        return (
+            '<div class="side_categories"><ul class="nav nav-list"><li>'
+            f'<a href="{prefix}catalogue/category/books_1/index.html">Books</a>'
+            f"<ul>{links}</ul></li></ul></div>"
+        )
+
+    def __listing(self, books: range, title: str, page: int, depth: int = 4) -> str:
+        # depth: quantos níveis a página está abaixo da raiz do site
+        pages = max(1, -(-len(books) // BOOKS_PER_PAGE))
+        if not 1 <= page <= pages:
+            return None
+        prefix = "../" * depth
+        to_catalogue = "../" * (depth - 1) if depth else "catalogue/"
+        first = (page - 1) * BOOKS_PER_PAGE
+
+        articles = "".join(
+            '<li class="col-xs-6 col-sm-4 col-md-3 col-lg-3">'
+            '<article class="product_pod"><div class="image_container">'
+            f'<a href="{to_catalogue}{self.book_slug(book)}/index.html">'
+            f'<img src="{prefix}media/cache/{book}.jpg" class="thumbnail"></a>'
+            f'</div><p class="star-rating {RATING_WORDS[book % 5]}"></p>'
+            f'<h3><a href="{to_catalogue}{self.book_slug(book)}/index.html" '
+            f'title="Book {book + 1}">Book {book + 1}</a></h3>'
+            f'<div class="product_price"><p class="price_color">'
+            f"{self.book_price(book)}</p>"
+            '<p class="instock availability">In stock</p></div></article></li>'
+            for book in books[first : first + BOOKS_PER_PAGE]
+        )
+        pager = ""
+        if page < pages:
+            next_href = f"page-{page + 1}.html"
+            if depth == 0:
+                next_href = f"catalogue/category/books_1/{next_href}"
+            pager = f'<ul class="pager"><li class="next"><a href="{next_href}">next</a></li></ul>'
+
+        return (
+            f"<html><head><title>{title} | Books to Scrape</title></head><body>"
+            '<div class="container-fluid page"><div class="page_inner">'
+            f'<div class="row"><aside class="sidebar">{self.__sidebar(prefix)}</aside>'
+            f'<div class="col-sm-8"><h1>{title}</h1><section><ol class="row">'
+            f"{articles}</ol>{pager}</section></div></div></div></div></body></html>"
+        )
+
+    def __book(self, book: int) -> str:
+        category = min(book // (self.books // self.categories), self.categories - 1)
+        price = self.book_price(book)
+        stock = book % 22 + 1
+        return (
+            f"<html><head><title>Book {book + 1} | Books to Scrape</title></head>"
+            '<body><div class="container-fluid page"><div class="page_inner">'
+            '<ul class="breadcrumb"><li><a href="../../index.html">Home</a></li>'
+            '<li><a href="../category/books_1/index.html">Books</a></li>'
+            f'<li><a href="../category/books/{self.category_slug(category)}/index.html">'
+            f'Category {category + 1}</a></li><li class="active">Book {book + 1}</li>'
+            '</ul><article class="product_page"><div class="row">'
+            '<div class="col-sm-6"><div id="product_gallery">'
+            f'<img src="../../media/cache/{book}.jpg" alt="Book {book + 1}" /></div></div>'
+            f'<div class="col-sm-6 product_main"><h1>Book {book + 1}</h1>'
+            f'<p class="price_color">{price}</p>'
+            f'<p class="instock availability">In stock ({stock} available)</p>'
+            f'<p class="star-rating {RATING_WORDS[book % 5]}"></p></div></div>'
+            '<div id="product_description" class="sub-header"><h2>Product Description</h2>'
+            f"</div><p>Synthetic description of book {book + 1}; it’s a page-turner…</p>"
+            '<table class="table table-striped">'
+            f"<tr><th>UPC</th><td>{book + 1:016x}</td></tr>"
+            "<tr><th>Product Type</th><td>Books</td></tr>"
+            f"<tr><th>Price (excl. tax)</th><td>{price}</td></tr>"
+            f"<tr><th>Price (incl. tax)</th><td>{price}</td></tr>"
+            "<tr><th>Tax</th><td>£0.00</td></tr>"
+            f"<tr><th>Availability</th><td>In stock ({stock} available)</td></tr>"
+            f"<tr><th>Number of reviews</th><td>{book % 3}</td></tr>"
+            "</table></article></div></div></body></html>"
+        )
+
+    def respond(self, path: str) -> Response:
+        html = self.render(path)
+        if html is None:
+            return 404, b"", "text/html"
+        return 200, html.encode("utf-8"), "text/html"
+
+
+class ReplayCatalog:
+    """Serve as respostas gravadas em disco pelo RecordingCatalog"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory).resolve()
+
+    def file_for(self, path: str) -> Optional[Path]:
+        """Arquivo onde a resposta do caminho é gravada (None se sair do diretório)"""
+        relative = unquote(urlsplit(path).path).lstrip("/")
+        if not relative or relative.endswith("/"):
+            relative += "index.html"
+        target = (self.directory / relative).resolve()
+        if self.directory not in target.parents:
+            return None
+        return target
+
+    def respond(self, path: str) -> Response:
+        target = self.file_for(path)
+        if target is None or not target.is_file():
+            return 404, b"", "text/html"
+        return 200, target.read_bytes(), "text/html"
+
+
+class RecordingCatalog(ReplayCatalog):
+    """
+    Proxy para o site real que grava cada resposta 200 em disco.
+    Respostas já gravadas são servidas do disco, então uma gravação
+    interrompida pode ser retomada.
+    """
+
+    def __init__(self, directory: str, upstream: str):
+        super().__init__(directory)
+        self.upstream = upstream
+        self.session = requests.Session()
+
+    def respond(self, path: str) -> Response:
+        status, body, content_type = super().respond(path)
+        if status == 200:
+            return status, body, content_type
+
+        target = self.file_for(path)
+        if target is None:
+            return 404, b"", "text/html"
+
+        response = self.session.get(urljoin(self.upstream, path.lstrip("/")))
+        content_type = response.headers.get("Content-Type", "text/html")
+        if response.status_code == 200:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(response.content)
+        return response.status_code, response.content, content_type
+
+
+class CatalogStats:
+    """Contadores de requisições atendidas, expostos em /__stats__"""
+
+    def __init__(self):
+        self.__counters: Dict[str, int] = {}
+        self.__lock = threading.Lock()
+
+    def increment(self, name: str, amount: int = 1):
+        with self.__lock:
+            self.__counters[name] = self.__counters.get(name, 0) + amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.__lock:
+            return dict(self.__counters)
+
+
+def build_handler(
+    catalog, latency: float = 0.0, error_rate: float = 0.0, stats: CatalogStats = None
+):
+    """
+    Cria o handler HTTP do catálogo. latency atrasa cada resposta (segundos) e
+    error_rate é a fração de requisições respondidas com 503 + Retry-After.
+    As respostas têm ETag e respondem 304 a requisições condicionais.
+    """
+    stats = stats or CatalogStats()
+
+    class CatalogHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def __send(self, status: int, body: bytes = b"", headers: dict = None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == STATS_PATH:
+                body = json.dumps(stats.snapshot()).encode()
+                self.__send(200, body, {"Content-Type": "application/json"})
+                return
+
+            stats.increment("requests")
+            if latency:
+                time.sleep(latency)
+            if error_rate and random.random() < error_rate:
+                stats.increment("errors")
+                self.__send(503, headers={"Retry-After": "0.2"})
+                return
+
+            status, body, content_type = catalog.respond(self.path)
+            stats.increment(f"status_{status}")
+            if status != 200:
+                self.__send(status, body, {"Content-Type": content_type})
+                return
+
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                stats.increment("not_modified")
+                self.__send(304, headers={"ETag": etag})
+                return
+
+            stats.increment("bytes", len(body))
+            self.__send(200, body, {"Content-Type": content_type, "ETag": etag})
+
+    return CatalogHandler
+
+
+class CatalogHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Backlog maior para aguentar as rajadas dos motores concorrentes
+    request_queue_size = 256
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="segundos")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0 a 1")
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    synthetic = modes.add_parser("synthetic", help="catálogo sintético")
+    synthetic.add_argument("--categories", type=int, default=50)
+    synthetic.add_argument("--books", type=int, default=1000)
+    synthetic.add_argument("--revision", type=int, default=0)
+
+    record = modes.add_parser("record", help="proxy que grava as respostas")
+    record.add_argument("--upstream", default="https://books.toscrape.com/")
+    record.add_argument("--dir", required=True)
+
+    replay = modes.add_parser("replay", help="serve as respostas gravadas")
+    replay.add_argument("--dir", required=True)
+    return parser.parse_args(argv)
+
+
+def create_catalog(args: argparse.Namespace):
+    if args.mode == "synthetic":
+        return SyntheticCatalog(args.categories, args.books, args.revision)
+    if args.mode == "record":
+        return RecordingCatalog(args.dir, args.upstream)
+    return ReplayCatalog(args.dir)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    handler = build_handler(create_catalog(args), args.latency, args.error_rate)
+    server = CatalogHTTPServer((args.host, args.port), handler)
+    print(f"Catálogo ({args.mode}) em http://{args.host}:{args.port}/", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark de throughput do crawl, totalmente offline.
+
+Sobe o benchmarks.catalog_server em um processo separado (catálogo
+sintético ou respostas gravadas), aponta o scraper para ele e mede páginas
+e livros por segundo do motor escolhido. Nada é gravado no banco.
+
+Uso:
+    python -m benchmarks.crawl_benchmark --books 10000 --categories 50
+    python -m benchmarks.crawl_benchmark --engine asyncio --books 1000000 --latency 0.01
+    python -m benchmarks.crawl_benchmark --replay recorded
+
+As variáveis SCRAPING_* do ambiente continuam valendo (workers, parser,
+pool de processos...). Se não informadas, o cache HTTP é desligado e o
+limite de taxa é elevado, para medir o scraper e não a política de cortesia.
+"""
+
+from typing import Dict, Tuple
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import requests
+
+SERVER_START_TIMEOUT = 30
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark offline do crawl")
+    parser.add_argument("--engine", choices=["requests", "asyncio"], default="requests")
+    parser.add_argument("--mode", choices=["full", "first_category"], default="full")
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--books", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.0, help="segundos")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0 a 1")
+    parser.add_argument("--replay", metavar="DIR", help="usa respostas gravadas")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--verbose", action="store_true", help="mostra os logs")
+    return parser.parse_args(argv)
+
+
+def start_server(args: argparse.Namespace) -> subprocess.Popen:
+    """Sobe o catálogo em outro processo e aguarda ele aceitar conexões"""
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.catalog_server",
+        "--port",
+        str(args.port),
+        "--latency",
+        str(args.latency),
+        "--error-rate",
+        str(args.error_rate),
+    ]
+    if args.replay:
+        command += ["replay", "--dir", args.replay]
+    else:
+        command += [
+            "synthetic",
+            "--categories",
+            str(args.categories),
+            "--books",
+            str(args.books),
+        ]
+
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{args.port}/__stats__", timeout=1)
+            return server
+        except requests.ConnectionError:
+            if server.poll() is not None:
+                break
+            time.sleep(0.1)
+    server.kill()
+    raise SystemExit("O catálogo local não subiu")
+
+
+def server_stats(port: int) -> Dict[str, int]:
+    return requests.get(f"http://127.0.0.1:{port}/__stats__", timeout=5).json()
+
+
+def run_requests_engine(scraper, mode, metrics) -> Tuple[int, int]:
+    """Percorre o catálogo com o BookScraper; retorna (páginas, livros)"""
+    pages = books = 0
+    categories = scraper.select_categories(mode, metrics)
+    for page in scraper.crawl(categories, metrics=metrics):
+        pages += 1
+        books += len(page.books)
+    return pages, books
+
+
+def run_asyncio_engine(scraper, mode, metrics) -> Tuple[int, int]:
+    """Percorre o catálogo com o AsyncBookScraper; retorna (páginas, livros)"""
+
+    async def crawl():
+        pages = books = 0
+        categories = await scraper.select_categories(mode, metrics)
+        async for page in scraper.crawl(categories, metrics=metrics):
+            pages += 1
+            books += len(page.books)
+        return pages, books
+
+    return asyncio.run(crawl())
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ["URL_TO_SCRAPE"] = f"http://127.0.0.1:{args.port}/"
+    os.environ.setdefault("SCRAPING_CACHE_ENABLED", "false")
+    os.environ.setdefault("SCRAPING_RATE", "1000")
+    os.environ.setdefault("SCRAPING_RATE_MAX", "100000")
+
+    # Importados depois do ambiente configurado: os serviços leem as
+    # variáveis no construtor
+    from src.common.enums import CrawlMode
+    from src.domain.scraping.async_book_scraper import AsyncBookScraper
+    from src.domain.scraping.book_scraper import BookScraper
+    from src.domain.scraping.metrics import ScrapeMetrics
+    from src.domain.scraping.parse_pool import ParsePool
+    from src.domain.scraping.politeness import HostRateLimiter, RetryPolicy
+    from src.infra.cache.http_cache import HttpCache
+    from src.infra.logs.logging_service import LoggingService
+
+    logger = LoggingService("crawl_benchmark")
+    if not args.verbose:
+        logger.logger.setLevel(logging.WARNING)
+
+    engine_class = AsyncBookScraper if args.engine == "asyncio" else BookScraper
+    scraper = engine_class(
+        logger, HttpCache(), HostRateLimiter(), RetryPolicy(), ParsePool()
+    )
+    run_engine = run_asyncio_engine if args.engine == "asyncio" else run_requests_engine
+
+    server = start_server(args)
+    try:
+        metrics = ScrapeMetrics()
+        started_at = time.perf_counter()
+        pages, books = run_engine(scraper, CrawlMode(args.mode), metrics)
+        elapsed = time.perf_counter() - started_at
+        metrics.finish()
+        stats = server_stats(args.port)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"motor        {args.engine}")
+    print(f"tempo        {elapsed:10.2f} s")
+    print(f"listagens    {pages:10d}  ({pages / elapsed:10.1f} páginas/s)")
+    print(f"livros       {books:10d}  ({books / elapsed:10.1f} livros/s)")
+    print(
+        f"requisições  {stats.get('requests', 0):10d}  ({stats.get('errors', 0)} erros)"
+    )
+    print(f"bytes        {stats.get('bytes', 0):10d}")
+
+    report = metrics.report()
+    print(f"latência     média {report['fetch_latency']['average']}s")
+    for bucket, count in report["fetch_latency"]["histogram"].items():
+        print(f"  {bucket:<10} {count:10d}")
+    for stage, seconds in report["stages"].items():
+        print(f"etapa        {stage:<10} {seconds:10.2f} s")
+
+
+if __name__ == "__main__":
+    main()
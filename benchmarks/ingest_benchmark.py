@@ -0,0 +1,123 @@
+"""
+Benchmark da escrita em lote de livros no banco.
+
+Gera livros sintéticos e mede, em um banco SQLite temporário (ou no
+DATABASE_URL informado), o tempo de:
+    create_many   carga inicial, ignorando uuids existentes
+    upsert_many   nova carga com todos os livros inalterados
+    upsert_many   nova carga com todos os livros alterados
+    refresh_from_listing  dados da listagem, inalterados e depois alterados
+
+Uso:
+    python -m benchmarks.ingest_benchmark --books 100000
+    python -m benchmarks.ingest_benchmark --books 100000 --chunk-size 2000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark da escrita em lote")
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, help="DATABASE_WRITE_CHUNK_SIZE")
+    parser.add_argument("--database-url", help="padrão: SQLite temporário")
+    return parser.parse_args(argv)
+
+
+def make_records(record_class, total: int, revision: int = 1) -> list:
+    return [
+        record_class(
+            uuid=f"{index:016x}",
+            title=f"Book {index}",
+            category=f"Category {index % 50}",
+            rating=index % 5 + 1,
+            price_excl_tax=round(10 + index % 40 + revision / 100, 2),
+            price_incl_tax=round(10 + index % 40 + revision / 100, 2),
+            tax=0.0,
+            availability=index % 23,
+            reviews_qtd=0,
+            description=f"Description of book {index} " * 10,
+            image=f"https://example.com/media/{index}.jpg",
+        )
+        for index in range(total)
+    ]
+
+
+def make_refreshes(refresh_class, records: list, price_delta: float = 0.0) -> list:
+    return [
+        refresh_class(
+            uuid=record.uuid,
+            url=None,
+            title=record.title,
+            price=round(record.price_incl_tax + price_delta, 2),
+            rating=record.rating,
+            in_stock=record.availability > 0,
+        )
+        for record in records
+    ]
+
+
+def timed(label: str, total: int, func, *args):
+    started_at = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started_at
+    print(f"{label:<22} {elapsed:8.2f} s  ({total / elapsed:10.0f} livros/s)")
+    return result
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    directory = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = (
+        args.database_url or f"sqlite:///{directory.name}/ingest.db"
+    )
+    if args.chunk_size:
+        os.environ["DATABASE_WRITE_CHUNK_SIZE"] = str(args.chunk_size)
+
+    # Importados depois do ambiente configurado: o banco é criado na importação
+    from sqlalchemy import func, select
+    from src.domain.scraping.dtos.book_record import BookRecord
+    from src.domain.scraping.dtos.listing_refresh import ListingRefresh
+    from src.infra.db import engine
+    from src.infra.migrations import run_migrations
+    from src.infra.models import BookModel
+    from src.infra.repositories.book.book_repository import BookRepository
+
+    run_migrations()
+    repository = BookRepository()
+    print(f"livros                 {args.books:8d}  (lote {repository.chunk_size})")
+
+    records = make_records(BookRecord, args.books)
+    timed("create_many", args.books, repository.create_many, records)
+    counts = timed(
+        "upsert_many inalterado", args.books, repository.upsert_many, records
+    )
+    assert counts["unchanged"] == args.books, counts
+
+    records = make_records(BookRecord, args.books, revision=2)
+    counts = timed("upsert_many alterado", args.books, repository.upsert_many, records)
+    assert counts["updated"] == args.books, counts
+
+    refreshes = make_refreshes(ListingRefresh, records)
+    counts = timed(
+        "listagem inalterada", args.books, repository.refresh_from_listing, refreshes
+    )
+    assert counts["unchanged"] == args.books, counts
+    refreshes = make_refreshes(ListingRefresh, records, price_delta=1)
+    counts = timed(
+        "listagem alterada", args.books, repository.refresh_from_listing, refreshes
+    )
+    assert counts["updated"] == args.books, counts
+
+    with engine.connect() as connection:
+        stored = connection.scalar(select(func.count()).select_from(BookModel))
+    assert stored == args.books, stored
+    engine.dispose()
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
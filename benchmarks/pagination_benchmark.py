@@ -0,0 +1,91 @@
+"""
+Benchmark da paginação de GET /books.
+
+Popula um banco SQLite temporário com livros sintéticos e mede a latência
+de uma página no início, no meio e no fim do catálogo, por cursor (keyset
+no id) e por LIMIT/OFFSET (?page=&size=), com todos os campos ou só os de
+--fields.
+
+Uso:
+    python -m benchmarks.pagination_benchmark --books 100000 --size 20
+    python -m benchmarks.pagination_benchmark --size 100 --fields title,price_incl_tax
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark da paginação")
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--repetitions", type=int, default=20)
+    parser.add_argument(
+        "--fields", help="campos da página, como em ?fields=title,price_incl_tax"
+    )
+    return parser.parse_args(argv)
+
+
+async def average_ms(func, repetitions: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(repetitions):
+        await func()
+    return (time.perf_counter() - started_at) / repetitions * 1000
+
+
+async def run(args: argparse.Namespace, repository, service, encode_cursor):
+    fields = args.fields.split(",") if args.fields else None
+    print(
+        f"livros {args.books}, páginas de {args.size}, campos {args.fields or 'todos'}"
+    )
+    for depth in (0.0, 0.5, 0.99):
+        page = int(args.books * depth / args.size) + 1
+        last_id = (page - 1) * args.size
+        cursor = encode_cursor(last_id) if last_id else None
+        keyset = await average_ms(
+            lambda: service.list_books_page(cursor, args.size, fields=fields),
+            args.repetitions,
+        )
+        offset = await average_ms(
+            lambda: service.list_books_paginated(page, args.size, fields),
+            args.repetitions,
+        )
+        print(f"página {page:7d}   cursor {keyset:7.2f} ms   offset {offset:7.2f} ms")
+    total = await average_ms(repository.count_all, args.repetitions)
+    print(f"total (COUNT)       {total:7.2f} ms")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    directory = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{directory.name}/pagination.db"
+
+    # Importados depois do ambiente configurado: o banco é criado na importação
+    from benchmarks.ingest_benchmark import make_records
+    from src.domain.book.book_service import BookService, encode_cursor
+    from src.domain.scraping.dtos.book_record import BookRecord
+    from src.infra.db import engine, get_async_engine
+    from src.infra.migrations import run_migrations
+    from src.infra.repositories.book.async_book_repository import (
+        AsyncBookRepository,
+    )
+    from src.infra.repositories.book.book_repository import BookRepository
+
+    run_migrations()
+    BookRepository().create_many(make_records(BookRecord, args.books))
+    repository = AsyncBookRepository()
+
+    async def benchmark():
+        await run(args, repository, BookService(repository), encode_cursor)
+        await get_async_engine().dispose()
+
+    asyncio.run(benchmark())
+    engine.dispose()
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
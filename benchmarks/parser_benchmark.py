@@ -0,0 +1,62 @@
+"""
+Micro-benchmark dos backends de parsing do scraper.
+
+Parseia páginas de listagem e de detalhe salvas em benchmarks/fixtures,
+confere que todos os backends extraem os mesmos dados e mostra o tempo
+médio por página.
+
+Uso: python -m benchmarks.parser_benchmark [repetições]
+"""
+
+from pathlib import Path
+import sys
+import timeit
+
+from src.domain.scraping.book_parser import BookParser, PARSER_BACKENDS
+from src.domain.scraping.dtos.book_record import BookRecord
+
+FIXTURES = Path(__file__).parent / "fixtures"
+BASE_URL = "https://books.toscrape.com/"
+PAGE_URL = f"{BASE_URL}catalogue/category/books/mystery_3/index.html"
+
+
+def load_fixture(name: str) -> str:
+    """Lê a página como o requests entrega (sem charset, decodificada em latin1)"""
+    return (FIXTURES / name).read_bytes().decode("iso-8859-1")
+
+
+def parse_listing(parser: BookParser, html: str):
+    soup = parser.parse(html, BookParser.LISTING_PAGE)
+    return parser.parse_listed_books(soup), parser.parse_next_page(soup, PAGE_URL)
+
+
+def parse_detail(parser: BookParser, html: str):
+    soup = parser.parse(html, BookParser.DETAIL_PAGE)
+    return BookRecord.from_details(parser.parse_book_details(soup)).as_row()
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pages = {
+        "listing": (parse_listing, load_fixture("listing.html")),
+        "detail": (parse_detail, load_fixture("detail.html")),
+    }
+
+    reference = {}
+    for backend, parser_class in PARSER_BACKENDS.items():
+        parser = parser_class(BASE_URL)
+        for page_name, (parse, html) in pages.items():
+            result = parse(parser, html)
+            expected = reference.setdefault(page_name, result)
+            if result != expected:
+                raise SystemExit(f"{backend}: extração divergente em {page_name}")
+
+            seconds = timeit.timeit(lambda: parse(parser, html), number=repetitions)
+            print(
+                f"{backend:<10} {page_name:<8} "
+                f"{seconds / repetitions * 1000:8.3f} ms/página"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Confere se cada consulta de leitura do BookRepository e do
+AsyncBookRepository (DISTINCT de categorias, cursor e busca textual
+incluídos) usa um índice no SQLite.
+
+Cria um banco temporário no schema antigo (tabela books sem índices, como
+os libraflux.db criados só pelo create_all), aplica as migrações, executa
+as consultas capturando o SQL gerado e roda EXPLAIN QUERY PLAN em cada
+uma. Termina com código 1 se alguma fizer varredura completa da tabela.
+
+Uso: python -m benchmarks.query_plan_check
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+
+async def check_plans() -> int:
+    # Importados depois do ambiente configurado: o banco é criado na importação
+    from sqlalchemy import event
+    from src.infra.db import engine, get_async_engine
+    from src.infra.migrations import run_migrations
+    from src.infra.models import BookModel
+    from src.infra.repositories.book.async_book_repository import (
+        AsyncBookRepository,
+    )
+    from src.infra.repositories.book.book_repository import BookRepository
+
+    # Schema antigo: a tabela de livros sem os índices das consultas
+    BookModel.__table__.create(bind=engine)
+    with engine.begin() as connection:
+        for index in BookModel.__table__.indexes:
+            index.drop(connection)
+    migrated = run_migrations()
+    print(f"migrações aplicadas: {', '.join(migrated) or 'nenhuma'}")
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    repository = BookRepository()
+    async_repository = AsyncBookRepository()
+    queries = {
+        "list_bycategory": lambda: repository.list_bycategory("Poetry"),
+        "list_bytitle": lambda: repository.list_bytitle("A Light in the Attic"),
+        "list_bycategoryandtitle": lambda: repository.list_bycategoryandtitle(
+            "A Light in the Attic", "Poetry"
+        ),
+        "list_by_price_range": lambda: repository.list_by_price_range(10.0, 50.0),
+        "get_top_rated_books": repository.get_top_rated_books,
+        "async list_bycategory": lambda: async_repository.list_bycategory("Poetry"),
+        "async list_bytitle": lambda: async_repository.list_bytitle("Attic"),
+        "async list_by_price": lambda: async_repository.list_by_price_range(10, 50),
+        "async get_top_rated": async_repository.get_top_rated_books,
+        "async list_categories": async_repository.list_categories,
+        "async list_after": lambda: async_repository.list_after(100, 20),
+        "async search": lambda: async_repository.search("light att", "Poetry", 20, 0),
+    }
+
+    failures = 0
+    engines = (engine, get_async_engine().sync_engine)
+    for name, query in queries.items():
+        statements.clear()
+        for listened in engines:
+            event.listen(listened, "before_cursor_execute", capture)
+        try:
+            result = query()
+            if asyncio.iscoroutine(result):
+                await result
+        finally:
+            for listened in engines:
+                event.remove(listened, "before_cursor_execute", capture)
+
+        statement, parameters = next(
+            (sql, params) for sql, params in statements if "FROM books" in sql
+        )
+        with engine.connect() as connection:
+            steps = [
+                row[-1]
+                for row in connection.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+            ]
+        # "SCAN books" sem índice é a varredura completa da tabela
+        uses_index = "SCAN books" not in steps
+        failures += not uses_index
+        print(f"{'ok   ' if uses_index else 'FALHA'} {name:<24} {' | '.join(steps)}")
+
+    await get_async_engine().dispose()
+    engine.dispose()
+    return failures
+
+
+def main():
+    directory = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{directory.name}/plans.db"
+    failures = asyncio.run(check_plans())
+    directory.cleanup()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
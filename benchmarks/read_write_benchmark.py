@@ -0,0 +1,103 @@
+"""
+Benchmark de leituras durante a ingestão no SQLite.
+
+Um processo escreve lotes de livros sem parar (como o worker de scraping)
+enquanto o processo principal repete a consulta por categoria do
+BookRepository e mede a latência de cada leitura. Rode com o journal padrão
+do SQLite e com WAL para comparar:
+
+    python -m benchmarks.read_write_benchmark --journal-mode DELETE
+    python -m benchmarks.read_write_benchmark --journal-mode WAL
+
+As demais variáveis SQLITE_* e DATABASE_* do ambiente continuam valendo.
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Leituras durante a ingestão")
+    parser.add_argument("--journal-mode", default="WAL", help="SQLITE_JOURNAL_MODE")
+    parser.add_argument("--books", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=5000, help="livros por commit")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    return parser.parse_args(argv)
+
+
+def write_forever(books: int, batch: int, stop_event):
+    """Regrava os livros em lotes, alterando o preço a cada rodada"""
+    from benchmarks.ingest_benchmark import make_records
+    from src.domain.scraping.dtos.book_record import BookRecord
+    from src.infra.repositories.book.book_repository import BookRepository
+
+    repository = BookRepository()
+    revision = 2
+    while not stop_event.is_set():
+        records = make_records(BookRecord, books, revision)
+        for start in range(0, books, batch):
+            repository.upsert_many(records[start : start + batch])
+            if stop_event.is_set():
+                break
+        revision += 1
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    directory = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{directory.name}/read_write.db"
+    os.environ["SQLITE_JOURNAL_MODE"] = args.journal_mode
+
+    # Importados depois do ambiente configurado: o banco é criado na importação
+    from benchmarks.ingest_benchmark import make_records
+    from src.domain.scraping.dtos.book_record import BookRecord
+    from src.infra.db import engine
+    from src.infra.migrations import run_migrations
+    from src.infra.repositories.book.book_repository import BookRepository
+
+    run_migrations()
+    repository = BookRepository()
+    repository.create_many(make_records(BookRecord, args.books))
+
+    context = multiprocessing.get_context("spawn")
+    stop_event = context.Event()
+    writer = context.Process(
+        target=write_forever, args=(args.books, args.batch, stop_event)
+    )
+    writer.start()
+    # Dá tempo do escritor começar a primeira transação
+    time.sleep(1)
+
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + args.seconds
+    while time.perf_counter() < deadline:
+        started_at = time.perf_counter()
+        try:
+            repository.list_bycategory("Category 1")
+        except Exception:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started_at)
+
+    stop_event.set()
+    writer.join()
+    engine.dispose()
+    directory.cleanup()
+
+    latencies.sort()
+    print(f"journal      {args.journal_mode}")
+    print(f"leituras     {len(latencies):8d}  ({len(latencies) / args.seconds:.1f}/s)")
+    print(f"erros        {errors:8d}")
+    if latencies:
+        print(f"p50          {statistics.median(latencies) * 1000:8.1f} ms")
+        print(f"p99          {latencies[int(len(latencies) * 0.99)] * 1000:8.1f} ms")
+        print(f"máximo       {latencies[-1] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
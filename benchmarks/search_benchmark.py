@@ -0,0 +1,76 @@
+"""
+Benchmark da busca textual de /books/search?q=.
+
+Popula um banco SQLite temporário com livros sintéticos (o índice FTS5 é
+mantido pelos triggers durante a carga) e mede a latência média de buscas
+seletivas, por prefixo, com filtro de categoria e de um termo presente em
+todos os livros (pior caso: todos os resultados são ordenados por BM25).
+
+Uso: python -m benchmarks.search_benchmark --books 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark da busca textual")
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--size", type=int, default=20)
+    parser.add_argument("--repetitions", type=int, default=50)
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace, repository):
+    middle = args.books // 2
+    prefix = str(middle)[:-1]
+    queries = [
+        ("termo seletivo", str(middle), None),
+        ("prefixo", prefix, None),
+        ("prefixo + categoria", prefix, f"Category {middle % 50}"),
+        ("termo comum + termo", f"book {middle}", None),
+        ("termo em todos", "description", None),
+    ]
+    print(f"livros {args.books}, páginas de {args.size}")
+    for label, query, category in queries:
+        started_at = time.perf_counter()
+        for _ in range(args.repetitions):
+            books = await repository.search(query, category, args.size, 0)
+        elapsed = (time.perf_counter() - started_at) / args.repetitions * 1000
+        print(f"{label:<22} {query!r:<22} {len(books):3d} livros  {elapsed:8.3f} ms")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    directory = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{directory.name}/search.db"
+
+    # Importados depois do ambiente configurado: o banco é criado na importação
+    from benchmarks.ingest_benchmark import make_records
+    from src.domain.scraping.dtos.book_record import BookRecord
+    from src.infra.db import engine, get_async_engine
+    from src.infra.migrations import run_migrations
+    from src.infra.repositories.book.async_book_repository import (
+        AsyncBookRepository,
+    )
+    from src.infra.repositories.book.book_repository import BookRepository
+
+    run_migrations()
+    started_at = time.perf_counter()
+    BookRepository().create_many(make_records(BookRecord, args.books))
+    print(f"carga com índice FTS   {time.perf_counter() - started_at:8.2f} s")
+
+    async def benchmark():
+        await run(args, AsyncBookRepository())
+        await get_async_engine().dispose()
+
+    asyncio.run(benchmark())
+    engine.dispose()
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
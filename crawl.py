@@ -0,0 +1,60 @@
+"""
+Crawl do catálogo fora da API, dividido em shards por categoria.
+
+Em uma máquina, o coordenador divide as categorias e sobe N workers:
+    python crawl.py --workers 4
+
+Em várias máquinas apontando para o mesmo banco, cada uma executa um shard
+(a divisão por hash é a mesma em todas):
+    python crawl.py --shard 0 --shards 2   # máquina A
+    python crawl.py --shard 1 --shards 2   # máquina B
+
+Nos dois casos a taxa por host (SCRAPING_RATE*) é dividida entre os
+processos que rodam ao mesmo tempo (workers ou shards), e não multiplicada.
+"""
+
+import argparse
+import asyncio
+
+from dotenv import load_dotenv
+
+# Antes de importar a aplicação: o banco é configurado na importação
+load_dotenv()
+
+from src.common.enums import CrawlMode  # noqa: E402
+from src.domain.scraping.crawl_coordinator import (  # noqa: E402
+    CrawlCoordinator,
+    build_scraping_service,
+)
+from src.infra.migrations import run_migrations  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Crawl do catálogo por shards")
+    parser.add_argument(
+        "--mode", type=CrawlMode, choices=list(CrawlMode), default=CrawlMode.FULL
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--shards", type=int, help="total de shards")
+    parser.add_argument("--shard", type=int, help="executa apenas este shard")
+    args = parser.parse_args()
+    if args.shard is not None and not 0 <= args.shard < (args.shards or 1):
+        parser.error("--shard deve estar entre 0 e --shards - 1")
+    return args
+
+
+def main():
+    args = parse_args()
+    run_migrations()
+
+    if args.shard is not None:
+        # Os demais shards rodam ao mesmo tempo em outras máquinas
+        service = build_scraping_service(rate_share=args.shards or 1)
+        result = asyncio.run(service.trigger(args.mode, args.shard, args.shards or 1))
+    else:
+        result = CrawlCoordinator(args.workers, args.shards).run(args.mode)
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,15 @@ from fastapi import APIRouter
 from nest.core import PyNestFactory, Module
 from .domain.book.book_module import BookModule
 from .domain.scraping.scraping_module import ScrapingModule
+from .domain.scraping.scrape_worker import EmbeddedWorker
 from .domain.categories.categories_module import CategoriesModule
 from .domain.health.health_module import HealthModule
 from .domain.stats.stats_module import StatsModule
 from .domain.ml.ml_module import MlModule
 from .infra.logs.logging_module import LoggingModule
 from .infra.models import *
-from .infra.db import Base, engine
+from .infra.db import dispose_async_engine
+from .infra.migrations import run_migrations
 from .domain.auth.auth_module import AuthModule
 from .infra.logs.logging_service import LoggingService
 from .utils.create_default_admin import DefaultAdminManager
@@ -55,7 +57,8 @@ app = PyNestFactory.create(
     openapi_url=None,
 )
 
-Base.metadata.create_all(bind=engine)
+# Cria as tabelas e aplica as migrações pendentes (índices etc.)
+run_migrations()
 
 # Cria um novo app wrapper para aplicar o prefixo e expor docs
 if api_prefix:
@@ -87,6 +90,16 @@ else:
 
 
 
+# Worker da fila de scraping em um processo filho, a menos que rode separado
+# (python worker.py com SCRAPING_WORKER_MODE=external)
+if os.environ.get("SCRAPING_WORKER_MODE", "embedded").lower() == "embedded":
+    embedded_worker = EmbeddedWorker()
+    wrapper_app.add_event_handler("startup", embedded_worker.start)
+    wrapper_app.add_event_handler("shutdown", embedded_worker.stop)
+
+# Fecha as conexões do engine assíncrono das leituras
+wrapper_app.add_event_handler("shutdown", dispose_async_engine)
+
 # admin manager etc (deixa como está)
 admin_manager = DefaultAdminManager()
 admin_manager.create_admin_user()
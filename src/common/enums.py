@@ -9,3 +9,17 @@ class UserRole(Enum):
 
     REGULAR = "REGULAR"
     ROOT = "ROOT"
+
+
+class CrawlMode(Enum):
+    """
+    Enumeração para os modos de crawl do scraping.
+    FIRST_CATEGORY percorre apenas a primeira categoria encontrada;
+    FULL percorre todas as categorias do catálogo;
+    SCHEDULED percorre as categorias mais desatualizadas e voláteis, dentro
+    do orçamento de requisições do agendador.
+    """
+
+    FIRST_CATEGORY = "first_category"
+    FULL = "full"
+    SCHEDULED = "scheduled"
@@ -7,7 +7,9 @@ from datetime import datetime
 security = HTTPBearer()
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+):
     """
     Verifica o token JWT e retorna o usuário atual.
     Esta função decodifica o token JWT e verifica sua validade, retornando os dados do usuário.
@@ -35,7 +37,7 @@ def require_role(required_role: str):
     Verifica se o usuário atual possui a role necessária.
     """
 
-    def role_checker(user=Depends(get_current_user)):
+    async def role_checker(user=Depends(get_current_user)):
         if user.get("role") != required_role:
             raise HTTPException(
                 status_code=403,
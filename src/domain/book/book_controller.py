@@ -1,8 +1,8 @@
 from nest.core import Controller, Get, Post
-from .book_service import BookService
+from .book_service import BookService, parse_fields
 from .dtos.search_books_dto import SearchBookDTO
 from ..auth.auth_guard import get_current_user
-from fastapi import Depends
+from fastapi import Depends, HTTPException
 
 
 @Controller("/books")
@@ -11,31 +11,62 @@ class BookController:
     def __init__(self, service: BookService):
         self.service = service
 
+    def __fields(self, fields: str):
+        """Campos de ?fields=title,price_incl_tax; 400 se algum não existir"""
+        try:
+            return parse_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     @Get("/")
-    def list_books(
-        self, page: int = None, size: int = None, user=Depends(get_current_user)
+    async def list_books(
+        self,
+        page: int = None,
+        size: int = None,
+        cursor: str = None,
+        paginate: bool = False,
+        total: bool = False,
+        fields: str = None,
+        user=Depends(get_current_user),
     ):
         """
-        /books/?page=1&size=10
+        /books/?paginate=true&size=20 e /books/?cursor={next_cursor}&size=20
         Lista os livros com paginação opcional.
-        Se 'page' e 'size' não forem fornecidos, retorna todos os livros.
+        Com 'cursor' ou 'paginate=true', retorna uma página por cursor:
+        {"items": [...], "next_cursor": "...", "total": null}; a próxima página
+        é pedida com o next_cursor recebido, até ele vir null, e 'total=true'
+        conta os livros.
+        Com 'page' e 'size' (/books/?page=1&size=10), retorna a lista da página.
+        Sem paginação, retorna a lista de todos os livros.
+        Em todos os casos, 'fields' (/books/?fields=title,price_incl_tax)
+        limita os campos retornados; o id vem sempre.
         """
+        selected = self.__fields(fields)
+        if cursor is not None or paginate:
+            try:
+                return await self.service.list_books_page(cursor, size, total, selected)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
         if page is not None and size is not None:
-            return self.service.list_books_paginated(page, size)
-        return self.service.list_books()
+            return await self.service.list_books_paginated(page, size, selected)
+        return await self.service.list_books(selected)
 
     @Get("/top-rated")
-    def get_top_rated_books(self, user=Depends(get_current_user)):
+    async def get_top_rated_books(
+        self, fields: str = None, user=Depends(get_current_user)
+    ):
         """
         Retorna uma lista de livros bem avaliados (exemplo: rating >= 4).
+        Exemplo: /books/top-rated?fields=title,rating
         """
-        return self.service.get_top_rated_books()
+        return await self.service.get_top_rated_books(self.__fields(fields))
 
     @Get("/price-range")
-    def list_books_by_price_range(
+    async def list_books_by_price_range(
         self,
         min_price: float = None,
         max_price: float = None,
+        fields: str = None,
         user=Depends(get_current_user),
     ):
         """
@@ -43,23 +74,38 @@ class BookController:
         Exemplo: /books/price-range?min_price=10.0&max_price=50.0
         """
         if min_price is not None and max_price is not None:
-            return self.service.list_books_by_price_range(min_price, max_price)
+            return await self.service.list_books_by_price_range(
+                min_price, max_price, self.__fields(fields)
+            )
         return {"error": "Parâmetros 'min_price' e 'max_price' são necessários."}
 
     @Get("/search")
-    def search_books(
-        self, title: str = None, category: str = None, user=Depends(get_current_user)
+    async def search_books(
+        self,
+        title: str = None,
+        category: str = None,
+        q: str = None,
+        page: int = 1,
+        size: int = None,
+        fields: str = None,
+        user=Depends(get_current_user),
     ):
         """
         Busca livros por título e/ou categoria.
         Exemplo: /books/search?title=Python&category=Programming
+        Com 'q', faz busca textual em título e descrição, por prefixo e
+        ordenada por relevância, com 'category' opcional e paginação.
+        Exemplo: /books/search?q=pyth&category=Programming&page=1&size=20
         """
-        return self.service.search_books(title, category)
+        selected = self.__fields(fields)
+        if q is not None:
+            return await self.service.search_text(q, category, page, size, selected)
+        return await self.service.search_books(title, category, selected)
 
     @Get("/{id}")
-    def get_book(self, id: int, user=Depends(get_current_user)):
+    async def get_book(self, id: int, user=Depends(get_current_user)):
         """
         Retorna um livro pelo ID.
         Exemplo: /books/1
         """
-        return self.service.get_book_by_id(id)
+        return await self.service.get_book_by_id(id)
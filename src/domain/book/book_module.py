@@ -1,8 +1,13 @@
 from nest.core import Module
 from .book_service import BookService
 from .book_controller import BookController
+from ...infra.repositories.book.book_repository_module import BookRepositoryModule
 
 
-@Module(imports=[], providers=[BookService], controllers=[BookController])
+@Module(
+    imports=[BookRepositoryModule],
+    providers=[BookService],
+    controllers=[BookController],
+)
 class BookModule:
     pass
@@ -1,55 +1,162 @@
 from nest.core import Injectable
-from ...infra.repositories.book.book_repository import BookRepository
+from typing import List, Optional
+import base64
+import json
+import os
+from ...infra.models.book_model import BookModel
+from ...infra.repositories.book.async_book_repository import AsyncBookRepository
+
+# Campos aceitos em ?fields= (as colunas de BookModel)
+BOOK_FIELDS = tuple(column.name for column in BookModel.__table__.columns)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Campos pedidos em ?fields=title,price_incl_tax; None para todos.
+    Lança ValueError com os campos desconhecidos.
+    """
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in BOOK_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Campos inválidos: {', '.join(unknown)}. "
+            f"Disponíveis: {', '.join(BOOK_FIELDS)}"
+        )
+    return requested or None
+
+
+def encode_cursor(book_id: int) -> str:
+    """Token opaco com o id do último livro da página"""
+    data = json.dumps({"id": book_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Id do último livro a partir do token; ValueError se o token for inválido"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        book_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("cursor inválido") from e
+    if not isinstance(book_id, int) or book_id < 0:
+        raise ValueError("cursor inválido")
+    return book_id
 
 
 @Injectable
 class BookService:
-    def __init__(self, repository: BookRepository):
+    def __init__(self, repository: AsyncBookRepository):
         self.repository = repository
+        self.page_size = int(os.environ.get("BOOKS_PAGE_SIZE", 20))
+        self.max_page_size = int(os.environ.get("BOOKS_PAGE_MAX_SIZE", 100))
 
-    def list_books(self):
+    async def list_books(self, fields: Optional[List[str]] = None):
         """List all books in the database."""
-        return self.repository.list_all()
+        return await self.repository.list_all(fields)
 
-    def list_books_paginated(self, page: int, size: int):
+    async def list_books_paginated(
+        self, page: int, size: int, fields: Optional[List[str]] = None
+    ):
         """
         Retorna uma lista paginada de livros.
+        A paginação é feita no banco (LIMIT/OFFSET); para páginas profundas,
+        prefira o cursor de list_books_page.
         """
-        start = (page - 1) * size
-        end = start + size
-        books = self.list_books()  # Método que retorna todos os livros
-        return books[start:end]
+        if page < 1 or size < 1:
+            return []
+        return await self.repository.list_offset((page - 1) * size, size, fields)
 
-    def get_book_by_id(self, id: int):
+    async def list_books_page(
+        self,
+        cursor: Optional[str] = None,
+        size: int = None,
+        total: bool = False,
+        fields: Optional[List[str]] = None,
+    ) -> dict:
+        """
+        Página de livros por cursor (keyset no id): a latência é a mesma em
+        qualquer profundidade. next_cursor é None na última página e o total
+        só é contado quando pedido.
+        Lança ValueError se o cursor for inválido.
+        """
+        after_id = decode_cursor(cursor) if cursor else 0
+        size = min(max(size or self.page_size, 1), self.max_page_size)
+
+        # Um livro a mais indica se existe próxima página
+        books = await self.repository.list_after(after_id, size + 1, fields)
+        next_cursor = None
+        if len(books) > size:
+            # Com fields, os livros vêm como dicionários
+            last = books[size - 1]
+            next_cursor = encode_cursor(
+                last["id"] if isinstance(last, dict) else last.id
+            )
+        return {
+            "items": books[:size],
+            "next_cursor": next_cursor,
+            "total": await self.repository.count_all() if total else None,
+        }
+
+    async def get_book_by_id(self, id: int):
         """
         Retorna um livro pelo ID.
         Exemplo: /books/1
         """
-        return self.repository.get_by_id(id)
+        return await self.repository.get_by_id(id)
 
-    def search_books(self, title: str = None, category: str = None):
+    async def search_books(
+        self,
+        title: str = None,
+        category: str = None,
+        fields: Optional[List[str]] = None,
+    ):
         """
         Busca livros por título e/ou categoria.
         Exemplo: /books/search?title={Title}&category={Category}
         """
         if (title and title.strip()) and (category and category.strip()):
-            return self.repository.list_bycategoryandtitle(title, category)
+            return await self.repository.list_bycategoryandtitle(
+                title, category, fields
+            )
         elif title and title.strip():
-            return self.repository.list_bytitle(title)
+            return await self.repository.list_bytitle(title, fields)
         elif category and category.strip():
-            return self.repository.list_bycategory(category)
+            return await self.repository.list_bycategory(category, fields)
         else:
             return []
 
-    def get_top_rated_books(self):
+    async def search_text(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        page: int = 1,
+        size: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ):
+        """
+        Busca textual em título e descrição (prefixo, por relevância), com
+        filtro opcional de categoria e paginação.
+        Exemplo: /books/search?q=pyth&category=Programming&page=1&size=20
+        """
+        size = min(max(size or self.page_size, 1), self.max_page_size)
+        page = max(page or 1, 1)
+        return await self.repository.search(
+            query, category and category.strip(), size, (page - 1) * size, fields
+        )
+
+    async def get_top_rated_books(self, fields: Optional[List[str]] = None):
         """
         Retorna uma lista de livros bem avaliados (exemplo: rating >= 4).
         """
-        return self.repository.get_top_rated_books()
+        return await self.repository.get_top_rated_books(fields)
 
-    def list_books_by_price_range(self, min_price: float, max_price: float):
+    async def list_books_by_price_range(
+        self, min_price: float, max_price: float, fields: Optional[List[str]] = None
+    ):
         """
         Lista livros dentro de um intervalo de preços.
         Exemplo: /books/price-range?min_price=10.0&max_price=50.0
         """
-        return self.repository.list_by_price_range(min_price, max_price)
+        return await self.repository.list_by_price_range(min_price, max_price, fields)
@@ -12,10 +12,10 @@ class CategoriesController:
         self.categories_service = categories_service
 
     @Get("/")
-    def get_all_categories(
+    async def get_all_categories(
         self, user=Depends(get_current_user)
     ) -> List[CategoryListResponse]:
         """
         Retorna todas as categorias disponíveis.
         """
-        return self.categories_service.get_all_categories()
+        return await self.categories_service.get_all_categories()
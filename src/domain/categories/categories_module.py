@@ -1,8 +1,13 @@
 from nest.core import Module
 from .categories_controller import CategoriesController
 from .categories_service import CategoriesService
+from ...infra.repositories.book.book_repository_module import BookRepositoryModule
 
 
-@Module(controllers=[CategoriesController], providers=[CategoriesService])
+@Module(
+    imports=[BookRepositoryModule],
+    controllers=[CategoriesController],
+    providers=[CategoriesService],
+)
 class CategoriesModule:
     pass
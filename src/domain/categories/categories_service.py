@@ -1,18 +1,17 @@
 from nest.core import Injectable
-from ...infra.db import SessionLocal
-from ...infra.models import BookModel
+from ...infra.repositories.book.async_book_repository import AsyncBookRepository
 from .dto.categories_dto import CategoryListResponse
 from typing import List
 
 
 @Injectable()
 class CategoriesService:
-    def __init__(self):
-        self.session = SessionLocal
+    def __init__(self, repository: AsyncBookRepository):
+        self.repository = repository
 
-    def get_all_categories(self) -> List[CategoryListResponse]:
+    async def get_all_categories(self) -> List[CategoryListResponse]:
         """
         Retorna todas as categorias disponíveis.
         """
-        rows = self.session.query(BookModel.category).distinct().all()
-        return [CategoryListResponse(category=row.category) for row in rows]
+        categories = await self.repository.list_categories()
+        return [CategoryListResponse(category=category) for category in categories]
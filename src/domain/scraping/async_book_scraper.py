@@ -0,0 +1,469 @@
+from nest.core import Injectable
+import asyncio
+import httpx
+from typing import AsyncIterator, Callable, List, Dict, Optional
+from .book_parser import (
+    BookParser,
+    create_book_parser,
+    parse_book_page,
+    parse_categories_page,
+    parse_listing_page,
+)
+from .dtos.book_record import BookRecord
+from .dtos.scraped_page import ScrapedPage
+from .dtos.scrape_context import ScrapeContext
+from .metrics import ScrapeMetrics
+from .parse_pool import ParsePool
+from .politeness import HostRateLimiter, RetryPolicy
+from ...common.enums import CrawlMode
+from ...infra.cache.http_cache import HttpCache
+from ...infra.logs.logging_service import LoggingService
+from ...infra.models.crawl_checkpoint_model import CrawlCheckpointModel
+import os
+import time
+
+
+@Injectable
+class AsyncBookScraper:
+    """
+    Motor de scraping baseado em asyncio.
+    Mantém o mesmo contrato de execute() do BookScraper, mas faz todas as
+    requisições com I/O não bloqueante, liberando o event loop da API
+    enquanto o scraping acontece.
+    """
+
+    def __init__(
+        self,
+        logger: LoggingService,
+        cache: HttpCache,
+        rate_limiter: HostRateLimiter,
+        retry_policy: RetryPolicy,
+        parse_pool: ParsePool,
+    ):
+        self.base_url = os.environ.get("URL_TO_SCRAPE")
+        self.max_concurrency = max(1, int(os.environ.get("SCRAPING_CONCURRENCY", 16)))
+        self.parser = create_book_parser(self.base_url)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.parse_pool = parse_pool
+        self.logger = logger
+
+    def __build_client(self) -> httpx.AsyncClient:
+        """Cria o cliente HTTP com o pool limitado à concorrência configurada"""
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency,
+        )
+        # O site não informa charset; usa ISO-8859-1 como o requests faz,
+        # mantendo as mesmas correções de encoding do BookParser
+        return httpx.AsyncClient(
+            limits=limits,
+            timeout=self.retry_policy.timeout,
+            follow_redirects=True,
+            default_encoding="iso-8859-1",
+        )
+
+    async def __request(
+        self, client: httpx.AsyncClient, url: str, headers: dict = None
+    ) -> httpx.Response:
+        """
+        Faz o GET respeitando a taxa do host, com timeout e novas tentativas
+        (backoff exponencial com jitter) em falhas de rede e erros 429/5xx.
+        """
+        attempt = 0
+        while True:
+            await asyncio.sleep(self.rate_limiter.reserve(url))
+            started_at = time.monotonic()
+            try:
+                response = await client.get(url, headers=headers)
+            except httpx.TransportError:
+                self.rate_limiter.record(url, time.monotonic() - started_at, ok=False)
+                if not self.retry_policy.can_retry(attempt):
+                    raise
+                retry_after = None
+            else:
+                retryable = self.retry_policy.is_retryable(response.status_code)
+                self.rate_limiter.record(
+                    url, time.monotonic() - started_at, ok=not retryable
+                )
+                if not retryable or not self.retry_policy.can_retry(attempt):
+                    return response
+                retry_after = response.headers.get("Retry-After")
+
+            delay = self.retry_policy.delay(attempt, retry_after)
+            attempt += 1
+            self.logger.warning(
+                f"Tentativa {attempt} falhou para {url}; nova tentativa em {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+    async def __record_failure(
+        self, run: ScrapeContext, url: str, page_kind: str, error: Exception
+    ):
+        """Contabiliza o erro e registra a página para reprocessamento"""
+        run.metrics.increment("errors")
+        self.logger.error(f"Erro ao acessar {url}: {error}")
+        if run.on_failure:
+            # O registro grava no banco; fica fora do event loop
+            await asyncio.to_thread(
+                run.on_failure, url, page_kind, f"{type(error).__name__}: {error}"
+            )
+
+    async def __cached(self, method, *args):
+        """Executa uma operação do cache HTTP (sqlite3) fora do event loop"""
+        if not self.cache.enabled:
+            return method(*args)
+        return await asyncio.to_thread(method, *args)
+
+    async def __get_html(
+        self,
+        run: ScrapeContext,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        url: str,
+        page_kind: str,
+    ) -> Optional[str]:
+        """Faz a requisição respeitando o limite de concorrência e o cache HTTP"""
+        entry = await self.__cached(self.cache.lookup, url)
+        if entry and entry.fresh:
+            run.metrics.increment("cache_hits")
+            return entry.body
+
+        async with semaphore:
+            try:
+                started_at = time.perf_counter()
+                response = await self.__request(
+                    client, url, entry.validators() if entry else None
+                )
+                if response.status_code == 304 and entry is None:
+                    # 304 sem entrada no cache (vindo de um proxy, por exemplo):
+                    # não há corpo para reaproveitar, então pede a resposta completa
+                    response = await self.__request(
+                        client, url, {"Cache-Control": "no-cache"}
+                    )
+                not_modified = response.status_code == 304 and entry is not None
+                run.metrics.observe_fetch(
+                    time.perf_counter() - started_at,
+                    len(response.content),
+                    not_modified,
+                )
+                if not_modified:
+                    return await self.__cached(self.cache.revalidate, entry)
+                if response.status_code == 304:
+                    raise httpx.HTTPStatusError(
+                        f"304 sem corpo em cache para {url}",
+                        request=response.request,
+                        response=response,
+                    )
+                response.raise_for_status()
+
+                await self.__cached(
+                    self.cache.store, url, response.text, response.headers
+                )
+                return response.text
+            except Exception as e:
+                await self.__record_failure(run, url, page_kind, e)
+                return None
+
+    async def __parse(
+        self, run: ScrapeContext, url: str, page_kind: str, parse_func, *args
+    ):
+        """
+        Executa a função de parsing fora do event loop, medindo o tempo.
+        Retorna None (e registra a falha) se o HTML não puder ser extraído.
+        """
+        try:
+            with run.metrics.timer("parse"):
+                return await self.parse_pool.run_async(parse_func, self.base_url, *args)
+        except Exception as e:
+            await self.__record_failure(run, url, page_kind, e)
+            return None
+
+    async def __get_categories(
+        self,
+        run: ScrapeContext,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        leaf_only: bool = False,
+    ) -> Dict[str, str]:
+        """Extrai todas as categorias de livros"""
+        html = await self.__get_html(
+            run, client, semaphore, self.base_url, BookParser.INDEX_PAGE
+        )
+        if not html:
+            return {}
+
+        categories = await self.__parse(
+            run,
+            self.base_url,
+            BookParser.INDEX_PAGE,
+            parse_categories_page,
+            html,
+            leaf_only,
+        )
+        if not categories:
+            return {}
+
+        self.logger.info(f"Encontradas {len(categories)} categorias")
+        return categories
+
+    async def __extract_book_info(
+        self,
+        run: ScrapeContext,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        detail_url: str,
+    ) -> Optional[BookRecord]:
+        """Busca e extrai um livro pela URL da página de detalhe"""
+        html = await self.__get_html(
+            run, client, semaphore, detail_url, BookParser.DETAIL_PAGE
+        )
+        if not html:
+            return None
+        # Parsing fora do event loop: em uma thread ou no pool de processos
+        book_details = await self.__parse(
+            run, detail_url, BookParser.DETAIL_PAGE, parse_book_page, html
+        )
+        if not book_details:
+            return None
+        try:
+            return BookRecord.from_details(book_details, detail_url)
+        except ValueError as e:
+            await self.__record_failure(run, detail_url, BookParser.DETAIL_PAGE, e)
+            return None
+
+    async def __extract_books(
+        self,
+        run: ScrapeContext,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        detail_urls: List[str],
+    ) -> List[BookRecord]:
+        """Busca as páginas de detalhe, ignorando as que falharam"""
+        # Páginas de detalhe buscadas em paralelo; gather preserva a ordem
+        books_info = await asyncio.gather(
+            *(
+                self.__extract_book_info(run, client, semaphore, detail_url)
+                for detail_url in detail_urls
+            )
+        )
+        return [book_info for book_info in books_info if book_info]
+
+    async def __split_listing(
+        self,
+        run: ScrapeContext,
+        listed_books: List[Dict],
+        known_books: Optional[Callable],
+    ) -> tuple:
+        """
+        Separa os livros da listagem entre os que precisam da página de
+        detalhe (novos ou que voltaram ao estoque) e os já conhecidos, que são
+        atualizados só com os dados da listagem
+        """
+        if not known_books:
+            return [book["url"] for book in listed_books], []
+
+        with run.metrics.timer("db_lookup"):
+            known = await asyncio.to_thread(
+                known_books,
+                [self.parser.book_detail_url(book["url"]) for book in listed_books],
+            )
+        book_urls, refreshes = [], []
+        for book in listed_books:
+            stored = known.get(self.parser.book_detail_url(book["url"]))
+            if stored is None or (book["in_stock"] and not stored.availability):
+                book_urls.append(book["url"])
+            else:
+                refreshes.append(self.parser.to_listing_refresh(book, stored.uuid))
+        return book_urls, refreshes
+
+    async def __get_all_pages_from_category(
+        self,
+        run: ScrapeContext,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        category_name: str,
+        category_url: str,
+        start_url: str,
+        page_num: int = 1,
+        known_books: Optional[Callable] = None,
+    ) -> AsyncIterator[ScrapedPage]:
+        """Percorre as páginas de uma categoria, a partir de start_url"""
+        current_url = start_url
+
+        while current_url:
+            self.logger.info(f"Processando página {page_num} - {current_url}")
+
+            html = await self.__get_html(
+                run, client, semaphore, current_url, BookParser.LISTING_PAGE
+            )
+            listing = html and await self.__parse(
+                run,
+                current_url,
+                BookParser.LISTING_PAGE,
+                parse_listing_page,
+                html,
+                current_url,
+            )
+            if not listing:
+                # O checkpoint continua apontando para esta página
+                break
+
+            book_urls, refreshes = await self.__split_listing(
+                run, listing["books"], known_books
+            )
+            books = (
+                await self.__extract_books(
+                    run,
+                    client,
+                    semaphore,
+                    [self.parser.book_detail_url(book_url) for book_url in book_urls],
+                )
+                + refreshes
+            )
+
+            next_url = listing["next_url"]
+            run.metrics.increment("pages")
+            run.metrics.increment("books", len(books))
+            yield ScrapedPage(
+                category_name, category_url, page_num, current_url, next_url, books
+            )
+            current_url = next_url
+            page_num += 1
+
+    async def __scrape_category(
+        self,
+        run: ScrapeContext,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        category_name: str,
+        category_url: str,
+        checkpoint: Optional[CrawlCheckpointModel] = None,
+        known_books: Optional[Callable] = None,
+    ) -> AsyncIterator[ScrapedPage]:
+        """Faz scraping de uma categoria específica, retomando do checkpoint"""
+        if checkpoint and checkpoint.completed:
+            self.logger.info(f"Categoria já concluída, ignorando: {category_name}")
+            return
+
+        start_url, page_num = category_url, 1
+        if checkpoint and checkpoint.next_page_url:
+            start_url, page_num = checkpoint.next_page_url, checkpoint.pages_done + 1
+            self.logger.info(
+                f"Retomando a categoria {category_name} na página {page_num}"
+            )
+        else:
+            self.logger.info(f"Iniciando scraping da categoria: {category_name}")
+
+        books_count = 0
+        async for page in self.__get_all_pages_from_category(
+            run,
+            client,
+            semaphore,
+            category_name,
+            category_url,
+            start_url,
+            page_num,
+            known_books,
+        ):
+            books_count += len(page.books)
+            yield page
+
+        self.logger.info(f"Quantidade de livros encontrados - {books_count}")
+
+    async def select_categories(
+        self,
+        mode: CrawlMode,
+        metrics: Optional[ScrapeMetrics] = None,
+        on_failure: Optional[Callable] = None,
+    ) -> Dict[str, str]:
+        """Retorna as categorias a serem percorridas no modo de crawl informado"""
+        run = ScrapeContext(metrics, on_failure)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self.__build_client() as client:
+            if mode in (CrawlMode.FULL, CrawlMode.SCHEDULED):
+                # O modo agendado escolhe depois entre as categorias folha
+                return await self.__get_categories(
+                    run, client, semaphore, leaf_only=True
+                )
+
+            categories = await self.__get_categories(run, client, semaphore)
+
+        if not categories:
+            return {}
+
+        first_category = list(categories.items())[0]
+        self.logger.debug(first_category)
+        return dict([first_category])
+
+    async def crawl(
+        self,
+        categories: Dict[str, str],
+        checkpoints: Dict[str, CrawlCheckpointModel] = None,
+        known_books: Optional[Callable] = None,
+        metrics: Optional[ScrapeMetrics] = None,
+        on_failure: Optional[Callable] = None,
+    ) -> AsyncIterator[ScrapedPage]:
+        """
+        Percorre as categorias informadas, gerando uma página por vez.
+        Categorias concluídas nos checkpoints são ignoradas e as parciais
+        são retomadas a partir da próxima página registrada.
+        Com known_books (função que recebe URLs de detalhe e retorna os livros
+        já salvos, indexados pela URL), só os livros novos têm a página de
+        detalhe buscada; os demais vêm como atualizações da listagem.
+        Tempos e contadores da execução são registrados em metrics, e cada
+        página que falhar é informada a on_failure(url, tipo, motivo).
+        """
+        checkpoints = checkpoints or {}
+        run = ScrapeContext(metrics, on_failure)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        try:
+            async with self.__build_client() as client:
+                for category_name, category_url in categories.items():
+                    async for page in self.__scrape_category(
+                        run,
+                        client,
+                        semaphore,
+                        category_name,
+                        category_url,
+                        checkpoints.get(category_name),
+                        known_books,
+                    ):
+                        yield page
+        finally:
+            self.parse_pool.shutdown()
+
+    async def scrape_books(
+        self,
+        detail_urls: List[str],
+        metrics: Optional[ScrapeMetrics] = None,
+        on_failure: Optional[Callable] = None,
+    ) -> List[BookRecord]:
+        """
+        Busca diretamente as páginas de detalhe informadas, usado para
+        reprocessar as que falharam em um crawl anterior
+        """
+        run = ScrapeContext(metrics, on_failure)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        try:
+            async with self.__build_client() as client:
+                return await self.__extract_books(run, client, semaphore, detail_urls)
+        finally:
+            self.parse_pool.shutdown()
+
+    async def iter_books(
+        self, mode: CrawlMode = CrawlMode.FIRST_CATEGORY
+    ) -> AsyncIterator[BookRecord]:
+        """Gera os livros um a um, conforme as páginas são processadas"""
+        async for page in self.crawl(await self.select_categories(mode)):
+            for book in page.books:
+                yield book
+
+    async def execute(
+        self, mode: CrawlMode = CrawlMode.FIRST_CATEGORY
+    ) -> List[BookRecord]:
+        """Função principal para executar o scraping"""
+        return [book async for book in self.iter_books(mode)]
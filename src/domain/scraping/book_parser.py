@@ -0,0 +1,291 @@
+from bs4 import BeautifulSoup, SoupStrainer
+from functools import lru_cache
+from typing import List, Dict, Optional
+from urllib.parse import urljoin
+import os
+import re
+from .dtos.listing_refresh import ListingRefresh
+
+try:
+    # Backend opcional: o lxml é bem mais rápido que o html.parser
+    import lxml  # noqa: F401
+
+    FAST_FEATURES = "lxml"
+except ImportError:
+    FAST_FEATURES = "html.parser"
+
+
+class BookParser:
+    """
+    Concentra a extração de dados do HTML do site de livros.
+    Não faz nenhuma requisição, permitindo que os motores de scraping
+    (síncrono e assíncrono) compartilhem a mesma lógica de parsing.
+    Esta implementação constrói a árvore completa de cada página com o
+    html.parser; subclasses podem trocar a forma de construir a árvore.
+    """
+
+    # Tipos de página, usados pelos backends para decidir o que parsear
+    INDEX_PAGE = "index"
+    LISTING_PAGE = "listing"
+    DETAIL_PAGE = "detail"
+
+    RATING_WORDS = {"One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+
+    def parse(self, html: str, page_kind: str = None) -> BeautifulSoup:
+        """Constrói o BeautifulSoup a partir do HTML"""
+        return BeautifulSoup(html, "html.parser")
+
+    def book_detail_url(self, book_url: str) -> str:
+        """Monta a URL da página de detalhe a partir do link da listagem"""
+        return f"{self.base_url}/catalogue/{book_url.split('../')[-1]}"
+
+    def parse_categories(
+        self, soup: BeautifulSoup, leaf_only: bool = False
+    ) -> Dict[str, str]:
+        """
+        Extrai todas as categorias de livros da barra lateral.
+        Com leaf_only, ignora a categoria raiz ("Books"), que agrega todos os
+        livros e duplicaria o crawl das demais categorias.
+        """
+        categories = {}
+        sidebar = soup.find("div", class_="side_categories")
+
+        if sidebar:
+            links = (
+                sidebar.select("ul.nav-list ul a[href]")
+                if leaf_only
+                else sidebar.find_all("a", href=True)
+            )
+            for link in links:
+                if "catalogue/category" in link.get("href"):
+                    category_name = link.text.strip()
+                    category_url = urljoin(self.base_url, link.get("href"))
+                    categories[category_name] = category_url
+
+        return categories
+
+    def parse_book_links(self, soup: BeautifulSoup) -> List[str]:
+        """Retorna os links das páginas de detalhe dos livros de uma listagem"""
+        return [
+            book_element.find("h3").find("a").get("href")
+            for book_element in soup.find_all("article", class_="product_pod")
+        ]
+
+    def parse_listed_books(self, soup: BeautifulSoup) -> List[Dict]:
+        """
+        Extrai os dados que a própria listagem já traz de cada livro: link da
+        página de detalhe, título, preço, rating e se está em estoque
+        """
+        books = []
+        for book_element in soup.find_all("article", class_="product_pod"):
+            link = book_element.find("h3").find("a")
+            price_element = book_element.find("p", class_="price_color")
+            availability_element = book_element.find("p", class_="availability")
+            books.append(
+                {
+                    "url": link.get("href"),
+                    "title": link.get("title") or link.get_text(strip=True),
+                    "price": (
+                        price_element.get_text(strip=True)
+                        .replace("Â", "")
+                        .replace("£", "")
+                        if price_element
+                        else ""
+                    ),
+                    "rating": self.parse_rating(
+                        book_element.find("p", class_="star-rating")
+                    ),
+                    "in_stock": bool(availability_element)
+                    and "In stock" in availability_element.get_text(),
+                }
+            )
+        return books
+
+    def parse_rating(self, rating_element) -> int:
+        """Converte a classe da estrela (ex.: "star-rating Three") em número"""
+        if not rating_element:
+            return 0
+        return next(
+            (
+                self.RATING_WORDS[word]
+                for word in self.RATING_WORDS
+                if word in rating_element.get("class", [])
+            ),
+            0,
+        )
+
+    def parse_next_page(self, soup: BeautifulSoup, current_url: str) -> Optional[str]:
+        """Retorna a URL da próxima página da listagem, se existir"""
+        next_link = soup.find("li", class_="next")
+        next_anchor = next_link.find("a") if next_link else None
+        if next_anchor:
+            return urljoin(current_url, next_anchor.get("href"))
+        return None
+
+    def parse_book_details(self, soup_page_book: BeautifulSoup) -> Dict:
+        """Extrai informações detalhadas do livro"""
+        book_data = {}
+
+        # Título do livro
+        title_element = soup_page_book.find("h1")
+        book_data["title"] = title_element.get_text(strip=True) if title_element else ""
+
+        # Categoria
+        category_element = soup_page_book.find("ul", class_="breadcrumb")
+        if category_element:
+            category_links = category_element.find_all("a")
+            if len(category_links) >= 3:
+                book_data["category"] = category_links[2].get_text(strip=True)
+            else:
+                book_data["category"] = ""
+
+        # Preço
+        price_element = soup_page_book.find("p", class_="price_color")
+        book_data["price"] = (
+            price_element.get_text(strip=True).replace("Â", "") if price_element else ""
+        )
+
+        # Stock
+        availability_element = soup_page_book.find("p", class_="instock availability")
+        if availability_element:
+            availability_text = availability_element.get_text(
+                strip=True
+            )  # Ex.: "In stock (22 available)"
+            book_data["availability"] = (
+                "In stock" if "In stock" in availability_text else "Out of stock"
+            )
+            # Extrair a quantidade (número entre parênteses)
+            quantity_match = re.search(r"\((\d+) available\)", availability_text)
+            book_data["quantity"] = (
+                int(quantity_match.group(1)) if quantity_match else 0
+            )
+        else:
+            book_data["availability"] = ""
+            book_data["quantity"] = 0
+
+        # Rating
+        rating_element = soup_page_book.find("p", class_="star-rating")
+        book_data["rating"] = self.parse_rating(rating_element)
+        # Description - extrai e corrige encoding
+        desc_element = soup_page_book.find("div", id="product_description")
+        desc_paragraph = desc_element.find_next("p") if desc_element else None
+        if desc_paragraph:
+            raw_desc = desc_paragraph.get_text(strip=True).replace(";", ".")
+            corrected_desc = raw_desc.encode("latin1", errors="ignore").decode(
+                "utf-8", errors="ignore"
+            )
+            book_data["description"] = corrected_desc
+        else:
+            book_data["description"] = ""
+
+        # Product Information
+        table = soup_page_book.find("table", class_="table table-striped")
+        if table:
+            for row in table.find_all("tr"):
+                key = row.find("th").get_text(strip=True)
+                value = row.find("td").get_text(strip=True)
+                book_data[key] = value
+
+        # Image
+        img_element = soup_page_book.find("img")
+        img_src = (
+            img_element["src"].replace("../", "")
+            if img_element and "src" in img_element.attrs
+            else ""
+        )
+        book_data["image"] = f"{self.base_url}{img_src}"
+
+        return book_data
+
+    def to_listing_refresh(self, listed_book: Dict, book_uuid: str) -> ListingRefresh:
+        """
+        Atualização de um livro já conhecido feita só com os dados da
+        listagem, sem buscar a página de detalhe
+        """
+        return ListingRefresh(
+            uuid=book_uuid,
+            url=self.book_detail_url(listed_book["url"]),
+            title=listed_book["title"],
+            price=float(listed_book["price"]) if listed_book["price"] else None,
+            rating=listed_book["rating"],
+            in_stock=listed_book["in_stock"],
+        )
+
+
+class StrainedBookParser(BookParser):
+    """
+    Backend que parseia apenas os fragmentos usados na extração, via
+    SoupStrainer, e usa o lxml quando disponível. O restante da página
+    (cabeçalho, scripts, barra lateral das listagens) nem entra na árvore.
+    """
+
+    STRAINERS = {
+        BookParser.INDEX_PAGE: SoupStrainer("div", class_="side_categories"),
+        BookParser.LISTING_PAGE: SoupStrainer(
+            ["article", "li"], class_=["product_pod", "next"]
+        ),
+        BookParser.DETAIL_PAGE: SoupStrainer(
+            ["ul", "article"], class_=["breadcrumb", "product_page"]
+        ),
+    }
+
+    def parse(self, html: str, page_kind: str = None) -> BeautifulSoup:
+        """Constrói o BeautifulSoup apenas com os fragmentos do tipo de página"""
+        return BeautifulSoup(
+            html, FAST_FEATURES, parse_only=self.STRAINERS.get(page_kind)
+        )
+
+
+PARSER_BACKENDS = {"full": BookParser, "strained": StrainedBookParser}
+
+
+def create_book_parser(base_url: str) -> BookParser:
+    """
+    Cria o parser do backend configurado em SCRAPING_PARSER.
+    Lança ValueError se o backend não existir.
+    """
+    backend = os.environ.get("SCRAPING_PARSER", "strained").lower()
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(
+            f"SCRAPING_PARSER inválido: {backend}. "
+            f"Disponíveis: {', '.join(PARSER_BACKENDS)}"
+        )
+    return PARSER_BACKENDS[backend](base_url)
+
+
+# Funções de parsing executadas pelo ParsePool. Ficam no nível deste módulo,
+# que só depende do bs4, para serem serializáveis e leves de importar nos
+# processos do pool. Recebem e retornam apenas tipos simples (HTML em texto e
+# dicts), nunca objetos do BeautifulSoup.
+
+
+@lru_cache(maxsize=None)
+def _parser_for(base_url: str) -> BookParser:
+    """Parser do processo atual, criado uma única vez por base_url"""
+    return create_book_parser(base_url)
+
+
+def parse_categories_page(base_url: str, html: str, leaf_only: bool = False) -> Dict:
+    """Extrai as categorias da página inicial"""
+    parser = _parser_for(base_url)
+    soup = parser.parse(html, BookParser.INDEX_PAGE)
+    return parser.parse_categories(soup, leaf_only)
+
+
+def parse_listing_page(base_url: str, html: str, url: str) -> Dict:
+    """Extrai os livros e a próxima página de uma listagem"""
+    parser = _parser_for(base_url)
+    soup = parser.parse(html, BookParser.LISTING_PAGE)
+    return {
+        "books": parser.parse_listed_books(soup),
+        "next_url": parser.parse_next_page(soup, url),
+    }
+
+
+def parse_book_page(base_url: str, html: str) -> Dict:
+    """Extrai os detalhes de um livro da sua página"""
+    parser = _parser_for(base_url)
+    return parser.parse_book_details(parser.parse(html, BookParser.DETAIL_PAGE))
@@ -1,238 +1,376 @@
 from nest.core import Injectable
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import time
-from typing import List, Dict, Tuple
-from urllib.parse import urljoin
+from typing import Callable, List, Dict, Iterator, Optional
+from .book_parser import (
+    BookParser,
+    create_book_parser,
+    parse_book_page,
+    parse_categories_page,
+    parse_listing_page,
+)
+from .dtos.book_record import BookRecord
+from .dtos.scraped_page import ScrapedPage
+from .dtos.scrape_context import ScrapeContext
+from .metrics import ScrapeMetrics
+from .parse_pool import ParsePool
+from .politeness import HostRateLimiter, RetryPolicy
+from ...common.enums import CrawlMode
+from ...infra.cache.http_cache import HttpCache
 from ...infra.logs.logging_service import LoggingService
+from ...infra.models.crawl_checkpoint_model import CrawlCheckpointModel
 import os
-import re
 
 
 @Injectable
 class BookScraper:
-    def __init__(self, logger: LoggingService):
+    def __init__(
+        self,
+        logger: LoggingService,
+        cache: HttpCache,
+        rate_limiter: HostRateLimiter,
+        retry_policy: RetryPolicy,
+        parse_pool: ParsePool,
+    ):
         self.base_url = os.environ.get("URL_TO_SCRAPE")
+        self.max_workers = max(1, int(os.environ.get("SCRAPING_WORKERS", 8)))
         self.session = requests.Session()
+        # Pool de conexões dimensionado para o número de workers, evitando
+        # que conexões sejam descartadas quando as threads disputam o host
+        adapter = HTTPAdapter(pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.parser = create_book_parser(self.base_url)
         self.books_data = []
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.parse_pool = parse_pool
         self.logger = logger
 
-    def __get_page(self, url: str) -> BeautifulSoup:
-        """Faz requisição e retorna BeautifulSoup object"""
+    def __request(self, url: str, headers: dict = None) -> requests.Response:
+        """
+        Faz o GET respeitando a taxa do host, com timeout e novas tentativas
+        (backoff exponencial com jitter) em falhas de rede e erros 429/5xx.
+        """
+        attempt = 0
+        while True:
+            time.sleep(self.rate_limiter.reserve(url))
+            started_at = time.monotonic()
+            try:
+                response = self.session.get(
+                    url, headers=headers, timeout=self.retry_policy.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                self.rate_limiter.record(url, time.monotonic() - started_at, ok=False)
+                if not self.retry_policy.can_retry(attempt):
+                    raise
+                retry_after = None
+            else:
+                retryable = self.retry_policy.is_retryable(response.status_code)
+                self.rate_limiter.record(
+                    url, time.monotonic() - started_at, ok=not retryable
+                )
+                if not retryable or not self.retry_policy.can_retry(attempt):
+                    return response
+                retry_after = response.headers.get("Retry-After")
+
+            delay = self.retry_policy.delay(attempt, retry_after)
+            attempt += 1
+            self.logger.warning(
+                f"Tentativa {attempt} falhou para {url}; nova tentativa em {delay:.1f}s"
+            )
+            time.sleep(delay)
+
+    def __fetch(self, run: ScrapeContext, url: str) -> str:
+        """Faz a requisição passando pelo cache HTTP e retorna o HTML"""
+        entry = self.cache.lookup(url)
+        if entry and entry.fresh:
+            run.metrics.increment("cache_hits")
+            return entry.body
+
+        started_at = time.perf_counter()
+        response = self.__request(url, entry.validators() if entry else None)
+        if response.status_code == 304 and entry is None:
+            # 304 sem entrada no cache (vindo de um proxy, por exemplo): não há
+            # corpo para reaproveitar, então pede de novo a resposta completa
+            response = self.__request(url, {"Cache-Control": "no-cache"})
+        not_modified = response.status_code == 304 and entry is not None
+        run.metrics.observe_fetch(
+            time.perf_counter() - started_at, len(response.content), not_modified
+        )
+        if not_modified:
+            return self.cache.revalidate(entry)
+        if response.status_code == 304:
+            raise requests.HTTPError(
+                f"304 sem corpo em cache para {url}", response=response
+            )
+        response.raise_for_status()
+
+        self.cache.store(url, response.text, response.headers)
+        return response.text
+
+    def __get_page(
+        self, run: ScrapeContext, url: str, page_kind: str, parse_func, *args
+    ):
+        """
+        Faz requisição e extrai os dados da página com a função de parsing
+        informada, executada no pool de processos quando habilitado.
+        Em caso de erro retorna None e registra a falha (on_failure), para que
+        a página seja reprocessada depois sem interromper o crawl.
+        """
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            return BeautifulSoup(response.text, "html.parser")
+            html = self.__fetch(run, url)
+            with run.metrics.timer("parse"):
+                return self.parse_pool.run(parse_func, self.base_url, html, *args)
         except Exception as e:
-            self.logger.error(f"Erro ao acessar {url}: {e}")
+            self.__record_failure(run, url, page_kind, e)
             return None
 
-    def __get_categories(self) -> Dict[str, str]:
+    def __record_failure(
+        self, run: ScrapeContext, url: str, page_kind: str, error: Exception
+    ):
+        """Contabiliza o erro e registra a página para reprocessamento"""
+        run.metrics.increment("errors")
+        self.logger.error(f"Erro ao acessar {url}: {error}")
+        if run.on_failure:
+            run.on_failure(url, page_kind, f"{type(error).__name__}: {error}")
+
+    def __get_categories(
+        self, run: ScrapeContext, leaf_only: bool = False
+    ) -> Dict[str, str]:
         """Extrai todas as categorias de livros"""
-        soup = self.__get_page(self.base_url)
-        if not soup:
+        categories = self.__get_page(
+            run, self.base_url, BookParser.INDEX_PAGE, parse_categories_page, leaf_only
+        )
+        if not categories:
             return {}
 
-        categories = {}
-        sidebar = soup.find("div", class_="side_categories")
-        self.logger.debug(f"A side bar é {sidebar}")
-
-        if sidebar:
-            links = sidebar.find_all("a", href=True)
-            self.logger.debug(f"Tem {len(links)}, exemplo : {links[5]}")
-            for link in links:
-                if "catalogue/category" in link.get("href"):
-                    category_name = link.text.strip()
-                    category_url = urljoin(self.base_url, link.get("href"))
-                    categories[category_name] = category_url
-
         self.logger.info(f"Encontradas {len(categories)} categorias")
         return categories
 
-    def __extract_book_details(self, book_url) -> Dict:
+    def __extract_book_details(
+        self, run: ScrapeContext, detail_url: str
+    ) -> Optional[Dict]:
         """Extrai informações detalhadas do livro"""
-        book_data = {}
-
-        book_url_aux = f"{self.base_url}/catalogue/{book_url.split('../')[-1]}"
-        soup_page_book = self.__get_page(book_url_aux)
-
-        # Título do livro
-        book_data["title"] = (
-            soup_page_book.find("h1").get_text(strip=True)
-            if soup_page_book.find("h1")
-            else ""
-        )
-
-        # Categoria
-        category_element = soup_page_book.find("ul", class_="breadcrumb")
-        if category_element:
-            category_links = category_element.find_all("a")
-            if len(category_links) >= 3:
-                book_data["category"] = category_links[2].get_text(strip=True)
-            else:
-                book_data["category"] = ""
-
-        # Preço
-        book_data["price"] = (
-            soup_page_book.find("p", class_="price_color")
-            .get_text(strip=True)
-            .replace("Â", "")
-            if soup_page_book.find("p", class_="price_color")
-            else ""
-        )
+        return self.__get_page(run, detail_url, BookParser.DETAIL_PAGE, parse_book_page)
+
+    def __extract_book_info(
+        self, run: ScrapeContext, detail_url: str
+    ) -> Optional[BookRecord]:
+        """Extrai o livro a partir da URL da página de detalhe"""
+        book_details = self.__extract_book_details(run, detail_url)
+        if not book_details:
+            # A falha já foi registrada; o livro fica para o reprocessamento
+            return None
+        try:
+            return BookRecord.from_details(book_details, detail_url)
+        except ValueError as e:
+            self.__record_failure(run, detail_url, BookParser.DETAIL_PAGE, e)
+            return None
 
-        # Stock
-        availability_element = soup_page_book.find("p", class_="instock availability")
-        if availability_element:
-            availability_text = availability_element.get_text(
-                strip=True
-            )  # Ex.: "In stock (22 available)"
-            book_data["availability"] = (
-                "In stock" if "In stock" in availability_text else "Out of stock"
-            )
-            # Extrair a quantidade (número entre parênteses)
-            quantity_match = re.search(r"\((\d+) available\)", availability_text)
-            book_data["quantity"] = (
-                int(quantity_match.group(1)) if quantity_match else 0
-            )
+    def __extract_books(
+        self, run: ScrapeContext, detail_urls: List[str]
+    ) -> List[BookRecord]:
+        """Busca as páginas de detalhe, ignorando as que falharam"""
+        if self.max_workers > 1 and len(detail_urls) > 1:
+            # Busca as páginas de detalhe em paralelo; o map preserva a ordem
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(detail_urls))
+            ) as executor:
+                books_info = list(
+                    executor.map(partial(self.__extract_book_info, run), detail_urls)
+                )
         else:
-            book_data["availability"] = ""
-            book_data["quantity"] = 0
-
-        # Rating
-        rating_element = soup_page_book.find("p", class_="star-rating")
-        rating_words = {"One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
-        book_data["rating"] = (
-            next(
-                (
-                    rating_words[word]
-                    for word in rating_words
-                    if word in rating_element.get("class", [])
-                ),
-                0,
-            )
-            if rating_element
-            else 0
-        )
-        # Description - extrai e corrige encoding
-        desc_element = soup_page_book.find("div", id="product_description")
-        if desc_element and desc_element.find_next("p"):
-            raw_desc = (
-                desc_element.find_next("p").get_text(strip=True).replace(";", ".")
-            )
-            corrected_desc = raw_desc.encode("latin1", errors="ignore").decode(
-                "utf-8", errors="ignore"
+            books_info = [self.__extract_book_info(run, url) for url in detail_urls]
+
+        return [book_info for book_info in books_info if book_info]
+
+    def __split_listing(
+        self,
+        run: ScrapeContext,
+        listed_books: List[Dict],
+        known_books: Optional[Callable],
+    ) -> tuple:
+        """
+        Separa os livros da listagem entre os que precisam da página de
+        detalhe (novos ou que voltaram ao estoque) e os já conhecidos, que são
+        atualizados só com os dados da listagem
+        """
+        if not known_books:
+            return [book["url"] for book in listed_books], []
+
+        with run.metrics.timer("db_lookup"):
+            known = known_books(
+                [self.parser.book_detail_url(book["url"]) for book in listed_books]
             )
-            book_data["description"] = corrected_desc
-        else:
-            book_data["description"] = ""
-
-        # Product Information
-        table = soup_page_book.find("table", class_="table table-striped")
-        if table:
-            for row in table.find_all("tr"):
-                key = row.find("th").get_text(strip=True)
-                value = row.find("td").get_text(strip=True)
-                book_data[key] = value
-
-        # Image
-        img_element = soup_page_book.find("img")
-        img_src = (
-            img_element["src"].replace("../", "")
-            if img_element and "src" in img_element.attrs
-            else ""
-        )
-        book_data["image"] = f"{self.base_url}{img_src}"
-
-        return book_data
-
-    def __extract_book_info(self, book_element) -> Dict:
-        """Chama o método para extrair a informação do livro, passando a url dele"""
-        book_url = book_element.find("h3").find("a").get("href")
-        book_details = self.__extract_book_details(book_url)
-
-        # Resultado filtrado com limpeza de "Â"
-        books_filtered = {
-            "id": book_details.get("UPC"),
-            "title": book_details.get("title"),
-            "category": book_details.get("category", ""),
-            "rating": book_details.get("rating", 0),
-            "price_excl_tax": book_details.get("Price (excl. tax)", "").replace(
-                "Â£", ""
-            ),
-            "price_incl_tax": book_details.get("Price (incl. tax)", "").replace(
-                "Â£", ""
-            ),
-            "tax": book_details.get("Tax", "").replace("Â£", ""),
-            "availability": book_details.get("quantity", 0),
-            "reviews_qtd": book_details.get("Number of reviews"),
-            "description": book_details.get("description"),
-            "image": book_details.get("image"),
-        }
-
-        return books_filtered
-
-    def __get_books_from_page(self, page_url: str) -> List[Dict]:
-        """Extrai todos os livros de uma página"""
-        soup = self.__get_page(page_url)
-        if not soup:
-            return []
-
-        books = []
-        book_elements = soup.find_all("article", class_="product_pod")
-
-        for book_element in book_elements:
-            book_info = self.__extract_book_info(book_element)
-            if book_info["title"]:  # Só adiciona se tiver título
-                books.append(book_info)
-
-        return books
-
-    def __get_all_pages_from_category(self, category_url: str) -> List[Dict]:
-        """Percorre todas as páginas de uma categoria"""
-        all_books = []
-        current_url = category_url
-        page_num = 1
+        book_urls, refreshes = [], []
+        for book in listed_books:
+            stored = known.get(self.parser.book_detail_url(book["url"]))
+            if stored is None or (book["in_stock"] and not stored.availability):
+                book_urls.append(book["url"])
+            else:
+                refreshes.append(self.parser.to_listing_refresh(book, stored.uuid))
+        return book_urls, refreshes
+
+    def __get_books_from_page(
+        self, run: ScrapeContext, listing: Dict, known_books: Optional[Callable] = None
+    ) -> List:
+        """
+        Extrai todos os livros de uma página de listagem já parseada: novos
+        como BookRecord e os já conhecidos como ListingRefresh
+        """
+        book_urls, refreshes = self.__split_listing(run, listing["books"], known_books)
+        detail_urls = [self.parser.book_detail_url(book_url) for book_url in book_urls]
+        return self.__extract_books(run, detail_urls) + refreshes
+
+    def __get_all_pages_from_category(
+        self,
+        run: ScrapeContext,
+        category_name: str,
+        category_url: str,
+        start_url: str,
+        page_num: int = 1,
+        known_books: Optional[Callable] = None,
+    ) -> Iterator[ScrapedPage]:
+        """Percorre as páginas de uma categoria, a partir de start_url"""
+        current_url = start_url
 
         while current_url:
             self.logger.info(f"Processando página {page_num} - {current_url}")
 
-            books = self.__get_books_from_page(current_url)
-            all_books.extend(books)
-
-            # Verifica se há próxima página
-            soup = self.__get_page(current_url)
-            if soup:
-                next_link = soup.find("li", class_="next")
-                self.logger.debug(f"pagina {page_num} : {next_link}")
-                if next_link and next_link.find("a"):
-                    next_url = next_link.find("a").get("href")
-                    current_url = urljoin(current_url, next_url)
-                    page_num += 1
-                else:
-                    current_url = None
-            else:
+            # A listagem é parseada uma única vez: livros e próxima página
+            listing = self.__get_page(
+                run,
+                current_url,
+                BookParser.LISTING_PAGE,
+                parse_listing_page,
+                current_url,
+            )
+            if not listing:
+                # O checkpoint continua apontando para esta página
                 break
 
-            time.sleep(0.5)
-
-        return all_books
-
-    def __scrape_category(self, category_name: str, category_url: str) -> List[Dict]:
-        """Faz scraping de uma categoria específica"""
-        self.logger.info(f"Iniciando scraping da categoria: {category_name}")
-
-        books = self.__get_all_pages_from_category(category_url)
-
-        self.logger.info(f"Quantidade de livros encontrados - {len(books)}")
-        return books
+            books = self.__get_books_from_page(run, listing, known_books)
+            next_url = listing["next_url"]
+            self.logger.debug(f"pagina {page_num} : {next_url}")
+            run.metrics.increment("pages")
+            run.metrics.increment("books", len(books))
+            yield ScrapedPage(
+                category_name, category_url, page_num, current_url, next_url, books
+            )
+            current_url = next_url
+            page_num += 1
+
+    def __scrape_category(
+        self,
+        run: ScrapeContext,
+        category_name: str,
+        category_url: str,
+        checkpoint: Optional[CrawlCheckpointModel] = None,
+        known_books: Optional[Callable] = None,
+    ) -> Iterator[ScrapedPage]:
+        """Faz scraping de uma categoria específica, retomando do checkpoint"""
+        if checkpoint and checkpoint.completed:
+            self.logger.info(f"Categoria já concluída, ignorando: {category_name}")
+            return
+
+        start_url, page_num = category_url, 1
+        if checkpoint and checkpoint.next_page_url:
+            start_url, page_num = checkpoint.next_page_url, checkpoint.pages_done + 1
+            self.logger.info(
+                f"Retomando a categoria {category_name} na página {page_num}"
+            )
+        else:
+            self.logger.info(f"Iniciando scraping da categoria: {category_name}")
+
+        books_count = 0
+        for page in self.__get_all_pages_from_category(
+            run, category_name, category_url, start_url, page_num, known_books
+        ):
+            books_count += len(page.books)
+            yield page
+
+        self.logger.info(f"Quantidade de livros encontrados - {books_count}")
+
+    def select_categories(
+        self,
+        mode: CrawlMode,
+        metrics: Optional[ScrapeMetrics] = None,
+        on_failure: Optional[Callable] = None,
+    ) -> Dict[str, str]:
+        """Retorna as categorias a serem percorridas no modo de crawl informado"""
+        run = ScrapeContext(metrics, on_failure)
+        if mode in (CrawlMode.FULL, CrawlMode.SCHEDULED):
+            # O modo agendado escolhe depois entre as categorias folha
+            return self.__get_categories(run, leaf_only=True)
+
+        categories = self.__get_categories(run)
+        if not categories:
+            return {}
 
-    def execute(self):
+        first_category = list(categories.items())[0]
+        self.logger.debug(first_category)
+        return dict([first_category])
+
+    def crawl(
+        self,
+        categories: Dict[str, str],
+        checkpoints: Dict[str, CrawlCheckpointModel] = None,
+        known_books: Optional[Callable] = None,
+        metrics: Optional[ScrapeMetrics] = None,
+        on_failure: Optional[Callable] = None,
+    ) -> Iterator[ScrapedPage]:
+        """
+        Percorre as categorias informadas, gerando uma página por vez.
+        Categorias concluídas nos checkpoints são ignoradas e as parciais
+        são retomadas a partir da próxima página registrada.
+        Com known_books (função que recebe URLs de detalhe e retorna os livros
+        já salvos, indexados pela URL), só os livros novos têm a página de
+        detalhe buscada; os demais vêm como atualizações da listagem.
+        Tempos e contadores da execução são registrados em metrics, e cada
+        página que falhar é informada a on_failure(url, tipo, motivo).
+        """
+        checkpoints = checkpoints or {}
+        run = ScrapeContext(metrics, on_failure)
+        try:
+            for category_name, category_url in categories.items():
+                yield from self.__scrape_category(
+                    run,
+                    category_name,
+                    category_url,
+                    checkpoints.get(category_name),
+                    known_books,
+                )
+        finally:
+            self.parse_pool.shutdown()
+
+    def scrape_books(
+        self,
+        detail_urls: List[str],
+        metrics: Optional[ScrapeMetrics] = None,
+        on_failure: Optional[Callable] = None,
+    ) -> List[BookRecord]:
+        """
+        Busca diretamente as páginas de detalhe informadas, usado para
+        reprocessar as que falharam em um crawl anterior
+        """
+        run = ScrapeContext(metrics, on_failure)
+        try:
+            return self.__extract_books(run, detail_urls)
+        finally:
+            self.parse_pool.shutdown()
+
+    def iter_books(
+        self, mode: CrawlMode = CrawlMode.FIRST_CATEGORY
+    ) -> Iterator[BookRecord]:
+        """Gera os livros um a um, conforme as páginas são processadas"""
+        for page in self.crawl(self.select_categories(mode)):
+            yield from page.books
+
+    def execute(self, mode: CrawlMode = CrawlMode.FIRST_CATEGORY) -> List[BookRecord]:
         """Função principal para executar o scraping"""
-
-        categories = self.__get_categories()
-
-        if categories:
-            first_category = list(categories.items())[0]
-            self.logger.debug(first_category)
-            return self.__scrape_category(first_category[0], first_category[1])
+        return list(self.iter_books(mode))
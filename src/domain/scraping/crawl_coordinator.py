@@ -0,0 +1,138 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List
+import asyncio
+import multiprocessing
+from .async_book_scraper import AsyncBookScraper
+from .book_scraper import BookScraper
+from .parse_pool import ParsePool
+from .politeness import HostRateLimiter, RetryPolicy
+from .progress import ScrapeProgress
+from .scheduler import StalenessScheduler
+from .scraping_service import ScrapingService
+from .sharding import partition
+from ...common.enums import CrawlMode
+from ...infra.cache.http_cache import HttpCache
+from ...infra.logs.logging_service import LoggingService
+from ...infra.repositories.book.book_repository import BookRepository
+from ...infra.repositories.crawl.category_state_repository import (
+    CategoryStateRepository,
+)
+from ...infra.repositories.crawl.crawl_checkpoint_repository import (
+    CrawlCheckpointRepository,
+)
+from ...infra.repositories.crawl.failed_page_repository import FailedPageRepository
+from ...infra.repositories.crawl.scrape_job_repository import ScrapeJobRepository
+from ...infra.repositories.crawl.scrape_run_repository import ScrapeRunRepository
+
+
+def build_scraping_service(
+    logger: LoggingService = None, rate_share: int = 1
+) -> ScrapingService:
+    """
+    Monta o ScrapingService fora do container de injeção do PyNest, para uso
+    em processos que não sobem a API (workers de crawl e CLI).
+    rate_share é o número de processos que fazem crawl ao mesmo tempo: cada
+    um fica com 1/rate_share da taxa configurada (SCRAPING_RATE*).
+    """
+    logger = logger or LoggingService("scraping_worker")
+    cache = HttpCache()
+    rate_limiter = HostRateLimiter()
+    rate_limiter.share(rate_share)
+    retry_policy = RetryPolicy()
+    parse_pool = ParsePool()
+    return ScrapingService(
+        BookScraper(logger, cache, rate_limiter, retry_policy, parse_pool),
+        AsyncBookScraper(logger, cache, rate_limiter, retry_policy, parse_pool),
+        BookRepository(),
+        CrawlCheckpointRepository(),
+        ScrapeRunRepository(),
+        FailedPageRepository(),
+        ScrapeJobRepository(),
+        StalenessScheduler(CategoryStateRepository(), logger),
+        ScrapeProgress(),
+        logger,
+    )
+
+
+def run_shard(
+    mode: str, shard: int, shards: int, categories: Dict[str, str], workers: int
+) -> Dict:
+    """
+    Executa o crawl de um shard no processo atual e retorna as contagens.
+    Fica no nível do módulo para ser enviado aos processos workers.
+    categories são as do shard, já buscadas pelo coordenador, e a taxa de
+    requisições é dividida entre os workers que rodam ao mesmo tempo.
+    """
+    service = build_scraping_service(
+        LoggingService(f"scraping_shard_{shard}"), rate_share=workers
+    )
+    counts = asyncio.run(service.trigger(CrawlMode(mode), shard, shards, categories))
+    return {"shard": shard, **counts}
+
+
+class CrawlCoordinator:
+    """
+    Divide as categorias do catálogo em shards (por hash do nome) e executa
+    cada shard em um processo worker independente.
+    Os workers gravam direto no banco pelo repositório: a ingestão é um
+    upsert por uuid e os checkpoints são por categoria, então os shards não
+    interferem entre si e um shard interrompido pode ser executado de novo.
+    Há mais shards que workers para balancear: quem termina antes pega o
+    próximo shard pendente.
+    A página inicial é buscada uma vez, aqui, e cada worker recebe as
+    categorias do seu shard. Cada worker tem o seu limitador de taxa, com
+    SCRAPING_RATE / workers, para que juntos respeitem SCRAPING_RATE.
+    """
+
+    def __init__(self, workers: int, shards: int = None, logger: LoggingService = None):
+        self.workers = max(1, workers)
+        self.shards = max(self.workers, shards or self.workers * 4)
+        self.logger = logger or LoggingService("crawl_coordinator")
+
+    def run(self, mode: CrawlMode = CrawlMode.FULL) -> Dict:
+        """Executa o crawl completo e retorna as contagens somadas"""
+        service = build_scraping_service(self.logger)
+        categories = service.book_scraper.select_categories(mode)
+        shards = partition(categories, self.shards)
+        pending = [shard for shard, names in enumerate(shards) if names]
+        self.logger.info(
+            f"{len(categories)} categorias em {len(pending)} shards "
+            f"para {self.workers} workers"
+        )
+
+        # Processos que fazem crawl ao mesmo tempo, entre os quais a taxa é dividida
+        concurrent = max(1, min(self.workers, len(pending)))
+        totals = {"inserted": 0, "updated": 0, "unchanged": 0}
+        failed: List[int] = []
+        # "spawn": cada worker começa com conexões e pools próprios
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = {
+                executor.submit(
+                    run_shard,
+                    mode.value,
+                    shard,
+                    self.shards,
+                    shards[shard],
+                    concurrent,
+                ): shard
+                for shard in pending
+            }
+            for future in as_completed(futures):
+                shard = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.logger.error(f"Shard {shard} falhou: {e}")
+                    failed.append(shard)
+                    continue
+                for key in totals:
+                    totals[key] += result[key]
+                self.logger.info(f"Shard {shard} concluído: {result}")
+
+        if failed:
+            self.logger.warning(
+                f"Shards com falha (execute novamente para retomar): {sorted(failed)}"
+            )
+        return {**totals, "failed_shards": sorted(failed)}
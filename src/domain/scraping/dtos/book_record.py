@@ -0,0 +1,110 @@
+from typing import Dict, Optional
+from ....infra.models.book_model import BookModel
+
+
+def parse_price(text: Optional[str]) -> float:
+    """Converte um preço do site (ex.: "Â£51.77") em número"""
+    if not text:
+        raise ValueError("preço ausente")
+    return float(text.replace("Â", "").replace("£", "").strip())
+
+
+class BookRecord:
+    """
+    Livro extraído de uma página de detalhe, já validado e com os campos
+    numéricos convertidos. Vai direto para a escrita em lote do repositório,
+    sem passar por dicionários intermediários nem por objetos do ORM.
+    """
+
+    __slots__ = (
+        "uuid",
+        "url",
+        "title",
+        "category",
+        "rating",
+        "price_excl_tax",
+        "price_incl_tax",
+        "tax",
+        "availability",
+        "reviews_qtd",
+        "description",
+        "image",
+    )
+
+    def __init__(
+        self,
+        uuid: str,
+        title: str,
+        category: str,
+        rating: int,
+        price_excl_tax: float,
+        price_incl_tax: float,
+        tax: float,
+        availability: int = 0,
+        reviews_qtd: int = 0,
+        description: str = None,
+        image: str = None,
+        url: str = None,
+    ):
+        self.uuid = uuid
+        self.url = url
+        self.title = title
+        self.category = category
+        self.rating = rating
+        self.price_excl_tax = price_excl_tax
+        self.price_incl_tax = price_incl_tax
+        self.tax = tax
+        self.availability = availability
+        self.reviews_qtd = reviews_qtd
+        self.description = description
+        self.image = image
+
+    @classmethod
+    def from_details(cls, book_details: Dict, url: str = None) -> "BookRecord":
+        """
+        Valida e converte os detalhes extraídos pelo BookParser.
+        Lança ValueError se faltar o UPC, o título ou um preço.
+        O UPC do site é um código hexadecimal, então continua texto.
+        """
+        uuid = (book_details.get("UPC") or "").strip()
+        title = book_details.get("title")
+        if not uuid:
+            raise ValueError("livro sem UPC")
+        if not title:
+            raise ValueError(f"livro {uuid} sem título")
+        return cls(
+            uuid=uuid,
+            title=title,
+            category=book_details.get("category", ""),
+            rating=int(book_details.get("rating") or 0),
+            price_excl_tax=parse_price(book_details.get("Price (excl. tax)")),
+            price_incl_tax=parse_price(book_details.get("Price (incl. tax)")),
+            tax=parse_price(book_details.get("Tax")),
+            availability=int(book_details.get("quantity") or 0),
+            reviews_qtd=int(book_details.get("Number of reviews") or 0),
+            description=book_details.get("description"),
+            image=book_details.get("image"),
+            url=url,
+        )
+
+    def fingerprint(self) -> str:
+        """Mesma impressão digital do BookModel com este conteúdo"""
+        return BookModel.fingerprint_of(
+            getattr(self, field) for field in BookModel.FINGERPRINT_FIELDS
+        )
+
+    def as_row(self) -> Dict:
+        """Valores das colunas da tabela books"""
+        return {
+            "uuid": self.uuid,
+            "title": self.title,
+            "category": self.category,
+            "rating": self.rating,
+            "price_excl_tax": self.price_excl_tax,
+            "price_incl_tax": self.price_incl_tax,
+            "tax": self.tax,
+            "availability": self.availability,
+            "reviews_qtd": self.reviews_qtd,
+            "description": self.description,
+            "image": self.image,
+        }
@@ -0,0 +1,26 @@
+from typing import Optional
+
+
+class ListingRefresh:
+    """
+    Atualização de um livro já conhecido feita só com os dados da página de
+    listagem (preço, rating, título e se está em estoque)
+    """
+
+    __slots__ = ("uuid", "url", "title", "price", "rating", "in_stock")
+
+    def __init__(
+        self,
+        uuid: str,
+        url: str,
+        title: str,
+        price: Optional[float],
+        rating: int,
+        in_stock: bool,
+    ):
+        self.uuid = uuid
+        self.url = url
+        self.title = title
+        self.price = price
+        self.rating = rating
+        self.in_stock = in_stock
@@ -0,0 +1,23 @@
+from typing import Callable, Optional
+from ..metrics import ScrapeMetrics
+
+
+class ScrapeContext:
+    """
+    Estado de uma execução dos motores de scraping. Os scrapers são
+    singletons (@Injectable) e podem atender execuções sobrepostas (trigger,
+    reprocessamento e agendador no mesmo worker); cada chamada pública cria
+    o seu contexto e o passa adiante, em vez de guardá-lo no scraper.
+    on_failure(url, tipo, motivo) recebe as páginas que falharam nesta
+    execução.
+    """
+
+    __slots__ = ("metrics", "on_failure")
+
+    def __init__(
+        self,
+        metrics: Optional[ScrapeMetrics] = None,
+        on_failure: Optional[Callable] = None,
+    ):
+        self.metrics = metrics or ScrapeMetrics()
+        self.on_failure = on_failure
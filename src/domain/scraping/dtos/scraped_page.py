@@ -0,0 +1,27 @@
+from typing import List, Optional
+
+
+class ScrapedPage:
+    """Página de listagem processada durante o crawl de uma categoria"""
+
+    def __init__(
+        self,
+        category: str,
+        category_url: str,
+        page_num: int,
+        url: str,
+        next_url: Optional[str],
+        books: List,
+    ):
+        self.category = category
+        self.category_url = category_url
+        self.page_num = page_num
+        self.url = url
+        self.next_url = next_url
+        # BookRecord (livros novos) ou ListingRefresh (já conhecidos)
+        self.books = books
+
+    @property
+    def is_last(self) -> bool:
+        """Indica se é a última página da categoria"""
+        return self.next_url is None
@@ -0,0 +1,103 @@
+from contextlib import contextmanager
+from typing import Dict
+import bisect
+import threading
+import time
+
+
+class ScrapeMetrics:
+    """
+    Contadores e tempos de uma execução de scraping, por etapa.
+    Uma instância por execução; os motores e o serviço registram nela de
+    várias threads/corrotinas, por isso as atualizações usam um lock.
+    Tempos de etapa (parse, db_lookup dos livros conhecidos e db_write) são
+    somados entre as threads, então podem passar da duração total da execução.
+    """
+
+    # Limites superiores (segundos) dos buckets do histograma de latência
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.__started = time.perf_counter()
+        self.__finished = None
+        self.counters: Dict[str, int] = {
+            "pages": 0,
+            "books": 0,
+            "requests": 0,
+            "bytes": 0,
+            "cache_hits": 0,
+            "not_modified": 0,
+            "errors": 0,
+        }
+        self.stage_seconds: Dict[str, float] = {}
+        self.latency_histogram = [0] * (len(self.LATENCY_BUCKETS) + 1)
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.__lock = threading.Lock()
+
+    def increment(self, name: str, amount: int = 1):
+        with self.__lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe_fetch(self, latency: float, size: int, not_modified: bool = False):
+        """Registra uma requisição feita à rede (tentativas incluídas na latência)"""
+        bucket = bisect.bisect_left(self.LATENCY_BUCKETS, latency)
+        with self.__lock:
+            self.counters["requests"] += 1
+            self.counters["bytes"] += size
+            if not_modified:
+                self.counters["not_modified"] += 1
+            self.latency_histogram[bucket] += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def add_time(self, stage: str, seconds: float):
+        with self.__lock:
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def timer(self, stage: str):
+        """Mede o bloco e soma o tempo na etapa informada"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - started)
+
+    def finish(self):
+        self.__finished = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        return (self.__finished or time.perf_counter()) - self.__started
+
+    def report(self) -> Dict:
+        """Resumo da execução: contadores, vazão, latência e tempo por etapa"""
+        with self.__lock:
+            duration = self.duration
+            requests = self.counters["requests"]
+            labels = [f"<={limit}s" for limit in self.LATENCY_BUCKETS] + [
+                f">{self.LATENCY_BUCKETS[-1]}s"
+            ]
+            return {
+                "duration": round(duration, 3),
+                **self.counters,
+                "pages_per_second": (
+                    round(self.counters["pages"] / duration, 3) if duration else 0.0
+                ),
+                "books_per_second": (
+                    round(self.counters["books"] / duration, 3) if duration else 0.0
+                ),
+                "fetch_latency": {
+                    "average": (
+                        round(self.latency_total / requests, 4) if requests else 0.0
+                    ),
+                    "max": round(self.latency_max, 4),
+                    "histogram": dict(zip(labels, self.latency_histogram)),
+                },
+                "stages": {
+                    stage: round(seconds, 3)
+                    for stage, seconds in self.stage_seconds.items()
+                },
+            }
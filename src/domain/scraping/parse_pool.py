@@ -0,0 +1,63 @@
+from nest.core import Injectable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Optional
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+
+
+@Injectable
+class ParsePool:
+    """
+    Executa o parsing do HTML em um pool de processos, tirando o trabalho de
+    CPU do GIL enquanto as threads/corrotinas seguem fazendo as requisições.
+    Com SCRAPING_PARSE_PROCESSES=0 (padrão) o parsing roda no próprio
+    processo, como antes. O pool é criado sob demanda e encerrado ao fim de
+    cada crawl (e na saída do interpretador).
+    """
+
+    def __init__(self):
+        processes = os.environ.get("SCRAPING_PARSE_PROCESSES", "0").lower()
+        self.processes = (
+            os.cpu_count() or 1 if processes == "auto" else max(0, int(processes))
+        )
+        self.__executor: Optional[ProcessPoolExecutor] = None
+        self.__lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 0
+
+    def __get_executor(self) -> Executor:
+        with self.__lock:
+            if self.__executor is None:
+                # "spawn" evita herdar por fork as threads e conexões do processo
+                # da API; os workers só importam o módulo de parsing
+                self.__executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self.__executor
+
+    def run(self, func: Callable, *args):
+        """Executa a função de parsing e aguarda o resultado (uso síncrono)"""
+        if not self.enabled:
+            return func(*args)
+        return self.__get_executor().submit(func, *args).result()
+
+    async def run_async(self, func: Callable, *args):
+        """Executa a função de parsing sem bloquear o event loop"""
+        if not self.enabled:
+            return await asyncio.to_thread(func, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__get_executor(), func, *args)
+
+    def shutdown(self):
+        """Encerra os processos do pool, aguardando as tarefas em andamento"""
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
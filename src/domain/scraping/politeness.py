@@ -0,0 +1,166 @@
+from nest.core import Injectable
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import datetime
+import os
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket simples. Reservas além dos tokens disponíveis deixam o saldo
+    negativo, formando uma fila: cada chamador recebe o tempo que deve esperar.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def set_rate(self, rate: float):
+        """Altera a taxa (requisições por segundo) mantendo o saldo atual"""
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def reserve(self) -> float:
+        """Consome um token e retorna quantos segundos esperar antes de usá-lo"""
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+@Injectable
+class HostRateLimiter:
+    """
+    Limita a taxa de requisições por host com um token bucket por host.
+    A taxa se adapta ao que o servidor aguenta: sobe 5% a cada resposta rápida
+    e sem erro, e cai pela metade em erros, throttling (429/503) ou quando a
+    latência média passa do alvo.
+    """
+
+    def __init__(self):
+        self.initial_rate = float(os.environ.get("SCRAPING_RATE", 4))
+        self.min_rate = float(os.environ.get("SCRAPING_RATE_MIN", 0.5))
+        self.max_rate = float(os.environ.get("SCRAPING_RATE_MAX", 50))
+        self.target_latency = float(os.environ.get("SCRAPING_TARGET_LATENCY", 1.0))
+        self.__buckets: Dict[str, TokenBucket] = {}
+        self.__latencies: Dict[str, float] = {}
+        self.__decreased_at: Dict[str, float] = {}
+        self.__lock = threading.Lock()
+
+    def __bucket(self, host: str) -> TokenBucket:
+        if host not in self.__buckets:
+            self.__buckets[host] = TokenBucket(self.initial_rate)
+        return self.__buckets[host]
+
+    def reserve(self, url: str) -> float:
+        """Reserva uma requisição para o host da URL; retorna a espera em segundos"""
+        with self.__lock:
+            return self.__bucket(urlsplit(url).netloc).reserve()
+
+    def record(self, url: str, latency: float, ok: bool):
+        """Registra o resultado de uma requisição e ajusta a taxa do host"""
+        host = urlsplit(url).netloc
+        with self.__lock:
+            bucket = self.__bucket(host)
+            # Média móvel exponencial da latência, para não reagir a picos isolados
+            average = self.__latencies.get(host, latency) * 0.8 + latency * 0.2
+            self.__latencies[host] = average
+
+            now = time.monotonic()
+            if not ok or average > self.target_latency:
+                # No máximo uma redução por segundo: as respostas de uma mesma
+                # rajada não derrubam a taxa várias vezes seguidas
+                if now - self.__decreased_at.get(host, 0.0) >= 1.0:
+                    bucket.set_rate(max(self.min_rate, bucket.rate * 0.5))
+                    self.__decreased_at[host] = now
+            else:
+                bucket.set_rate(min(self.max_rate, bucket.rate * 1.05))
+
+    def share(self, parts: int):
+        """
+        Divide as taxas (inicial, mínima e máxima) entre parts limitadores
+        que atingem os mesmos hosts ao mesmo tempo, como os processos de um
+        crawl em shards: cada um tem o seu token bucket, então a soma deles
+        fica em SCRAPING_RATE em vez de parts * SCRAPING_RATE.
+        """
+        parts = max(1, parts)
+        with self.__lock:
+            self.initial_rate /= parts
+            self.min_rate /= parts
+            self.max_rate /= parts
+            for bucket in self.__buckets.values():
+                bucket.set_rate(bucket.rate / parts)
+
+    def rate(self, url: str) -> float:
+        """Taxa atual (requisições por segundo) do host da URL"""
+        with self.__lock:
+            return self.__bucket(urlsplit(url).netloc).rate
+
+
+@Injectable
+class RetryPolicy:
+    """
+    Política de novas tentativas com backoff exponencial e jitter.
+    Respeita o cabeçalho Retry-After quando o servidor o envia, até
+    SCRAPING_BACKOFF_MAX segundos.
+    """
+
+    RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self):
+        self.timeout = float(os.environ.get("SCRAPING_TIMEOUT", 10))
+        self.max_retries = int(os.environ.get("SCRAPING_MAX_RETRIES", 3))
+        self.base_delay = float(os.environ.get("SCRAPING_BACKOFF_BASE", 0.5))
+        self.max_delay = float(os.environ.get("SCRAPING_BACKOFF_MAX", 30))
+
+    def is_retryable(self, status_code: int) -> bool:
+        """Indica se o status HTTP deve gerar uma nova tentativa"""
+        return status_code in self.RETRYABLE_STATUS
+
+    def can_retry(self, attempt: int) -> bool:
+        """Indica se ainda há tentativas após a tentativa informada (0 = primeira)"""
+        return attempt < self.max_retries
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Tempo de espera antes da próxima tentativa: "full jitter" sobre o
+        backoff exponencial, nunca menor que o Retry-After do servidor.
+        O Retry-After é limitado a max_delay: um valor alto (ex.: um dia)
+        não deixa o worker (ou a vaga no semáforo do motor asyncio) parado;
+        se as tentativas acabarem, a página vai para a fila de falhas.
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        server_delay = self.parse_retry_after(retry_after)
+        if server_delay is not None:
+            return max(backoff, min(server_delay, self.max_delay))
+        return backoff
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Converte o Retry-After (segundos ou data HTTP) em segundos"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max(0.0, (retry_at - now).total_seconds())
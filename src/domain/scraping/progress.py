@@ -0,0 +1,204 @@
+from nest.core import Injectable
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
+import atexit
+import datetime
+import glob
+import json
+import os
+import socket
+import threading
+import time
+from .dtos.scraped_page import ScrapedPage
+from .metrics import ScrapeMetrics
+
+
+@Injectable
+class ScrapeProgress:
+    """
+    Progresso da execução de scraping em andamento neste processo.
+    Os contadores ficam em memória (categorias, páginas, livros, erros) e um
+    resumo é gravado, no máximo a cada SCRAPING_PROGRESS_INTERVAL segundos,
+    em um arquivo por processo em SCRAPING_PROGRESS_DIR. A API lê esses
+    arquivos para o stream de progresso, sem consultar o banco; como o crawl
+    roda no worker, o diretório precisa ser compartilhado entre os dois.
+    """
+
+    # Janela (segundos) usada para calcular a vazão atual
+    RATE_WINDOW = 10.0
+
+    def __init__(self):
+        self.directory = os.environ.get("SCRAPING_PROGRESS_DIR", "scraping_progress")
+        self.interval = float(os.environ.get("SCRAPING_PROGRESS_INTERVAL", 1))
+        # Arquivos sem atualização há mais tempo que isso são de workers mortos
+        self.max_age = float(os.environ.get("SCRAPING_PROGRESS_MAX_AGE", 600))
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.path = os.path.join(
+            self.directory, f"{socket.gethostname()}-{os.getpid()}.json"
+        )
+        self.job_id: Optional[int] = None
+        self.__lock = threading.Lock()
+        self.__published_at = 0.0
+        self.__reset(None, None, ScrapeMetrics())
+        atexit.register(self.__remove)
+
+    def __reset(self, kind: Optional[str], mode: Optional[str], metrics: ScrapeMetrics):
+        self.kind = kind
+        self.mode = mode
+        self.status = "idle"
+        self.metrics = metrics
+        self.categories_total = 0
+        self.categories_done = 0
+        self.ingested = 0
+        self.__samples = deque()
+
+    def begin(self, kind: str, mode: Optional[str], metrics: ScrapeMetrics):
+        """Inicia o acompanhamento de uma execução"""
+        with self.__lock:
+            self.__reset(kind, mode, metrics)
+            self.status = "running"
+        self.publish(force=True)
+
+    def set_categories(self, total: int, done: int = 0):
+        """Categorias da execução e quantas já estavam concluídas (checkpoints)"""
+        with self.__lock:
+            self.categories_total = total
+            self.categories_done = done
+        self.publish(force=True)
+
+    async def track(
+        self, pages: AsyncIterator[ScrapedPage]
+    ) -> AsyncIterator[ScrapedPage]:
+        """Repassa as páginas do crawl, contando as categorias concluídas"""
+        async for page in pages:
+            if page.is_last:
+                with self.__lock:
+                    self.categories_done += 1
+            self.publish()
+            yield page
+
+    def observe_counts(self, counts: Dict):
+        """Soma os livros salvos em um lote"""
+        with self.__lock:
+            self.ingested += (
+                counts["inserted"] + counts["updated"] + counts["unchanged"]
+            )
+        self.publish()
+
+    def finish(self, status: str):
+        with self.__lock:
+            self.status = status
+        self.publish(force=True)
+
+    def snapshot(self) -> Dict:
+        """Resumo atual da execução, com a vazão dos últimos segundos"""
+        with self.__lock:
+            report = self.metrics.report()
+            now = time.monotonic()
+            self.__samples.append((now, report["pages"], report["books"]))
+            while now - self.__samples[0][0] > self.RATE_WINDOW:
+                self.__samples.popleft()
+            started, pages, books = self.__samples[0]
+            elapsed = now - started
+            return {
+                "worker": self.worker,
+                "job_id": self.job_id,
+                "kind": self.kind,
+                "mode": self.mode,
+                "status": self.status,
+                "updated_at": datetime.datetime.utcnow().isoformat(),
+                "duration": report["duration"],
+                "categories_total": self.categories_total,
+                "categories_done": self.categories_done,
+                "pages": report["pages"],
+                "books": report["books"],
+                "ingested": self.ingested,
+                "requests": report["requests"],
+                "errors": report["errors"],
+                "pages_per_second": (
+                    round((report["pages"] - pages) / elapsed, 3) if elapsed else 0.0
+                ),
+                "books_per_second": (
+                    round((report["books"] - books) / elapsed, 3) if elapsed else 0.0
+                ),
+            }
+
+    def publish(self, force: bool = False):
+        """Grava o resumo para a API, respeitando o intervalo mínimo"""
+        now = time.monotonic()
+        if not force and now - self.__published_at < self.interval:
+            return
+        self.__published_at = now
+        snapshot = self.snapshot()
+        os.makedirs(self.directory, exist_ok=True)
+        # Escreve em um arquivo temporário e troca, para o leitor nunca ver
+        # um JSON pela metade
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file)
+        os.replace(temp_path, self.path)
+
+    def __remove(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def read_progress(directory: str, max_age: float) -> Dict:
+    """
+    Lê o progresso publicado pelos workers. Arquivos sem atualização há mais
+    de max_age segundos (worker encerrado sem limpar) são ignorados.
+    Retorna os workers e os totais somados.
+    """
+    workers: List[Dict] = []
+    now = time.time()
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        try:
+            if now - os.path.getmtime(path) > max_age:
+                continue
+            with open(path, encoding="utf-8") as file:
+                workers.append(json.load(file))
+        except (OSError, ValueError):
+            continue
+
+    totals = {
+        key: round(sum(worker[key] for worker in workers), 3)
+        for key in (
+            "categories_total",
+            "categories_done",
+            "pages",
+            "books",
+            "ingested",
+            "requests",
+            "errors",
+            "pages_per_second",
+            "books_per_second",
+        )
+    }
+    totals["running"] = sum(1 for worker in workers if worker["status"] == "running")
+    return {"totals": totals, "workers": workers}
+
+
+async def progress_events(
+    directory: str, interval: float, max_age: float, keepalive: float = 15.0
+) -> AsyncIterator[str]:
+    """
+    Eventos Server-Sent Events com o progresso: um evento a cada mudança e
+    um comentário de keepalive quando nada muda, para manter a conexão
+    """
+    last_data = None
+    last_sent = time.monotonic()
+    while True:
+        # glob e leitura dos arquivos fora do event loop da API
+        progress = await asyncio.to_thread(read_progress, directory, max_age)
+        data = json.dumps(progress)
+        if data != last_data:
+            last_data = data
+            last_sent = time.monotonic()
+            yield f"event: progress\ndata: {data}\n\n"
+        elif time.monotonic() - last_sent >= keepalive:
+            last_sent = time.monotonic()
+            yield ": keepalive\n\n"
+        await asyncio.sleep(interval)
@@ -0,0 +1,154 @@
+from nest.core import Injectable
+from typing import AsyncIterator, Dict, List, Optional
+import datetime
+import os
+from .dtos.scraped_page import ScrapedPage
+from ...infra.logs.logging_service import LoggingService
+from ...infra.models.category_state_model import CategoryStateModel
+from ...infra.repositories.crawl.category_state_repository import (
+    CategoryStateRepository,
+)
+
+
+class CategoryActivity:
+    """
+    Acompanha, por categoria, os livros vistos e alterados em um crawl, para
+    atualizar a taxa de alteração usada pelo agendador
+    """
+
+    def __init__(self):
+        self.books: Dict[str, int] = {}
+        self.changed: Dict[str, int] = {}
+        self.__category_of: Dict[str, str] = {}
+
+    async def track(
+        self, pages: AsyncIterator[ScrapedPage]
+    ) -> AsyncIterator[ScrapedPage]:
+        """Repassa as páginas do crawl, anotando a categoria de cada livro"""
+        async for page in pages:
+            self.books[page.category] = self.books.get(page.category, 0) + len(
+                page.books
+            )
+            for book in page.books:
+                self.__category_of[book.uuid] = page.category
+            yield page
+
+    def observe_changes(self, uuids: List[str]):
+        """Conta os livros inseridos ou atualizados de cada categoria"""
+        for uuid in uuids:
+            category = self.__category_of.get(uuid)
+            if category:
+                self.changed[category] = self.changed.get(category, 0) + 1
+
+
+@Injectable
+class StalenessScheduler:
+    """
+    Escolhe as categorias da atualização agendada (CrawlMode.SCHEDULED).
+    A prioridade de uma categoria é a fração de livros que se espera ter
+    mudado desde o último scraping: horas desde então multiplicadas pela taxa
+    de alteração observada. Um piso de 1 / SCRAPING_SCHEDULE_MAX_AGE garante
+    que categorias estáveis também sejam revisitadas, e categorias nunca
+    percorridas vêm primeiro.
+    As categorias são escolhidas por prioridade até o custo estimado
+    (páginas de listagem + páginas de detalhe de livros novos) atingir
+    SCRAPING_SCHEDULE_BUDGET requisições.
+    """
+
+    # Custo de uma categoria nunca vista, antes de qualquer histórico: uma
+    # listagem com 20 livros novos
+    UNKNOWN_COST = 21
+
+    def __init__(
+        self, state_repository: CategoryStateRepository, logger: LoggingService
+    ):
+        self.state_repository = state_repository
+        self.logger = logger
+        # Segundos entre atualizações agendadas; 0 desativa o agendamento
+        self.interval = float(os.environ.get("SCRAPING_SCHEDULE_INTERVAL", 0))
+        self.budget = max(1, int(os.environ.get("SCRAPING_SCHEDULE_BUDGET", 200)))
+        self.max_age = float(os.environ.get("SCRAPING_SCHEDULE_MAX_AGE", 168))
+        self.alpha = float(os.environ.get("SCRAPING_SCHEDULE_ALPHA", 0.3))
+
+    def priority(
+        self, state: Optional[CategoryStateModel], now: datetime.datetime
+    ) -> float:
+        if not state or not state.last_scraped_at:
+            return float("inf")
+        hours = (now - state.last_scraped_at).total_seconds() / 3600
+        return hours * (state.change_rate + 1 / self.max_age)
+
+    def cost(
+        self,
+        state: Optional[CategoryStateModel],
+        now: datetime.datetime,
+        unknown_cost: int = UNKNOWN_COST,
+    ) -> int:
+        """Requisições estimadas para atualizar a categoria"""
+        if not state or not state.last_scraped_at:
+            return unknown_cost
+        expected_new = min(state.books, round(state.books * self.priority(state, now)))
+        return max(1, state.pages) + expected_new
+
+    def select(
+        self, categories: Dict[str, str], now: datetime.datetime = None
+    ) -> Dict[str, str]:
+        """Categorias a atualizar nesta execução, das mais prioritárias"""
+        now = now or datetime.datetime.utcnow()
+        states = self.state_repository.list_all()
+        ranked = sorted(
+            categories.items(),
+            key=lambda item: self.priority(states.get(item[0]), now),
+            reverse=True,
+        )
+
+        # Categoria nova custa, em média, o primeiro scraping das conhecidas
+        unknown_cost = (
+            round(
+                sum(state.pages + state.books for state in states.values())
+                / len(states)
+            )
+            if states
+            else self.UNKNOWN_COST
+        )
+
+        selected: Dict[str, str] = {}
+        spent = 0
+        for name, url in ranked:
+            cost = self.cost(states.get(name), now, unknown_cost)
+            # A mais prioritária entra mesmo se sozinha estourar o orçamento
+            if selected and spent + cost > self.budget:
+                continue
+            selected[name] = url
+            spent += cost
+
+        self.logger.info(
+            f"Agendador: {len(selected)} de {len(categories)} categorias, "
+            f"~{spent} requisições (orçamento {self.budget})"
+        )
+        return selected
+
+    def record(
+        self,
+        categories: Dict[str, str],
+        pages: Dict[str, int],
+        activity: CategoryActivity,
+    ):
+        """
+        Atualiza o estado das categorias concluídas no crawl (pages traz o
+        total de páginas de cada uma)
+        """
+        now = datetime.datetime.utcnow()
+        for name, total_pages in pages.items():
+            if name not in activity.books:
+                # Concluída em uma execução anterior; nada foi visto agora
+                continue
+            self.state_repository.record(
+                name,
+                categories[name],
+                now,
+                total_pages,
+                activity.books[name],
+                activity.changed.get(name, 0),
+                self.alpha,
+            )
@@ -0,0 +1,107 @@
+from typing import Optional
+import asyncio
+import datetime
+import multiprocessing
+import os
+import socket
+import threading
+from .crawl_coordinator import build_scraping_service
+from .scraping_service import ScrapingService
+from ...infra.logs.logging_service import LoggingService
+
+
+class ScrapeWorker:
+    """
+    Consome a fila de jobs de scraping (scrape_jobs) fora do processo da API.
+    Executa um job por vez e envia heartbeats enquanto ele roda; se o worker
+    morrer no meio de um job, outro worker o devolve à fila quando o
+    heartbeat fica velho, e o crawl retoma a partir dos checkpoints.
+    """
+
+    def __init__(self, service: ScrapingService = None, logger: LoggingService = None):
+        self.logger = logger or LoggingService("scraping_worker")
+        self.service = service or build_scraping_service(self.logger)
+        self.jobs = self.service.job_repository
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = float(os.environ.get("SCRAPING_WORKER_POLL_INTERVAL", 2))
+        self.heartbeat_interval = float(os.environ.get("SCRAPING_JOB_HEARTBEAT", 30))
+        self.stale_after = float(os.environ.get("SCRAPING_JOB_STALE_SECONDS", 300))
+
+    def __heartbeat(self, job_id: int, done: threading.Event):
+        while not done.wait(self.heartbeat_interval):
+            self.jobs.heartbeat(job_id)
+
+    def run_once(self) -> bool:
+        """Executa o próximo job da fila; retorna False se a fila estiver vazia"""
+        stale_before = datetime.datetime.utcnow() - datetime.timedelta(
+            seconds=self.stale_after
+        )
+        requeued = self.jobs.requeue_stale(stale_before)
+        if requeued:
+            self.logger.warning(f"{requeued} jobs sem heartbeat voltaram para a fila")
+
+        job = self.jobs.claim(self.name)
+        if not job:
+            return False
+
+        self.logger.info(f"Executando job {job.id} ({job.kind}, {job.mode})")
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self.__heartbeat, args=(job.id, done), daemon=True
+        )
+        heartbeat.start()
+        try:
+            result = asyncio.run(self.service.run_job(job))
+        except Exception as e:
+            self.logger.error(f"Job {job.id} falhou: {e}")
+            self.jobs.finish(job.id, "failed", error=f"{type(e).__name__}: {e}")
+        else:
+            self.jobs.finish(job.id, "completed", result=result)
+            self.logger.info(f"Job {job.id} concluído: {result}")
+        finally:
+            done.set()
+            heartbeat.join()
+        return True
+
+    def run_forever(self, stop_event: Optional[threading.Event] = None):
+        """Consome a fila até stop_event ser sinalizado"""
+        stop_event = stop_event or threading.Event()
+        self.logger.info(f"Worker de scraping {self.name} aguardando jobs")
+        while not stop_event.is_set():
+            # Enfileira a atualização agendada quando o intervalo vence; com
+            # vários workers, o job pendente é reaproveitado
+            self.service.schedule_refresh()
+            if not self.run_once():
+                stop_event.wait(self.poll_interval)
+
+
+def run_worker(stop_event=None):
+    """Ponto de entrada do processo worker (também usado pelo modo embutido)"""
+    ScrapeWorker().run_forever(stop_event)
+
+
+class EmbeddedWorker:
+    """
+    Sobe o worker em um processo filho da API (SCRAPING_WORKER_MODE=embedded),
+    para implantações com um único container. O crawl continua fora do
+    processo da API; só o ciclo de vida é compartilhado.
+    """
+
+    def __init__(self):
+        context = multiprocessing.get_context("spawn")
+        self.stop_event = context.Event()
+        self.process = context.Process(
+            target=run_worker, args=(self.stop_event,), name="scraping_worker"
+        )
+
+    def start(self):
+        self.process.start()
+
+    def stop(self, timeout: float = 10):
+        """Pede para o worker parar; um job em andamento é interrompido"""
+        self.stop_event.set()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            # O job fica sem heartbeat e volta para a fila no próximo worker
+            self.process.terminate()
+            self.process.join()
@@ -1,9 +1,11 @@
-from nest.core import Controller, Post
+from nest.core import Controller, Get, Post
 from .scraping_service import ScrapingService
 from ...infra.logs.logging_service import LoggingService
-from fastapi import BackgroundTasks
+from typing import Optional
+from ...common.enums import CrawlMode
 from ...domain.auth.auth_guard import require_role
-from fastapi import Depends
+from fastapi import Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
 
 @Controller("/scraping")
@@ -15,14 +17,84 @@ class ScrapingController:
 
     @Post("/trigger")
     def trigger(
-        self, background_tasks: BackgroundTasks, user=Depends(require_role("ROOT"))
+        self,
+        mode: Optional[CrawlMode] = None,
+        user=Depends(require_role("ROOT")),
     ):
         """
         Endpoint para iniciar o processo de scraping.
         Apenas usuários com a role ROOT podem acessar este endpoint.
+        O crawl entra na fila e é executado pelo worker de scraping, fora do
+        processo da API; acompanhe pelo job_id em /scraping/jobs/{job_id}.
+        Exemplo: /scraping/trigger?mode=full
         """
-        background_tasks.add_task(self.service.trigger)
+        job = self.service.enqueue("crawl", mode)
         return {
-            "status": "INITIALIZED",
+            **job,
             "message": "Um e-mail será encaminhado ao final do processamento.",
         }
+
+    @Get("/jobs")
+    def list_jobs(self, limit: int = 20, user=Depends(require_role("ROOT"))):
+        """
+        Lista os jobs mais recentes da fila de scraping.
+        Exemplo: /scraping/jobs?limit=20
+        """
+        return self.service.list_jobs(limit)
+
+    @Get("/jobs/{job_id}")
+    def get_job(self, job_id: int, user=Depends(require_role("ROOT"))):
+        """
+        Retorna o status e o resultado de um job da fila.
+        Exemplo: /scraping/jobs/1
+        """
+        job = self.service.get_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+    @Get("/progress")
+    def get_progress(self, user=Depends(require_role("ROOT"))):
+        """
+        Progresso atual dos workers de scraping: categorias e páginas
+        concluídas, livros salvos, vazão atual e erros.
+        """
+        return self.service.get_progress()
+
+    @Get("/progress/stream")
+    def stream_progress(self, user=Depends(require_role("ROOT"))):
+        """
+        Stream (Server-Sent Events) do progresso dos workers de scraping.
+        Envia um evento "progress" a cada mudança, lido dos contadores
+        publicados pelos workers, sem consultar o banco.
+        """
+        return StreamingResponse(
+            self.service.stream_progress(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @Get("/failures")
+    def list_failures(self, user=Depends(require_role("ROOT"))):
+        """
+        Lista as páginas que falharam nos crawls, com o motivo e a quantidade
+        de tentativas.
+        """
+        return self.service.list_failures()
+
+    @Post("/failures/retry")
+    def retry_failures(self, user=Depends(require_role("ROOT"))):
+        """
+        Reprocessa apenas as páginas que falharam, sem refazer o crawl.
+        Apenas usuários com a role ROOT podem acessar este endpoint.
+        """
+        return self.service.enqueue("retry_failures")
+
+    @Get("/runs")
+    def list_runs(self, limit: int = 20, user=Depends(require_role("ROOT"))):
+        """
+        Lista os relatórios das últimas execuções de scraping: tempo por
+        etapa, histograma de latência, bytes baixados e vazão.
+        Exemplo: /scraping/runs?limit=20
+        """
+        return self.service.list_runs(limit)
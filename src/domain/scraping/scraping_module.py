@@ -2,12 +2,50 @@ from nest.core import Module
 from .scraping_service import ScrapingService
 from .scraping_controller import ScrapingController
 from .book_scraper import BookScraper
+from .async_book_scraper import AsyncBookScraper
+from .parse_pool import ParsePool
+from .politeness import HostRateLimiter, RetryPolicy
+from .progress import ScrapeProgress
+from .scheduler import StalenessScheduler
+from ...infra.cache.http_cache_module import HttpCacheModule
 from ...infra.repositories.book.book_repository_module import BookRepositoryModule
+from ...infra.repositories.crawl.category_state_repository_module import (
+    CategoryStateRepositoryModule,
+)
+from ...infra.repositories.crawl.crawl_checkpoint_repository_module import (
+    CrawlCheckpointRepositoryModule,
+)
+from ...infra.repositories.crawl.failed_page_repository_module import (
+    FailedPageRepositoryModule,
+)
+from ...infra.repositories.crawl.scrape_job_repository_module import (
+    ScrapeJobRepositoryModule,
+)
+from ...infra.repositories.crawl.scrape_run_repository_module import (
+    ScrapeRunRepositoryModule,
+)
 
 
 @Module(
-    imports=[BookRepositoryModule],
-    providers=[BookScraper, ScrapingService],
+    imports=[
+        BookRepositoryModule,
+        CrawlCheckpointRepositoryModule,
+        ScrapeRunRepositoryModule,
+        FailedPageRepositoryModule,
+        ScrapeJobRepositoryModule,
+        CategoryStateRepositoryModule,
+        HttpCacheModule,
+    ],
+    providers=[
+        HostRateLimiter,
+        RetryPolicy,
+        ParsePool,
+        StalenessScheduler,
+        ScrapeProgress,
+        BookScraper,
+        AsyncBookScraper,
+        ScrapingService,
+    ],
     controllers=[ScrapingController],
 )
 class ScrapingModule:
@@ -1,36 +1,530 @@
 from nest.core import Injectable
+import asyncio
+import datetime
+import json
+import os
+from typing import AsyncIterator, Callable, List, Dict, Optional
+from .book_parser import BookParser
 from .book_scraper import BookScraper
-from .dtos.scraped_book import ScrapedBook
+from .async_book_scraper import AsyncBookScraper
+from .dtos.listing_refresh import ListingRefresh
+from .dtos.scraped_page import ScrapedPage
+from .metrics import ScrapeMetrics
+from .progress import ScrapeProgress, progress_events, read_progress
+from .scheduler import CategoryActivity, StalenessScheduler
+from .sharding import select_shard
+from ...common.enums import CrawlMode
+from ...infra.logs.logging_service import LoggingService
+from ...infra.models.scrape_job_model import ScrapeJobModel
+from ...infra.models.scrape_run_model import ScrapeRunModel
 from ...infra.repositories.book.book_repository import BookRepository
+from ...infra.repositories.crawl.crawl_checkpoint_repository import (
+    CrawlCheckpointRepository,
+)
+from ...infra.repositories.crawl.failed_page_repository import FailedPageRepository
+from ...infra.repositories.crawl.scrape_job_repository import ScrapeJobRepository
+from ...infra.repositories.crawl.scrape_run_repository import ScrapeRunRepository
 
 
 @Injectable
 class ScrapingService:
-    def __init__(self, book_scraper: BookScraper, repository: BookRepository):
+    def __init__(
+        self,
+        book_scraper: BookScraper,
+        async_book_scraper: AsyncBookScraper,
+        repository: BookRepository,
+        checkpoint_repository: CrawlCheckpointRepository,
+        run_repository: ScrapeRunRepository,
+        failed_page_repository: FailedPageRepository,
+        job_repository: ScrapeJobRepository,
+        scheduler: StalenessScheduler,
+        progress: ScrapeProgress,
+        logger: LoggingService,
+    ):
         self.book_scraper = book_scraper
+        self.async_book_scraper = async_book_scraper
         self.repository = repository
+        self.checkpoint_repository = checkpoint_repository
+        self.run_repository = run_repository
+        self.failed_page_repository = failed_page_repository
+        self.job_repository = job_repository
+        self.scheduler = scheduler
+        self.progress = progress
+        self.logger = logger
+        self.engine = os.environ.get("SCRAPING_ENGINE", "requests").lower()
+        self.batch_size = max(1, int(os.environ.get("SCRAPING_BATCH_SIZE", 100)))
+        self.mode = CrawlMode(
+            os.environ.get("SCRAPING_CRAWL_MODE", CrawlMode.FIRST_CATEGORY.value)
+        )
+        # new: página de detalhe só para livros novos | always: para todos
+        self.detail_policy = os.environ.get("SCRAPING_DETAIL_POLICY", "new").lower()
+        # Páginas que falharam mais vezes que isso saem do reprocessamento
+        self.max_failure_attempts = int(
+            os.environ.get("SCRAPING_MAX_FAILURE_ATTEMPTS", 5)
+        )
 
-    async def trigger(self):
+    async def __select_categories(
+        self, mode: CrawlMode, metrics: ScrapeMetrics
+    ) -> Dict[str, str]:
+        """Busca as categorias do modo de crawl com o motor configurado"""
+        on_failure = self.__failure_sink(mode.value, {})
+        if self.engine == "asyncio":
+            return await self.async_book_scraper.select_categories(
+                mode, metrics, on_failure
+            )
+        return await asyncio.to_thread(
+            self.book_scraper.select_categories, mode, metrics, on_failure
+        )
+
+    def __failure_sink(self, mode: str, categories: Dict[str, str]) -> Callable:
+        """
+        Cria a função que os motores chamam a cada página com falha,
+        registrando-a na fila de reprocessamento. Listagens guardam a
+        categoria, para que o reprocessamento retome a partir do checkpoint.
+        """
+        # As páginas de uma categoria ficam no mesmo diretório do index.html
+        category_dirs = {
+            url.rsplit("/", 1)[0]: name for name, url in categories.items()
+        }
+
+        def on_failure(url: str, kind: str, reason: str):
+            category = None
+            if kind == BookParser.LISTING_PAGE:
+                category = category_dirs.get(url.rsplit("/", 1)[0])
+            self.failed_page_repository.record(
+                url,
+                kind,
+                mode,
+                reason,
+                category,
+                categories.get(category),
+            )
+
+        return on_failure
+
+    async def __crawl(
+        self,
+        mode: CrawlMode,
+        categories: Dict[str, str],
+        checkpoints: dict,
+        metrics: ScrapeMetrics,
+    ) -> AsyncIterator[ScrapedPage]:
+        """
+        Executa o motor de scraping configurado sem bloquear o event loop.
+        O motor "asyncio" roda no próprio loop; o motor "requests" avança
+        página a página em uma thread.
+        Páginas com falha não interrompem o crawl: vão para a fila de
+        reprocessamento (failed_pages).
+        """
+        known_books = (
+            self.repository.find_by_source_urls if self.detail_policy == "new" else None
+        )
+        on_failure = self.__failure_sink(mode.value, categories)
+        if self.engine == "asyncio":
+            async for page in self.async_book_scraper.crawl(
+                categories, checkpoints, known_books, metrics, on_failure
+            ):
+                yield page
+            return
+
+        pages = self.book_scraper.crawl(
+            categories, checkpoints, known_books, metrics, on_failure
+        )
+        while True:
+            page = await asyncio.to_thread(next, pages, None)
+            if page is None:
+                break
+            yield page
+
+    def __flush(
+        self,
+        mode: CrawlMode,
+        books: List,
+        pages: List[ScrapedPage],
+        metrics: ScrapeMetrics,
+    ):
+        """
+        Salva um lote de livros e só então registra o checkpoint das páginas
+        cujos livros foram todos persistidos.
+        """
+        # Livros conhecidos chegam só com os dados da listagem
+        refreshes = [book for book in books if isinstance(book, ListingRefresh)]
+        records = [book for book in books if not isinstance(book, ListingRefresh)]
+
+        with metrics.timer("db_write"):
+            counts = self.repository.upsert_many(records)
+            self.repository.save_sources(
+                {record.url: record.uuid for record in records if record.url}
+            )
+            refresh_counts = self.repository.refresh_from_listing(refreshes)
+            counts["updated"] += refresh_counts["updated"]
+            counts["unchanged"] += refresh_counts["unchanged"]
+            counts["changed"] += refresh_counts["changed"]
+
+            # Páginas salvas com sucesso saem da fila de reprocessamento
+            self.failed_page_repository.resolve(
+                [book.url for book in books if book.url] + [page.url for page in pages]
+            )
+
+            # Basta registrar a última página concluída de cada categoria
+            last_pages = {page.category: page for page in pages}
+            for page in last_pages.values():
+                self.checkpoint_repository.save_page(
+                    mode.value,
+                    page.category,
+                    page.category_url,
+                    page.next_url,
+                    page.page_num,
+                )
+        return counts
+
+    async def __batches(self, pages: AsyncIterator[ScrapedPage]):
+        """
+        Agrupa os livros das páginas em lotes de tamanho fixo.
+        Cada lote acompanha as páginas que terminam dentro dele, para que o
+        checkpoint nunca avance além do que já foi salvo.
+        """
+        buffer: List[Dict] = []
+        # Páginas pendentes e a posição no buffer onde seus livros terminam
+        pending: List[tuple] = []
+
+        async for page in pages:
+            buffer.extend(page.books)
+            pending.append((page, len(buffer)))
+
+            while len(buffer) >= self.batch_size:
+                batch = buffer[: self.batch_size]
+                del buffer[: self.batch_size]
+                done = [
+                    done_page for done_page, end in pending if end <= self.batch_size
+                ]
+                pending = [
+                    (pending_page, end - self.batch_size)
+                    for pending_page, end in pending
+                    if end > self.batch_size
+                ]
+                yield batch, done
+
+        if buffer or pending:
+            yield buffer, [pending_page for pending_page, _ in pending]
+
+    async def __ingest(
+        self,
+        mode: CrawlMode,
+        metrics: ScrapeMetrics,
+        shard: int = 0,
+        shards: int = 1,
+        categories: Optional[Dict[str, str]] = None,
+        resumed: bool = False,
+    ) -> tuple:
+        """
+        Executa o crawl e salva os livros em lotes.
+        Sem categories, busca as categorias do modo de crawl (no modo
+        agendado, o agendador escolhe entre elas). Com resumed, categories são
+        só as que falharam no crawl anterior e são percorridas todas.
+        Retorna as contagens e se todas as categorias foram concluídas.
+        """
+        schedule = not resumed and mode == CrawlMode.SCHEDULED
+        if categories is None:
+            categories = await self.__select_categories(mode, metrics)
+            if categories:
+                # A página inicial respondeu: sai da fila, se estava nela
+                await asyncio.to_thread(
+                    self.failed_page_repository.resolve,
+                    [self.book_scraper.base_url],
+                )
+        if shards > 1:
+            categories = select_shard(categories, shard, shards)
+            self.logger.info(
+                f"Shard {shard + 1}/{shards}: {len(categories)} categorias"
+            )
+        if schedule:
+            categories = await asyncio.to_thread(self.scheduler.select, categories)
+        checkpoints = await asyncio.to_thread(
+            self.checkpoint_repository.list_by_mode, mode.value
+        )
+
+        self.progress.set_categories(
+            len(categories),
+            sum(
+                1
+                for name in categories
+                if name in checkpoints and checkpoints[name].completed
+            ),
+        )
+
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        activity = CategoryActivity()
+        pages = self.progress.track(
+            activity.track(self.__crawl(mode, categories, checkpoints, metrics))
+        )
+        async for books, done_pages in self.__batches(pages):
+            batch_counts = await asyncio.to_thread(
+                self.__flush, mode, books, done_pages, metrics
+            )
+            for key in counts:
+                counts[key] += batch_counts[key]
+            activity.observe_changes(batch_counts["changed"])
+            self.progress.observe_counts(batch_counts)
+            self.logger.info(f"Lote de {len(books)} livros salvo")
+
+        checkpoints = await asyncio.to_thread(
+            self.checkpoint_repository.list_by_mode, mode.value
+        )
+        finished = {
+            name: checkpoints[name].pages_done
+            for name in categories
+            if name in checkpoints and checkpoints[name].completed
+        }
+        await asyncio.to_thread(self.scheduler.record, categories, finished, activity)
+        completed = bool(categories) and len(finished) == len(categories)
+        released = list(finished)
+        if resumed and completed and mode != CrawlMode.SCHEDULED:
+            # As demais categorias do crawl já tinham terminado: ele só está
+            # concluído se nenhuma ficou no meio, e então todos os checkpoints
+            # do modo são liberados, não só os das categorias reprocessadas
+            completed = all(checkpoint.completed for checkpoint in checkpoints.values())
+            released = None
+        if completed or (mode == CrawlMode.SCHEDULED and finished):
+            # Crawl concluído: o próximo trigger começa do zero. No modo
+            # agendado cada execução escolhe outras categorias, então as
+            # concluídas são liberadas mesmo que outras tenham parado no meio
+            await asyncio.to_thread(
+                self.checkpoint_repository.clear, mode.value, released
+            )
+        return counts, completed
+
+    def __save_run(
+        self, mode: str, status: str, counts: dict, metrics: ScrapeMetrics
+    ) -> ScrapeRunModel:
+        """Persiste o relatório da execução"""
+        report = metrics.report()
+        return self.run_repository.create(
+            ScrapeRunModel(
+                mode=mode,
+                engine=self.engine,
+                status=status,
+                started_at=datetime.datetime.utcfromtimestamp(metrics.started_at),
+                finished_at=datetime.datetime.utcnow(),
+                duration=report["duration"],
+                pages=report["pages"],
+                books=report["books"],
+                requests=report["requests"],
+                bytes=report["bytes"],
+                errors=report["errors"],
+                inserted=counts["inserted"],
+                updated=counts["updated"],
+                unchanged=counts["unchanged"],
+                pages_per_second=report["pages_per_second"],
+                books_per_second=report["books_per_second"],
+                report=json.dumps(report),
+            )
+        )
+
+    async def trigger(
+        self,
+        mode: CrawlMode = None,
+        shard: int = 0,
+        shards: int = 1,
+        categories: Optional[Dict[str, str]] = None,
+    ) -> dict:
         """
         Executa o scraping dos livros e salva no banco de dados.
+        Os livros são salvos em lotes de SCRAPING_BATCH_SIZE enquanto o crawl
+        acontece, e o checkpoint de cada página só avança depois que seus
+        livros foram salvos; um crawl interrompido é retomado de onde parou.
+        Apenas livros novos ou alterados são escritos; retorna as contagens
+        de livros inseridos, atualizados e inalterados.
+        Ao final, o relatório da execução (tempos por etapa e vazão) é salvo
+        em scrape_runs.
+        Com shards > 1, percorre apenas as categorias do shard informado; os
+        demais shards podem rodar em outros processos ou máquinas que
+        compartilhem o banco. categories evita buscar de novo a página inicial
+        quando as categorias do modo já foram obtidas (pelo coordenador).
+        """
+        mode = mode or self.mode
+        metrics = ScrapeMetrics()
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        status = "failed"
+        self.progress.begin("crawl", mode.value, metrics)
+        try:
+            counts, completed = await self.__ingest(
+                mode, metrics, shard, shards, categories
+            )
+            status = "completed" if completed else "incomplete"
+        finally:
+            metrics.finish()
+            self.progress.finish(status)
+            run = await asyncio.to_thread(
+                self.__save_run, mode.value, status, counts, metrics
+            )
+
+        if status == "incomplete":
+            self.logger.warning(
+                "Crawl incompleto; o próximo trigger retoma a partir dos checkpoints"
+            )
+        self.logger.info(
+            f"Ingestão finalizada - inseridos: {counts['inserted']}, "
+            f"atualizados: {counts['updated']}, inalterados: {counts['unchanged']}"
+        )
+        self.logger.info(
+            f"Execução {run.id}: {run.pages} páginas e {run.books} livros em "
+            f"{run.duration:.1f}s ({run.books_per_second:.1f} livros/s)"
+        )
+        return counts
+
+    async def __scrape_books(
+        self, detail_urls: List[str], metrics: ScrapeMetrics, on_failure: Callable
+    ) -> List[Dict]:
+        """Busca páginas de detalhe avulsas com o motor configurado"""
+        if self.engine == "asyncio":
+            return await self.async_book_scraper.scrape_books(
+                detail_urls, metrics, on_failure
+            )
+        return await asyncio.to_thread(
+            self.book_scraper.scrape_books, detail_urls, metrics, on_failure
+        )
+
+    async def retry_failures(self) -> dict:
+        """
+        Reprocessa apenas as páginas da fila de falhas que ainda não atingiram
+        SCRAPING_MAX_FAILURE_ATTEMPTS tentativas, sem refazer o crawl.
+        Páginas de detalhe são buscadas de novo e salvas; listagens e a página
+        inicial retomam o crawl das categorias a partir dos checkpoints.
+        O que voltar a falhar continua na fila, com mais uma tentativa.
+        """
+        failed_pages = await asyncio.to_thread(
+            self.failed_page_repository.list_retryable, self.max_failure_attempts
+        )
+        metrics = ScrapeMetrics()
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        status = "failed"
+        self.progress.begin("retry_failures", None, metrics)
+        try:
+            details: Dict[str, List[str]] = {}
+            listings: Dict[str, Optional[Dict[str, str]]] = {}
+            for failed_page in failed_pages:
+                if failed_page.kind == BookParser.DETAIL_PAGE:
+                    details.setdefault(failed_page.mode, []).append(failed_page.url)
+                elif failed_page.kind == BookParser.LISTING_PAGE and (
+                    failed_page.category
+                ):
+                    if listings.get(failed_page.mode, {}) is not None:
+                        listings.setdefault(failed_page.mode, {})[
+                            failed_page.category
+                        ] = failed_page.category_url
+                else:
+                    # Sem a categoria, refaz o modo inteiro a partir dos checkpoints
+                    listings[failed_page.mode] = None
+
+            completed = True
+            for mode_value, detail_urls in details.items():
+                self.logger.info(f"Reprocessando {len(detail_urls)} livros")
+                books = await self.__scrape_books(
+                    detail_urls, metrics, self.__failure_sink(mode_value, {})
+                )
+                metrics.increment("books", len(books))
+                batch_counts = await asyncio.to_thread(
+                    self.__flush, CrawlMode(mode_value), books, [], metrics
+                )
+                for key in counts:
+                    counts[key] += batch_counts[key]
+                self.progress.observe_counts(batch_counts)
+
+            for mode_value, categories in listings.items():
+                self.logger.info(
+                    f"Retomando {len(categories) if categories else 'todas as'} "
+                    f"categorias do modo {mode_value}"
+                )
+                mode_counts, mode_completed = await self.__ingest(
+                    CrawlMode(mode_value), metrics, categories=categories, resumed=True
+                )
+                completed = completed and mode_completed
+                for key in counts:
+                    counts[key] += mode_counts[key]
+
+            remaining = await asyncio.to_thread(
+                self.failed_page_repository.list_retryable, self.max_failure_attempts
+            )
+            status = "completed" if completed and not remaining else "incomplete"
+        finally:
+            metrics.finish()
+            self.progress.finish(status)
+            await asyncio.to_thread(
+                self.__save_run, "retry_failures", status, counts, metrics
+            )
+
+        self.logger.info(
+            f"Reprocessamento finalizado - {len(failed_pages)} páginas, "
+            f"{len(remaining)} ainda com falha"
+        )
+        return {**counts, "retried": len(failed_pages), "remaining": len(remaining)}
+
+    def list_failures(self) -> List[Dict]:
+        """Fila de páginas com falha e o motivo de cada uma"""
+        return [
+            failed_page.to_dict()
+            for failed_page in self.failed_page_repository.list_all()
+        ]
+
+    def enqueue(self, kind: str, mode: CrawlMode = None) -> Dict:
+        """
+        Coloca um job na fila do worker de scraping. Um job pendente igual é
+        reaproveitado, então triggers repetidos não geram crawls sobrepostos.
+        """
+        if kind == "crawl":
+            mode = mode or self.mode
+        job, created = self.job_repository.enqueue(kind, mode.value if mode else None)
+        if not created:
+            self.logger.info(f"Job {job.id} já estava na fila; reaproveitado")
+        return {"job_id": job.id, "status": job.status, "coalesced": not created}
+
+    def schedule_refresh(self) -> Optional[Dict]:
+        """
+        Enfileira a atualização agendada (modo SCHEDULED) quando já se passou
+        SCRAPING_SCHEDULE_INTERVAL desde a última; chamado pelo worker
         """
-        book_list = self.book_scraper.execute()
-        book_model_list = []
-        for book_data in book_list:
-            scraped_book = ScrapedBook(
-                uuid=book_data.get("id"),
-                title=book_data.get("title"),
-                category=book_data.get("category"),
-                rating=book_data.get("rating"),
-                price_excl_tax=book_data.get("price_excl_tax"),
-                price_incl_tax=book_data.get("price_incl_tax"),
-                tax=book_data.get("tax"),
-                availability=book_data.get("availability"),
-                reviews_qtd=book_data.get("reviews_qtd", 0),
-                description=book_data.get("description"),
-                image=book_data.get("image"),
-            )
-            book_model = scraped_book.to_book_model()
-            book_model_list.append(book_model)
-
-        self.repository.create_many(book_model_list)
+        if not self.scheduler.interval:
+            return None
+        last_job = self.job_repository.last_created("crawl", CrawlMode.SCHEDULED.value)
+        if (
+            last_job
+            and (datetime.datetime.utcnow() - last_job.created_at).total_seconds()
+            < self.scheduler.interval
+        ):
+            return None
+        return self.enqueue("crawl", CrawlMode.SCHEDULED)
+
+    async def run_job(self, job: ScrapeJobModel) -> dict:
+        """Executa um job da fila e retorna as contagens"""
+        self.progress.job_id = job.id
+        try:
+            if job.kind == "crawl":
+                return await self.trigger(CrawlMode(job.mode))
+            if job.kind == "retry_failures":
+                return await self.retry_failures()
+            raise ValueError(f"Tipo de job desconhecido: {job.kind}")
+        finally:
+            self.progress.job_id = None
+
+    def get_progress(self) -> Dict:
+        """Progresso publicado pelos workers de scraping em execução"""
+        return read_progress(self.progress.directory, self.progress.max_age)
+
+    def stream_progress(self) -> AsyncIterator[str]:
+        """Eventos SSE com o progresso dos workers, a cada mudança"""
+        return progress_events(
+            self.progress.directory, self.progress.interval, self.progress.max_age
+        )
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        job = self.job_repository.get(job_id)
+        return job.to_dict() if job else None
+
+    def list_jobs(self, limit: int = 20) -> List[Dict]:
+        """Jobs mais recentes da fila de scraping"""
+        return [job.to_dict() for job in self.job_repository.list_recent(limit)]
+
+    def list_runs(self, limit: int = 20) -> List[Dict]:
+        """Relatórios das execuções mais recentes"""
+        return [run.to_dict() for run in self.run_repository.list_recent(limit)]
@@ -0,0 +1,25 @@
+from typing import Dict, List
+import zlib
+
+
+def shard_of(category_name: str, shards: int) -> int:
+    """
+    Shard de uma categoria. Usa crc32 (estável entre processos e máquinas,
+    ao contrário do hash() do Python), então workers independentes chegam
+    à mesma divisão sem precisar se coordenar.
+    """
+    return zlib.crc32(category_name.encode("utf-8")) % shards
+
+
+def select_shard(categories: Dict[str, str], shard: int, shards: int) -> Dict[str, str]:
+    """Filtra as categorias que pertencem ao shard informado"""
+    if not 0 <= shard < shards:
+        raise ValueError(f"Shard {shard} fora do intervalo 0..{shards - 1}")
+    return {
+        name: url for name, url in categories.items() if shard_of(name, shards) == shard
+    }
+
+
+def partition(categories: Dict[str, str], shards: int) -> List[Dict[str, str]]:
+    """Divide o mapa de categorias em shards"""
+    return [select_shard(categories, shard, shards) for shard in range(shards)]
@@ -12,16 +12,16 @@ class StatsController:
         self.service = service
 
     @Get("/overview")
-    def get_overview(self, user=Depends(get_current_user)):
+    async def get_overview(self, user=Depends(get_current_user)):
         """
         Retorna uma visão geral das estatísticas dos livros.
         """
-        return self.service.get_overview()
+        return await self.service.get_overview()
 
     @Get("/categories")
-    def get_categories_stats(self, user=Depends(get_current_user)):
+    async def get_categories_stats(self, user=Depends(get_current_user)):
         """
         Retorna as estatísticas por categoria .
         """
-        return self.service.get_categories_stats()
+        return await self.service.get_categories_stats()
       
\ No newline at end of file
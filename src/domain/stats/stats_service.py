@@ -1,24 +1,23 @@
-from collections import defaultdict
 from nest.core import Injectable
-from ...infra.repositories.book.book_repository import BookRepository
+from ...infra.repositories.book.async_book_repository import AsyncBookRepository
 from .dto.stats_dto import OverviewStatsResponse, CategoryStats
 from typing import Dict
 
 
 @Injectable
 class StatsService:
-    def __init__(self, repository: BookRepository):
+    def __init__(self, repository: AsyncBookRepository):
         self.repository = repository
 
-    def get_overview(self) -> OverviewStatsResponse:
+    async def get_overview(self) -> OverviewStatsResponse:
         """Calcula as estatisticas gerais.
         (total de livros, preço médio, distribuição de ratings)
 
         Returns:
         OverviewStatsResponse: DTO com as estatísticas gerais.
         """
-        books = self.repository.list_all()
-        total_books = len(books)
+        totals = await self.repository.count_by_rating()
+        total_books = totals["total"]
 
         if total_books == 0:
             return OverviewStatsResponse(
@@ -27,15 +26,13 @@ class StatsService:
                 rating_distribution={},
             )
 
-        total_price = sum(
-            float(book.price_incl_tax) for book in books if book.price_incl_tax
-        )
-        average_price = total_price / total_books if total_books > 0 else 0
+        average_price = totals["total_price"] / total_books
 
-        rating_distribution = defaultdict(int)
-        for book in books:
-            if hasattr(book, "rating") and book.rating and 0 < book.rating <= 5:
-                rating_distribution[book.rating] += 1
+        rating_distribution = {
+            rating: count
+            for rating, count in totals["ratings"].items()
+            if rating and 0 < rating <= 5
+        }
 
         return OverviewStatsResponse(
             total_books=total_books,
@@ -43,7 +40,7 @@ class StatsService:
             rating_distribution=dict(sorted(rating_distribution.items())),
         )
 
-    def get_categories_stats(self) -> Dict[str, CategoryStats]:
+    async def get_categories_stats(self) -> Dict[str, CategoryStats]:
         """
         Calcula as estatisticas por categoria.
         (numero de livros, preço por categoria).
@@ -51,20 +48,11 @@ class StatsService:
         Returns:
         Dict[str, CategoryStats]: Dicionário com estatísticas por categoria.
         """
-        books = self.repository.list_all()
-
-        category_stats = defaultdict(lambda: {"book_count": 0, "total_price": 0.0})
-
-        for book in books:
-            category = book.category
-            category_stats[category]["book_count"] += 1
-            if book.price_incl_tax:
-                category_stats[category]["total_price"] += float(book.price_incl_tax)
+        category_stats = await self.repository.price_by_category()
 
         category_stats_results: Dict[str, CategoryStats] = {}
-        for category, data in category_stats.items():
-            book_count = data["book_count"]
-            average_price = data["total_price"] / book_count if book_count > 0 else 0
+        for category, (book_count, total_price) in category_stats.items():
+            average_price = total_price / book_count if book_count > 0 else 0
             category_stats_results[category] = CategoryStats(
                 book_count=book_count,
                 average_price=round(average_price, 2),
@@ -0,0 +1,197 @@
+from nest.core import Injectable
+from typing import Dict, Optional
+import os
+import sqlite3
+import threading
+import time
+
+
+class CacheEntry:
+    """Resposta armazenada no cache, com os validadores enviados pelo servidor"""
+
+    def __init__(
+        self,
+        url: str,
+        body: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        stored_at: float,
+        fresh: bool,
+    ):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.fresh = fresh
+
+    def validators(self) -> Dict[str, str]:
+        """Cabeçalhos para a requisição condicional"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@Injectable
+class HttpCache:
+    """
+    Cache persistente de respostas HTTP usado pelos motores de scraping.
+    As entradas são indexadas pela URL e guardam ETag/Last-Modified, permitindo
+    requisições condicionais; um 304 reaproveita o corpo já armazenado.
+    O tamanho total é limitado e as entradas menos acessadas são removidas (LRU).
+    O arquivo pode ser compartilhado pelos processos do crawl.py: o total
+    é relido da tabela antes de remover entradas e a cada 1/16 do limite
+    escrito pelo processo, para considerar o que os outros gravaram.
+    Os métodos são bloqueantes (sqlite3); no motor asyncio, rode-os fora do
+    event loop (asyncio.to_thread).
+    Com SCRAPING_CACHE_TTL > 0 a entrada é usada sem nenhuma requisição
+    enquanto não expirar.
+    """
+
+    def __init__(self):
+        self.enabled = (
+            os.environ.get("SCRAPING_CACHE_ENABLED", "True").lower() == "true"
+        )
+        self.path = os.environ.get("SCRAPING_CACHE_PATH", "scraping_cache.db")
+        self.max_bytes = int(os.environ.get("SCRAPING_CACHE_MAX_MB", 256)) * 1024 * 1024
+        self.ttl = float(os.environ.get("SCRAPING_CACHE_TTL", 0))
+        self.__lock = threading.Lock()
+        self.__connection = None
+        self.__total_bytes = 0
+        # Bytes gravados por este processo desde a última leitura do total
+        self.__unsynced_bytes = 0
+
+    def __connect(self) -> sqlite3.Connection:
+        """Abre a conexão na primeira utilização e cria a tabela se necessário"""
+        if self.__connection is None:
+            connection = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    url TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_http_cache_accessed_at "
+                "ON http_cache (accessed_at)"
+            )
+            # Índice de cobertura: o total é somado sem ler os corpos
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_http_cache_size ON http_cache (size)"
+            )
+            self.__connection = connection
+            self.__sync_total()
+        return self.__connection
+
+    def __sync_total(self) -> None:
+        """Relê o tamanho total do cache, incluindo o gravado por outros processos"""
+        row = self.__connection.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache")
+        self.__total_bytes = row.fetchone()[0]
+        self.__unsynced_bytes = 0
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Retorna a entrada da URL (marcando o acesso) ou None"""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self.__lock:
+            connection = self.__connect()
+            row = connection.execute(
+                "SELECT body, etag, last_modified, stored_at FROM http_cache "
+                "WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE http_cache SET accessed_at = ? WHERE url = ?", (now, url)
+            )
+
+        body, etag, last_modified, stored_at = row
+        fresh = self.ttl > 0 and now - stored_at < self.ttl
+        return CacheEntry(url, body, etag, last_modified, stored_at, fresh)
+
+    def revalidate(self, entry: CacheEntry) -> str:
+        """Registra um 304 do servidor, renovando a entrada, e devolve o corpo"""
+        if self.enabled:
+            with self.__lock:
+                self.__connect().execute(
+                    "UPDATE http_cache SET stored_at = ? WHERE url = ?",
+                    (time.time(), entry.url),
+                )
+        return entry.body
+
+    def store(self, url: str, body: str, headers) -> None:
+        """Armazena a resposta, se ela tiver validadores ou houver TTL configurado"""
+        if not self.enabled:
+            return
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified or self.ttl > 0):
+            # Sem validadores e sem TTL a entrada nunca seria reaproveitada
+            return
+
+        size = len(body.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self.__lock:
+            connection = self.__connect()
+            previous = connection.execute(
+                "SELECT size FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO http_cache "
+                "(url, body, etag, last_modified, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, size, now, now),
+            )
+            self.__total_bytes += size - (previous[0] if previous else 0)
+            self.__unsynced_bytes += size
+            if self.__unsynced_bytes >= self.max_bytes // 16:
+                self.__sync_total()
+            if self.__total_bytes > self.max_bytes:
+                self.__evict(connection)
+
+    def __evict(self, connection: sqlite3.Connection) -> None:
+        """Remove as entradas menos acessadas até respeitar o limite de tamanho"""
+        # A estimativa local não vê as escritas dos outros processos
+        self.__sync_total()
+        while self.__total_bytes > self.max_bytes:
+            rows = connection.execute(
+                "SELECT url, size FROM http_cache ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self.__total_bytes = 0
+                return
+            for url, size in rows:
+                if self.__total_bytes <= self.max_bytes:
+                    return
+                deleted = connection.execute(
+                    "DELETE FROM http_cache WHERE url = ?", (url,)
+                ).rowcount
+                # Outro processo pode ter removido a entrada antes
+                self.__total_bytes -= size * deleted
+
+    def close(self) -> None:
+        """Fecha a conexão com o arquivo de cache"""
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
@@ -0,0 +1,7 @@
+from nest.core import Module
+from .http_cache import HttpCache
+
+
+@Module(providers=[HttpCache], exports=[HttpCache])
+class HttpCacheModule:
+    pass
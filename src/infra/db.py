@@ -1,13 +1,157 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, scoped_session
+from functools import lru_cache
 import os
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///libraflux.db")
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
-)  # necessário p/ SQLite
+# Pool de conexões (QueuePool): conexões mantidas, extras sob pico, segundos
+# de espera por uma conexão livre e idade máxima de uma conexão (-1 = sem limite)
+POOL_SIZE = int(os.environ.get("DATABASE_POOL_SIZE", 5))
+MAX_OVERFLOW = int(os.environ.get("DATABASE_MAX_OVERFLOW", 10))
+POOL_TIMEOUT = float(os.environ.get("DATABASE_POOL_TIMEOUT", 30))
+POOL_RECYCLE = int(os.environ.get("DATABASE_POOL_RECYCLE", -1))
+
+# PRAGMAs aplicados a cada conexão SQLite. Em WAL os leitores não esperam a
+# transação de escrita do crawl; synchronous=NORMAL é seguro em WAL (só perde
+# os últimos commits em queda de energia). cache_size negativo é em KiB
+SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", -65536)),
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 268435456)),
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000)),
+}
+
+
+# Driver assíncrono de cada banco, para as leituras da API
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_database_url(url: str = DATABASE_URL) -> str:
+    """URL do engine assíncrono: DATABASE_ASYNC_URL ou DATABASE_URL com o driver async"""
+    if os.environ.get("DATABASE_ASYNC_URL"):
+        return os.environ["DATABASE_ASYNC_URL"]
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    return parsed.set(drivername=driver).render_as_string(False) if driver else url
+
+
+def is_in_memory(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def pool_args(url: str) -> dict:
+    """Tamanho do pool; SQLite em memória usa uma única conexão"""
+    if is_in_memory(url):
+        return {}
+    return {
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+    }
+
+
+def set_sqlite_pragmas(sync_engine: Engine, in_memory: bool):
+    """Aplica SQLITE_PRAGMAS a cada nova conexão do engine"""
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma, value in SQLITE_PRAGMAS.items():
+            # Banco em memória não usa WAL nem mmap
+            if in_memory and pragma in ("journal_mode", "mmap_size"):
+                continue
+            cursor.execute(f"PRAGMA {pragma}={value}")
+        cursor.close()
+
+
+def create_database_engine(url: str = DATABASE_URL) -> Engine:
+    """
+    Cria o engine com o pool configurado e, no SQLite, os PRAGMAs de
+    SQLITE_PRAGMAS em cada nova conexão
+    """
+    if make_url(url).get_backend_name() != "sqlite":
+        return create_engine(url, pool_pre_ping=True, **pool_args(url))
+
+    sqlite_engine = create_engine(
+        url,
+        # necessário p/ SQLite
+        connect_args={
+            "check_same_thread": False,
+            "timeout": SQLITE_PRAGMAS["busy_timeout"] / 1000,
+        },
+        **pool_args(url),
+    )
+    set_sqlite_pragmas(sqlite_engine, is_in_memory(url))
+    return sqlite_engine
+
+
+def create_async_database_engine(url: str = DATABASE_URL) -> AsyncEngine:
+    """
+    Engine assíncrono (aiosqlite/asyncpg) das leituras da API, com o mesmo
+    pool e PRAGMAs do engine síncrono. A escrita do scraping continua no
+    engine síncrono, no worker.
+    """
+    async_url = async_database_url(url)
+    if make_url(async_url).get_backend_name() != "sqlite":
+        try:
+            return create_async_engine(async_url, pool_pre_ping=True, **pool_args(url))
+        except ImportError as e:
+            raise RuntimeError(
+                f"Driver assíncrono {make_url(async_url).drivername} não "
+                f"instalado ({e.name}); instale-o ou informe em "
+                "DATABASE_ASYNC_URL uma URL com um driver async disponível"
+            ) from e
+
+    sqlite_engine = create_async_engine(
+        async_url,
+        connect_args={"timeout": SQLITE_PRAGMAS["busy_timeout"] / 1000},
+        **pool_args(url),
+    )
+    set_sqlite_pragmas(sqlite_engine.sync_engine, is_in_memory(url))
+    return sqlite_engine
+
+
+engine = create_database_engine()
 SessionLocal = scoped_session(
     sessionmaker(bind=engine, autoflush=False, autocommit=False)
 )
+
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    """
+    Engine assíncrono das leituras da API, criado no primeiro uso: o worker,
+    o crawl.py e o scraping só usam o engine síncrono e não dependem do
+    driver assíncrono
+    """
+    return create_async_database_engine()
+
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker() -> async_sessionmaker:
+    # Objetos continuam legíveis depois que a sessão fecha (sem lazy load em async)
+    return async_sessionmaker(
+        bind=get_async_engine(), autoflush=False, expire_on_commit=False
+    )
+
+
+async def dispose_async_engine():
+    """
+    Fecha as conexões do engine assíncrono no desligamento da API, sem
+    criá-lo (e exigir o driver assíncrono) se nunca foi usado
+    """
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+
+
 Base = declarative_base()
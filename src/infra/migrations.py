@@ -0,0 +1,147 @@
+"""
+Migrações de schema.
+
+Base.metadata.create_all só cria tabelas que ainda não existem; índices e
+alterações em tabelas de bancos já criados (ex.: um libraflux.db antigo)
+vêm das migrações abaixo. Cada migração roda uma única vez por banco, em
+ordem de versão, e fica registrada em schema_migrations. Como em um banco
+novo o create_all já cria tudo, as migrações devem ser idempotentes
+(IF NOT EXISTS).
+
+Para alterar o schema, acrescente uma função ao fim de MIGRATIONS com a
+próxima versão; nunca altere uma migração já publicada.
+"""
+
+from typing import Callable, List, Tuple
+import datetime
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
+from .db import Base, engine
+from .logs.logging_service import LoggingService
+from .models import *  # noqa: F401,F403 (registra as tabelas no Base)
+from .models.book_model import BookModel
+from .models.schema_migration_model import SchemaMigrationModel
+from .models.scrape_job_model import ScrapeJobModel
+
+
+def create_book_indexes(connection: Connection):
+    """Índices das consultas do BookRepository e das categorias"""
+    for index in BookModel.__table__.indexes:
+        connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+# Busca textual: tabela FTS5 de conteúdo externo (prefix: índices para
+# prefixos de 2 e 3 letras) e triggers de sincronia
+BOOKS_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, description,
+        content='books', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_update
+    AFTER UPDATE OF title, description ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO books_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+)
+
+
+def create_books_fts(connection: Connection):
+    """
+    Índice de busca textual (SQLite FTS5) sobre título e descrição. A tabela
+    books_fts guarda só o índice (content=books) e os triggers a mantêm em
+    sincronia com qualquer escrita em books, inclusive as em lote do scraping.
+    Em outros bancos a busca usa LIKE e nada é criado.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in BOOKS_FTS_DDL:
+        connection.exec_driver_sql(statement)
+    # Indexa os livros que já estavam no banco
+    connection.exec_driver_sql("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+
+
+def create_pending_job_index(connection: Connection):
+    """
+    Índice único dos jobs pendentes por tipo e modo. Pendentes repetidos,
+    enfileirados antes do índice, são encerrados como falha; o mais antigo
+    segue na fila e os representa.
+    """
+    oldest = (
+        select(func.min(ScrapeJobModel.id))
+        .where(ScrapeJobModel.status == "pending")
+        .group_by(ScrapeJobModel.kind, func.coalesce(ScrapeJobModel.mode, ""))
+    )
+    connection.execute(
+        update(ScrapeJobModel)
+        .where(ScrapeJobModel.status == "pending", ScrapeJobModel.id.not_in(oldest))
+        .values(
+            status="failed",
+            finished_at=datetime.datetime.utcnow(),
+            error="Job duplicado na fila; executado pelo pendente mais antigo",
+        )
+    )
+    for index in ScrapeJobModel.__table__.indexes:
+        connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+# (versão, nome, função que recebe a conexão da transação)
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "book_query_indexes", create_book_indexes),
+    (2, "books_full_text_search", create_books_fts),
+    (3, "scrape_jobs_unique_pending", create_pending_job_index),
+]
+
+
+def run_migrations(bind: Engine = engine) -> List[str]:
+    """
+    Cria as tabelas que faltam e aplica as migrações pendentes, cada uma em
+    sua transação. Retorna os nomes das migrações aplicadas agora.
+    """
+    logger = LoggingService("migrations")
+    Base.metadata.create_all(bind=bind)
+
+    with bind.connect() as connection:
+        applied = set(connection.scalars(select(SchemaMigrationModel.version)))
+
+    migrated = []
+    for version, name, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        try:
+            with bind.begin() as connection:
+                migrate(connection)
+                connection.execute(
+                    insert(SchemaMigrationModel).values(
+                        version=version,
+                        name=name,
+                        applied_at=datetime.datetime.utcnow(),
+                    )
+                )
+        except IntegrityError:
+            # Outro processo (API ou worker) aplicou a mesma migração antes
+            continue
+        logger.info(f"Migração {version} ({name}) aplicada")
+        migrated.append(name)
+    return migrated
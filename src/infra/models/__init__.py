@@ -1,2 +1,9 @@
 from .book_model import BookModel
 from .user_model import UserModel
+from .crawl_checkpoint_model import CrawlCheckpointModel
+from .book_source_model import BookSourceModel
+from .scrape_run_model import ScrapeRunModel
+from .failed_page_model import FailedPageModel
+from .scrape_job_model import ScrapeJobModel
+from .category_state_model import CategoryStateModel
+from .schema_migration_model import SchemaMigrationModel
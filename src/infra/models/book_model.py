@@ -1,10 +1,36 @@
-from sqlalchemy import Column, String, Integer, Float, Text
+from sqlalchemy import Column, Index, String, Integer, Float, Text
 from ..db import Base
+import hashlib
 
 
 class BookModel(Base):
     __tablename__ = "books"
 
+    # Campos que compõem a impressão digital do conteúdo de um livro
+    FINGERPRINT_FIELDS = (
+        "title",
+        "category",
+        "rating",
+        "price_excl_tax",
+        "price_incl_tax",
+        "tax",
+        "availability",
+        "reviews_qtd",
+        "description",
+        "image",
+    )
+
+    # Um índice por forma de consulta do BookRepository e das categorias.
+    # (category, title) também atende a busca só por categoria e o DISTINCT
+    # de categorias (índice de cobertura), por isso não há um só de category.
+    # Bancos existentes recebem os índices pelas migrações (infra/migrations.py)
+    __table_args__ = (
+        Index("ix_books_category_title", "category", "title"),
+        Index("ix_books_title", "title"),
+        Index("ix_books_price_incl_tax", "price_incl_tax"),
+        Index("ix_books_rating", "rating"),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
     uuid = Column(String(36), unique=True, nullable=False)
     title = Column(String(200), nullable=False)
@@ -18,6 +44,34 @@ class BookModel(Base):
     description = Column(Text, nullable=True)
     image = Column(Text, nullable=True)
 
+    def fingerprint(self) -> str:
+        """Calcula a impressão digital do conteúdo do livro"""
+        return self.fingerprint_of(
+            getattr(self, field) for field in self.FINGERPRINT_FIELDS
+        )
+
+    @classmethod
+    def fingerprint_of(cls, values) -> str:
+        """
+        Impressão digital a partir dos valores de FINGERPRINT_FIELDS, na ordem.
+        Os valores são normalizados pelo tipo da coluna, então um livro recém
+        extraído, uma linha lida sem o ORM e o modelo persistido geram o mesmo
+        hash quando o conteúdo é igual.
+        """
+        columns = cls.__table__.columns
+        parts = []
+        for field, value in zip(cls.FINGERPRINT_FIELDS, values):
+            python_type = columns[field].type.python_type
+            if value is None or value == "":
+                parts.append("")
+            elif python_type is float:
+                parts.append(f"{float(value):.2f}")
+            elif python_type is int:
+                parts.append(str(int(value)))
+            else:
+                parts.append(str(value))
+        return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
     # ONLY DEBUG
     # def __repr__(self):
     #     return f"{self.title} | ID: {self.id}"
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, Integer, Text
+from ..db import Base
+
+
+class BookSourceModel(Base):
+    """URL da página de detalhe de onde cada livro foi extraído"""
+
+    __tablename__ = "book_sources"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    url = Column(Text, unique=True, nullable=False)
+    book_uuid = Column(String(36), nullable=False, index=True)
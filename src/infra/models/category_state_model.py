@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text
+from ..db import Base
+
+
+class CategoryStateModel(Base):
+    """Histórico de scraping de uma categoria, usado pelo agendador"""
+
+    __tablename__ = "category_states"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    category = Column(String(100), nullable=False, unique=True)
+    category_url = Column(Text, nullable=False)
+    last_scraped_at = Column(DateTime, nullable=True)
+    # Média móvel exponencial da fração de livros alterados por hora
+    change_rate = Column(Float, nullable=False, default=0.0)
+    # Tamanho observado no último scraping, para estimar o custo em requisições
+    pages = Column(Integer, nullable=False, default=0)
+    books = Column(Integer, nullable=False, default=0)
+    scrapes = Column(Integer, nullable=False, default=0)
+
+    def to_dict(self) -> dict:
+        return {
+            column.name: getattr(self, column.name) for column in self.__table__.columns
+        }
@@ -0,0 +1,26 @@
+from sqlalchemy import (
+    Column,
+    String,
+    Integer,
+    Boolean,
+    DateTime,
+    Text,
+    UniqueConstraint,
+)
+from ..db import Base
+import datetime
+
+
+class CrawlCheckpointModel(Base):
+    __tablename__ = "crawl_checkpoints"
+    __table_args__ = (UniqueConstraint("mode", "category"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    mode = Column(String(36), nullable=False)
+    category = Column(String(100), nullable=False)
+    category_url = Column(Text, nullable=False)
+    # Próxima página a ser buscada; nula quando a categoria foi concluída
+    next_page_url = Column(Text, nullable=True)
+    pages_done = Column(Integer, nullable=False, default=0)
+    completed = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
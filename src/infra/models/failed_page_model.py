@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, Integer, DateTime, Text
+from ..db import Base
+import datetime
+
+
+class FailedPageModel(Base):
+    """Página que falhou durante o crawl, aguardando reprocessamento"""
+
+    __tablename__ = "failed_pages"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    url = Column(Text, nullable=False, unique=True)
+    # index | listing | detail
+    kind = Column(String(36), nullable=False)
+    mode = Column(String(36), nullable=False)
+    # Categoria da listagem que falhou, para retomar a partir do checkpoint
+    category = Column(String(100), nullable=True)
+    category_url = Column(Text, nullable=True)
+    reason = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=1)
+    first_failed_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
+    last_failed_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
+
+    def to_dict(self) -> dict:
+        return {
+            column.name: getattr(self, column.name) for column in self.__table__.columns
+        }
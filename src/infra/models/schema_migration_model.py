@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from ..db import Base
+
+
+class SchemaMigrationModel(Base):
+    """Migrações de schema já aplicadas ao banco (infra/migrations.py)"""
+
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(100), nullable=False)
+    applied_at = Column(DateTime, nullable=False)
@@ -0,0 +1,47 @@
+from sqlalchemy import Column, Index, String, Integer, DateTime, Text, text
+from ..db import Base
+import datetime
+import json
+
+
+class ScrapeJobModel(Base):
+    """Job da fila de scraping, consumido pelo worker fora da API"""
+
+    __tablename__ = "scrape_jobs"
+
+    # No máximo um job pendente por tipo e modo: dois triggers simultâneos não
+    # enfileiram o mesmo job (o mode nulo conta como um valor, via COALESCE).
+    # Bancos existentes recebem o índice pelas migrações (infra/migrations.py)
+    __table_args__ = (
+        Index(
+            "ux_scrape_jobs_pending",
+            "kind",
+            text("COALESCE(mode, '')"),
+            unique=True,
+            sqlite_where=text("status = 'pending'"),
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # crawl | retry_failures
+    kind = Column(String(36), nullable=False)
+    mode = Column(String(36), nullable=True)
+    # pending | running | completed | failed
+    status = Column(String(36), nullable=False, default="pending", index=True)
+    worker = Column(String(100), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    # Atualizado periodicamente pelo worker; parado indica worker morto
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # Contagens retornadas pelo job (JSON)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+
+    def to_dict(self) -> dict:
+        data = {
+            column.name: getattr(self, column.name) for column in self.__table__.columns
+        }
+        data["result"] = json.loads(self.result) if self.result else None
+        return data
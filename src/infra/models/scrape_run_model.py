@@ -0,0 +1,37 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text
+from ..db import Base
+import json
+
+
+class ScrapeRunModel(Base):
+    """Relatório de uma execução de scraping, para acompanhar a vazão"""
+
+    __tablename__ = "scrape_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    mode = Column(String(36), nullable=False)
+    engine = Column(String(36), nullable=False)
+    # completed | incomplete | failed
+    status = Column(String(36), nullable=False)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=False)
+    duration = Column(Float, nullable=False, default=0)
+    pages = Column(Integer, nullable=False, default=0)
+    books = Column(Integer, nullable=False, default=0)
+    requests = Column(Integer, nullable=False, default=0)
+    bytes = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    inserted = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    unchanged = Column(Integer, nullable=False, default=0)
+    pages_per_second = Column(Float, nullable=False, default=0)
+    books_per_second = Column(Float, nullable=False, default=0)
+    # Relatório completo (latência, tempo por etapa...) em JSON
+    report = Column(Text, nullable=True)
+
+    def to_dict(self) -> dict:
+        data = {
+            column.name: getattr(self, column.name) for column in self.__table__.columns
+        }
+        data["report"] = json.loads(self.report) if self.report else {}
+        return data
@@ -0,0 +1,254 @@
+from nest.core import Injectable
+from sqlalchemy import and_, column, func, or_, select, table, text
+from typing import Optional
+import re
+from ...models.book_model import BookModel
+from ...db import get_async_engine, get_async_sessionmaker
+
+# Tabela FTS5 criada pela migração books_full_text_search (só no SQLite)
+books_fts = table("books_fts", column("rowid"))
+
+# Termos considerados na busca textual
+SEARCH_MAX_TERMS = 10
+
+
+def search_terms(query: str) -> list[str]:
+    """Palavras da busca, sem a sintaxe de consulta do FTS5"""
+    return re.findall(r"\w+", query.lower())[:SEARCH_MAX_TERMS]
+
+
+def fts_query(terms: list[str]) -> str:
+    """Consulta FTS5: todos os termos, cada um como prefixo ("pyth"*)"""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+@Injectable
+class AsyncBookRepository:
+    """
+    Leituras de livros pelo engine assíncrono, para os endpoints da API.
+    As consultas são as mesmas do BookRepository, mas não ocupam uma thread
+    do threadpool do FastAPI enquanto esperam o banco. A escrita continua no
+    BookRepository (síncrono), usado pelo scraping.
+    """
+
+    def __init__(self):
+        self.session = get_async_sessionmaker()
+        self.dialect = get_async_engine().dialect.name
+
+    async def __all(self, statement, fields: Optional[list[str]] = None) -> list:
+        """
+        Executa a consulta de livros. Com fields, o SELECT lê só essas colunas
+        (e o id), sem montar objetos do ORM, e cada livro vem como dicionário;
+        description e image não são lidas se não forem pedidas. Sem fields,
+        retorna os modelos completos.
+        """
+        if fields:
+            columns = [BookModel.id] + [
+                getattr(BookModel, field) for field in fields if field != "id"
+            ]
+            async with self.session() as session:
+                result = await session.execute(statement.with_only_columns(*columns))
+                return [dict(row) for row in result.mappings()]
+        async with self.session() as session:
+            return list(await session.scalars(statement))
+
+    async def list_all(self, fields: Optional[list[str]] = None) -> list:
+        """
+        Lista todos os livros no banco de dados.
+        """
+        # Ordem explícita: com poucos campos o SQLite pode ler por outro índice
+        return await self.__all(select(BookModel).order_by(BookModel.id), fields)
+
+    async def list_after(
+        self, after_id: int, limit: int, fields: Optional[list[str]] = None
+    ) -> list:
+        """
+        Página por keyset: os próximos livros com id maior que after_id, em
+        ordem de id. Usa a chave primária, então o custo não depende da
+        profundidade da página.
+        """
+        return await self.__all(
+            select(BookModel)
+            .where(BookModel.id > after_id)
+            .order_by(BookModel.id)
+            .limit(limit),
+            fields,
+        )
+
+    async def list_offset(
+        self, offset: int, limit: int, fields: Optional[list[str]] = None
+    ) -> list:
+        """
+        Página por número (LIMIT/OFFSET), mantida para ?page=&size=
+        """
+        return await self.__all(
+            select(BookModel).order_by(BookModel.id).offset(offset).limit(limit), fields
+        )
+
+    async def count_all(self) -> int:
+        """
+        Total de livros (COUNT pelo menor índice da tabela).
+        """
+        async with self.session() as session:
+            return await session.scalar(select(func.count()).select_from(BookModel))
+
+    async def search(
+        self,
+        query: str,
+        category: Optional[str],
+        limit: int,
+        offset: int,
+        fields: Optional[list[str]] = None,
+    ) -> list:
+        """
+        Busca textual em título e descrição, com correspondência por prefixo
+        em todos os termos, ordenada por relevância (BM25, título com peso
+        maior). No SQLite usa o índice FTS5 books_fts; em outros bancos,
+        LIKE em título e descrição, ordenado por id.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return []
+
+        if self.dialect == "sqlite":
+            statement = (
+                select(BookModel)
+                .join(books_fts, books_fts.c.rowid == BookModel.id)
+                .where(
+                    text("books_fts MATCH :query").bindparams(query=fts_query(terms))
+                )
+                .order_by(text("bm25(books_fts, 10.0, 1.0)"), BookModel.id)
+            )
+        else:
+            statement = (
+                select(BookModel)
+                .where(
+                    *(
+                        or_(
+                            BookModel.title.ilike(f"%{term}%"),
+                            BookModel.description.ilike(f"%{term}%"),
+                        )
+                        for term in terms
+                    )
+                )
+                .order_by(BookModel.id)
+            )
+        if category:
+            statement = statement.where(BookModel.category == category)
+        return await self.__all(statement.limit(limit).offset(offset), fields)
+
+    async def get_by_id(self, book_int: int) -> BookModel:
+        """
+        Retorna um livro pelo ID.
+        Exemplo: /books/1
+        """
+        async with self.session() as session:
+            return await session.get(BookModel, book_int)
+
+    async def list_bycategory(
+        self, category: str, fields: Optional[list[str]] = None
+    ) -> list:
+        """
+        Lista livros por categoria.
+        Exemplo: /books/search?category={Category}
+        """
+        return await self.__all(
+            select(BookModel).where(BookModel.category == category), fields
+        )
+
+    async def list_bytitle(
+        self, title: str, fields: Optional[list[str]] = None
+    ) -> list:
+        """
+        Lista livros por título.
+        Exemplo: /books/search?title={Title}
+        """
+        return await self.__all(
+            select(BookModel).where(BookModel.title == title), fields
+        )
+
+    async def list_bycategoryandtitle(
+        self, title: str, category: str, fields: Optional[list[str]] = None
+    ) -> list:
+        """
+        Lista livros por título e categoria.
+        Exemplo: /books/search?title={Title}&category={Category}
+        """
+        return await self.__all(
+            select(BookModel).where(
+                and_(BookModel.category == category, BookModel.title == title)
+            ),
+            fields,
+        )
+
+    async def get_top_rated_books(self, fields: Optional[list[str]] = None) -> list:
+        """
+        Retorna uma lista de livros bem avaliados (exemplo: rating >= 4).
+        """
+        return await self.__all(
+            select(BookModel)
+            .where(BookModel.rating >= 4)
+            .order_by(BookModel.rating.desc()),
+            fields,
+        )
+
+    async def list_by_price_range(
+        self, min_price: float, max_price: float, fields: Optional[list[str]] = None
+    ) -> list:
+        """
+        Lista livros dentro de um intervalo de preços.
+        Exemplo: /books/price-range?min_price=10.0&max_price=50.0
+        """
+        return await self.__all(
+            select(BookModel)
+            .where(
+                BookModel.price_incl_tax >= min_price,
+                BookModel.price_incl_tax <= max_price,
+            )
+            .order_by(BookModel.price_incl_tax),
+            fields,
+        )
+
+    async def list_categories(self) -> list[str]:
+        """
+        Lista as categorias distintas (índice de cobertura em category, title).
+        """
+        async with self.session() as session:
+            return list(await session.scalars(select(BookModel.category).distinct()))
+
+    async def count_by_rating(self) -> dict:
+        """
+        Total de livros, preço somado de todos eles e quantidade por rating.
+        Retorna {"total": int, "total_price": float, "ratings": {rating: int}}.
+        """
+        async with self.session() as session:
+            total, total_price = (
+                await session.execute(
+                    select(
+                        func.count(),
+                        func.coalesce(func.sum(BookModel.price_incl_tax), 0.0),
+                    )
+                )
+            ).one()
+            ratings = await session.execute(
+                select(BookModel.rating, func.count()).group_by(BookModel.rating)
+            )
+            return {
+                "total": total,
+                "total_price": total_price,
+                "ratings": {rating: count for rating, count in ratings},
+            }
+
+    async def price_by_category(self) -> dict[str, tuple[int, float]]:
+        """
+        Quantidade de livros e preço somado por categoria.
+        """
+        async with self.session() as session:
+            rows = await session.execute(
+                select(
+                    BookModel.category,
+                    func.count(),
+                    func.coalesce(func.sum(BookModel.price_incl_tax), 0.0),
+                ).group_by(BookModel.category)
+            )
+            return {category: (count, total) for category, count, total in rows}
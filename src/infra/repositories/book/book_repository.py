@@ -1,24 +1,241 @@
 from nest.core import Injectable
-from sqlalchemy import and_
+from sqlalchemy import Row, and_, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+import os
 from ...models.book_model import BookModel
+from ...models.book_source_model import BookSourceModel
 from ...db import SessionLocal
 
 
 @Injectable
 class BookRepository:
+    # Dialetos com INSERT ... ON CONFLICT nativo
+    UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+    # Colunas que a página de listagem atualiza (o título primeiro)
+    LISTING_FIELDS = (
+        "title",
+        "rating",
+        "price_incl_tax",
+        "price_excl_tax",
+        "availability",
+    )
+
     def __init__(self):
-        pass
+        # Livros por comando na escrita em lote (limita parâmetros e memória)
+        self.chunk_size = max(1, int(os.environ.get("DATABASE_WRITE_CHUNK_SIZE", 500)))
+
+    def __chunks(self, items: list) -> list:
+        return [
+            items[start : start + self.chunk_size]
+            for start in range(0, len(items), self.chunk_size)
+        ]
+
+    def __insert_new(self, session: Session, rows: list[dict]):
+        """
+        Insere as linhas ignorando uuids que já existem, com ON CONFLICT no
+        SQLite/PostgreSQL (protege contra workers de shards diferentes
+        inserindo o mesmo livro). Nos demais bancos, consulta os uuids
+        existentes uma vez por lote.
+        """
+        dialect_insert = self.UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+        for chunk in self.__chunks(rows):
+            if dialect_insert:
+                statement = dialect_insert(BookModel).on_conflict_do_nothing(
+                    index_elements=[BookModel.uuid]
+                )
+            else:
+                existing = set(
+                    session.scalars(
+                        select(BookModel.uuid).where(
+                            BookModel.uuid.in_({row["uuid"] for row in chunk})
+                        )
+                    )
+                )
+                chunk = [row for row in chunk if row["uuid"] not in existing]
+                if not chunk:
+                    continue
+                statement = insert(BookModel)
+            session.execute(statement, chunk)
 
-    def create_many(self, books_data: list[BookModel]):
+    def create_many(self, books_data: list):
         """
         Insere vários livros no banco de dados, evitando duplicatas.
+        Aceita modelos ou registros com as_row() (BookRecord) e grava em
+        lotes de DATABASE_WRITE_CHUNK_SIZE, sem uma consulta por livro.
+        """
+        columns = [column.name for column in BookModel.__table__.columns]
+        rows = {}
+        for book in books_data:
+            if hasattr(book, "as_row"):
+                row = book.as_row()
+            else:
+                row = {name: getattr(book, name) for name in columns if name != "id"}
+            # Mantém o primeiro livro de cada uuid, como a versão anterior
+            rows.setdefault(row["uuid"], row)
+
+        with SessionLocal() as session:
+            self.__insert_new(session, list(rows.values()))
+            session.commit()
+
+    def upsert_many(self, records: list) -> dict:
+        """
+        Insere livros novos e atualiza apenas os que tiveram o conteúdo alterado,
+        comparando a impressão digital do livro extraído com a da linha salva.
+        Recebe registros com uuid, fingerprint() e as_row() (BookRecord) e
+        escreve em lotes de DATABASE_WRITE_CHUNK_SIZE, sem criar um objeto do
+        ORM por livro: uma consulta dos livros salvos e um comando de escrita
+        por lote.
+        Retorna a contagem de livros inseridos, atualizados e inalterados, e
+        os uuids dos inseridos e atualizados em "changed".
         """
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "changed": []}
+        if not records:
+            return counts
+
+        # O mesmo livro pode aparecer duas vezes no lote; vale o último
+        latest = {record.uuid: record for record in records}
+        counts["unchanged"] += len(records) - len(latest)
+        columns = [getattr(BookModel, field) for field in BookModel.FINGERPRINT_FIELDS]
+
         with SessionLocal() as session:
-            for book in books_data:
-                # Verifica se o UUID já existe no banco
-                exists = session.query(BookModel).filter_by(uuid=book.uuid).first()
-                if not exists:
-                    session.add(book)  # Insere apenas se não existir
+            inserts, updates = [], []
+            for chunk in self.__chunks(list(latest.values())):
+                stored = {
+                    row[1]: (row[0], BookModel.fingerprint_of(row[2:]))
+                    for row in session.execute(
+                        select(BookModel.id, BookModel.uuid, *columns).where(
+                            BookModel.uuid.in_([record.uuid for record in chunk])
+                        )
+                    )
+                }
+                for record in chunk:
+                    row = stored.get(record.uuid)
+                    if row is None:
+                        inserts.append(record.as_row())
+                        counts["inserted"] += 1
+                        counts["changed"].append(record.uuid)
+                    elif row[1] != record.fingerprint():
+                        updates.append({"id": row[0], **record.as_row()})
+                        counts["updated"] += 1
+                        counts["changed"].append(record.uuid)
+                    else:
+                        counts["unchanged"] += 1
+
+            if inserts:
+                self.__insert_new(session, inserts)
+            for chunk in self.__chunks(updates):
+                # UPDATE em lote pela chave primária
+                session.execute(update(BookModel), chunk)
+            session.commit()
+
+        return counts
+
+    def refresh_from_listing(self, listed_books: list) -> dict:
+        """
+        Atualiza preço, rating, título e estoque de livros já conhecidos com os
+        dados da página de listagem, sem a página de detalhe. Como a listagem
+        não traz a quantidade em estoque, ela só é zerada quando o livro
+        aparece como esgotado. Recebe ListingRefresh (uuid, title, price,
+        rating, in_stock). Como em upsert_many, lê só as colunas da impressão
+        digital e grava os alterados com um UPDATE em lote por
+        DATABASE_WRITE_CHUNK_SIZE livros, sem objetos do ORM.
+        Retorna a contagem de atualizados e inalterados, e os uuids dos
+        atualizados em "changed".
+        """
+        counts = {"updated": 0, "unchanged": 0, "changed": []}
+        if not listed_books:
+            return counts
+
+        fields = BookModel.FINGERPRINT_FIELDS
+        columns = [getattr(BookModel, field) for field in fields]
+
+        def fingerprint(book: dict) -> str:
+            return BookModel.fingerprint_of(book[field] for field in fields)
+
+        with SessionLocal() as session:
+            stored = {}
+            for chunk in self.__chunks(list({book.uuid for book in listed_books})):
+                for row in session.execute(
+                    select(BookModel.id, BookModel.uuid, *columns).where(
+                        BookModel.uuid.in_(chunk)
+                    )
+                ):
+                    stored[row[1]] = {"id": row[0], **dict(zip(fields, row[2:]))}
+
+            titles = {uuid: book["title"] for uuid, book in stored.items()}
+            updates = {}
+            for listed in listed_books:
+                book = stored.get(listed.uuid)
+                if book is None:
+                    continue
+                before = fingerprint(book)
+                book["title"] = listed.title
+                book["rating"] = listed.rating
+                if listed.price:
+                    book["price_incl_tax"] = listed.price
+                    book["price_excl_tax"] = round(listed.price - (book["tax"] or 0), 2)
+                if not listed.in_stock:
+                    book["availability"] = 0
+                if fingerprint(book) != before:
+                    updates[listed.uuid] = book
+                    counts["updated"] += 1
+                    counts["changed"].append(listed.uuid)
+                else:
+                    counts["unchanged"] += 1
+
+            # O título só entra no UPDATE quando mudou: reescrevê-lo dispara o
+            # trigger que reindexa o livro na busca textual
+            for retitled in (True, False):
+                written = self.LISTING_FIELDS if retitled else self.LISTING_FIELDS[1:]
+                rows = [
+                    {"id": book["id"], **{field: book[field] for field in written}}
+                    for uuid, book in updates.items()
+                    if (book["title"] != titles[uuid]) == retitled
+                ]
+                for chunk in self.__chunks(rows):
+                    # UPDATE em lote pela chave primária
+                    session.execute(update(BookModel), chunk)
+            session.commit()
+
+        return counts
+
+    def find_by_source_urls(self, urls: list[str]) -> dict[str, Row]:
+        """
+        Retorna os livros já salvos extraídos das URLs informadas, indexados
+        pela URL da página de detalhe. Só carrega o que a separação da
+        listagem usa: linhas leves com uuid e availability, sem montar o
+        BookModel inteiro.
+        """
+        if not urls:
+            return {}
+        with SessionLocal() as session:
+            rows = session.execute(
+                select(BookSourceModel.url, BookModel.uuid, BookModel.availability)
+                .join(BookModel, BookModel.uuid == BookSourceModel.book_uuid)
+                .where(BookSourceModel.url.in_(set(urls)))
+            )
+            return {row.url: row for row in rows}
+
+    def save_sources(self, sources: dict[str, str]):
+        """
+        Registra a URL de origem (página de detalhe) de cada livro.
+        Recebe um dicionário URL -> uuid do livro.
+        """
+        if not sources:
+            return
+        with SessionLocal() as session:
+            existing = {
+                source.url: source
+                for source in session.query(BookSourceModel).filter(
+                    BookSourceModel.url.in_(set(sources))
+                )
+            }
+            for url, book_uuid in sources.items():
+                if url in existing:
+                    existing[url].book_uuid = book_uuid
+                else:
+                    session.add(BookSourceModel(url=url, book_uuid=book_uuid))
             session.commit()
 
     def list_all(self) -> list[BookModel]:
@@ -71,7 +288,7 @@ class BookRepository:
         with SessionLocal() as session:
             return (
                 session.query(BookModel)
-                .filter(BookModel.id >= 4)
+                .filter(BookModel.rating >= 4)
                 .order_by(BookModel.rating.desc())
                 .all()
             )
@@ -1,7 +1,11 @@
 from nest.core import Module
 from .book_repository import BookRepository
+from .async_book_repository import AsyncBookRepository
 
 
-@Module(providers=[BookRepository], exports=[BookRepository])
+@Module(
+    providers=[BookRepository, AsyncBookRepository],
+    exports=[BookRepository, AsyncBookRepository],
+)
 class BookRepositoryModule:
     pass
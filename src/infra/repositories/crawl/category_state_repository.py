@@ -0,0 +1,58 @@
+from nest.core import Injectable
+from ...models.category_state_model import CategoryStateModel
+from ...db import SessionLocal
+import datetime
+
+
+@Injectable
+class CategoryStateRepository:
+    def __init__(self):
+        pass
+
+    def list_all(self) -> dict[str, CategoryStateModel]:
+        """
+        Retorna o estado de todas as categorias já percorridas, pelo nome.
+        """
+        with SessionLocal() as session:
+            return {
+                state.category: state
+                for state in session.query(CategoryStateModel).all()
+            }
+
+    def record(
+        self,
+        category: str,
+        category_url: str,
+        scraped_at: datetime.datetime,
+        pages: int,
+        books: int,
+        changed: int,
+        alpha: float,
+    ):
+        """
+        Registra um scraping concluído da categoria e atualiza a taxa de
+        alteração (média móvel exponencial de livros alterados / hora).
+        O primeiro scraping só define a base: todos os livros são novos.
+        """
+        with SessionLocal() as session:
+            state = (
+                session.query(CategoryStateModel).filter_by(category=category).first()
+            )
+            if not state:
+                state = CategoryStateModel(
+                    category=category,
+                    category_url=category_url,
+                    change_rate=0.0,
+                    scrapes=0,
+                )
+                session.add(state)
+            elif state.last_scraped_at and books:
+                hours = (scraped_at - state.last_scraped_at).total_seconds() / 3600
+                observed = (changed / books) / max(hours, 1 / 60)
+                state.change_rate = alpha * observed + (1 - alpha) * state.change_rate
+            state.category_url = category_url
+            state.last_scraped_at = scraped_at
+            state.pages = pages
+            state.books = books
+            state.scrapes += 1
+            session.commit()
@@ -0,0 +1,7 @@
+from nest.core import Module
+from .category_state_repository import CategoryStateRepository
+
+
+@Module(providers=[CategoryStateRepository], exports=[CategoryStateRepository])
+class CategoryStateRepositoryModule:
+    pass
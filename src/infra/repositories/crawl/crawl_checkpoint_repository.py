@@ -0,0 +1,62 @@
+from nest.core import Injectable
+from ...models.crawl_checkpoint_model import CrawlCheckpointModel
+from ...db import SessionLocal
+from typing import Optional
+import datetime
+
+
+@Injectable
+class CrawlCheckpointRepository:
+    def __init__(self):
+        pass
+
+    def list_by_mode(self, mode: str) -> dict[str, CrawlCheckpointModel]:
+        """
+        Retorna os checkpoints do modo de crawl, indexados pela categoria.
+        """
+        with SessionLocal() as session:
+            checkpoints = session.query(CrawlCheckpointModel).filter_by(mode=mode).all()
+            return {checkpoint.category: checkpoint for checkpoint in checkpoints}
+
+    def save_page(
+        self,
+        mode: str,
+        category: str,
+        category_url: str,
+        next_page_url: str,
+        pages_done: int,
+    ):
+        """
+        Registra a última página concluída de uma categoria.
+        Sem próxima página, a categoria é marcada como concluída.
+        """
+        with SessionLocal() as session:
+            checkpoint = (
+                session.query(CrawlCheckpointModel)
+                .filter_by(mode=mode, category=category)
+                .first()
+            )
+            if not checkpoint:
+                checkpoint = CrawlCheckpointModel(
+                    mode=mode, category=category, category_url=category_url
+                )
+                session.add(checkpoint)
+            checkpoint.next_page_url = next_page_url
+            checkpoint.pages_done = pages_done
+            checkpoint.completed = next_page_url is None
+            checkpoint.updated_at = datetime.datetime.utcnow()
+            session.commit()
+
+    def clear(self, mode: str, categories: Optional[list[str]] = None):
+        """
+        Remove os checkpoints das categorias (sem categorias, todos os do
+        modo), iniciando um novo crawl do zero.
+        """
+        with SessionLocal() as session:
+            query = session.query(CrawlCheckpointModel).filter(
+                CrawlCheckpointModel.mode == mode
+            )
+            if categories is not None:
+                query = query.filter(CrawlCheckpointModel.category.in_(categories))
+            query.delete(synchronize_session=False)
+            session.commit()
@@ -0,0 +1,7 @@
+from nest.core import Module
+from .crawl_checkpoint_repository import CrawlCheckpointRepository
+
+
+@Module(providers=[CrawlCheckpointRepository], exports=[CrawlCheckpointRepository])
+class CrawlCheckpointRepositoryModule:
+    pass
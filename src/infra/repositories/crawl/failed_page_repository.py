@@ -0,0 +1,86 @@
+from nest.core import Injectable
+from ...models.failed_page_model import FailedPageModel
+from ...db import SessionLocal
+import datetime
+
+
+@Injectable
+class FailedPageRepository:
+    def __init__(self):
+        pass
+
+    def record(
+        self,
+        url: str,
+        kind: str,
+        mode: str,
+        reason: str,
+        category: str = None,
+        category_url: str = None,
+    ):
+        """
+        Registra a falha de uma página. Se a URL já estava na fila, só
+        atualiza o motivo e soma uma tentativa.
+        """
+        with SessionLocal() as session:
+            failed_page = session.query(FailedPageModel).filter_by(url=url).first()
+            now = datetime.datetime.utcnow()
+            if not failed_page:
+                session.add(
+                    FailedPageModel(
+                        url=url,
+                        kind=kind,
+                        mode=mode,
+                        category=category,
+                        category_url=category_url,
+                        reason=reason,
+                        attempts=1,
+                        first_failed_at=now,
+                        last_failed_at=now,
+                    )
+                )
+            else:
+                failed_page.reason = reason
+                failed_page.attempts += 1
+                failed_page.last_failed_at = now
+                failed_page.category = category or failed_page.category
+                failed_page.category_url = category_url or failed_page.category_url
+            session.commit()
+
+    def list_all(self) -> list[FailedPageModel]:
+        """
+        Lista a fila de páginas com falha, das mais recentes para as antigas.
+        """
+        with SessionLocal() as session:
+            return (
+                session.query(FailedPageModel)
+                .order_by(FailedPageModel.last_failed_at.desc())
+                .all()
+            )
+
+    def list_retryable(self, max_attempts: int) -> list[FailedPageModel]:
+        """
+        Lista as páginas que ainda não atingiram o limite de tentativas.
+        """
+        with SessionLocal() as session:
+            return (
+                session.query(FailedPageModel)
+                .filter(FailedPageModel.attempts < max_attempts)
+                .order_by(FailedPageModel.id)
+                .all()
+            )
+
+    def resolve(self, urls: list[str]) -> int:
+        """
+        Remove da fila as páginas que foram processadas com sucesso.
+        """
+        if not urls:
+            return 0
+        with SessionLocal() as session:
+            removed = (
+                session.query(FailedPageModel)
+                .filter(FailedPageModel.url.in_(urls))
+                .delete(synchronize_session=False)
+            )
+            session.commit()
+            return removed
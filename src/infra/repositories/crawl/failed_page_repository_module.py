@@ -0,0 +1,7 @@
+from nest.core import Module
+from .failed_page_repository import FailedPageRepository
+
+
+@Module(providers=[FailedPageRepository], exports=[FailedPageRepository])
+class FailedPageRepositoryModule:
+    pass
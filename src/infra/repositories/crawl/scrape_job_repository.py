@@ -0,0 +1,200 @@
+from nest.core import Injectable
+from sqlalchemy import and_, select, update
+from sqlalchemy.exc import IntegrityError
+from ...models.scrape_job_model import ScrapeJobModel
+from ...db import SessionLocal
+import datetime
+import json
+
+
+@Injectable
+class ScrapeJobRepository:
+    def __init__(self):
+        pass
+
+    def enqueue(self, kind: str, mode: str = None) -> tuple[ScrapeJobModel, bool]:
+        """
+        Adiciona um job à fila. Se já houver um job pendente igual, ele é
+        reaproveitado; retorna o job e se ele foi criado agora.
+        O índice único ux_scrape_jobs_pending impede que dois triggers
+        simultâneos criem o mesmo job: o que perde a corrida recebe o job
+        criado pelo outro.
+        """
+        with SessionLocal() as session:
+            while True:
+                pending = (
+                    session.query(ScrapeJobModel)
+                    .filter_by(kind=kind, mode=mode, status="pending")
+                    .order_by(ScrapeJobModel.id)
+                    .first()
+                )
+                if pending:
+                    return pending, False
+                job = ScrapeJobModel(kind=kind, mode=mode, status="pending")
+                session.add(job)
+                try:
+                    session.commit()
+                except IntegrityError:
+                    # Outro trigger enfileirou o mesmo job entre a consulta e
+                    # o INSERT; a próxima volta o encontra pendente
+                    session.rollback()
+                    continue
+                session.refresh(job)
+                return job, True
+
+    def requeue_stale(self, stale_before: datetime.datetime) -> int:
+        """
+        Devolve à fila os jobs em execução cujo worker parou de enviar
+        heartbeat (processo encerrado no meio do job). Só um job por
+        (kind, mode) pode ficar pendente (ux_scrape_jobs_pending): se já houver
+        um igual na fila, ou se vários parados forem iguais, os demais são
+        encerrados como falha e o job pendente faz o trabalho deles.
+        """
+        with SessionLocal() as session:
+            while True:
+                stale = session.execute(
+                    select(ScrapeJobModel.id, ScrapeJobModel.kind, ScrapeJobModel.mode)
+                    .where(
+                        ScrapeJobModel.status == "running",
+                        ScrapeJobModel.heartbeat_at < stale_before,
+                    )
+                    .order_by(ScrapeJobModel.id)
+                ).all()
+                if not stale:
+                    return 0
+                queued = {
+                    (kind, mode or "")
+                    for kind, mode in session.execute(
+                        select(ScrapeJobModel.kind, ScrapeJobModel.mode).where(
+                            ScrapeJobModel.status == "pending"
+                        )
+                    )
+                }
+                requeue, coalesced = [], []
+                for job_id, kind, mode in stale:
+                    if (kind, mode or "") in queued:
+                        coalesced.append(job_id)
+                    else:
+                        queued.add((kind, mode or ""))
+                        requeue.append(job_id)
+
+                # Condicional ao status: o job pode ter terminado nesse meio tempo
+                running = ScrapeJobModel.status == "running"
+                requeued = session.execute(
+                    update(ScrapeJobModel)
+                    .where(ScrapeJobModel.id.in_(requeue), running)
+                    .values(status="pending", worker=None)
+                ).rowcount
+                session.execute(
+                    update(ScrapeJobModel)
+                    .where(ScrapeJobModel.id.in_(coalesced), running)
+                    .values(
+                        status="failed",
+                        finished_at=datetime.datetime.utcnow(),
+                        error="Worker parou; um job igual já estava na fila",
+                    )
+                )
+                try:
+                    session.commit()
+                except IntegrityError:
+                    # Um trigger enfileirou um job igual entre a consulta e o
+                    # UPDATE; a próxima volta o encontra pendente
+                    session.rollback()
+                    continue
+                return requeued
+
+    def claim(self, worker: str) -> ScrapeJobModel | None:
+        """
+        Reserva o job pendente mais antigo para o worker.
+        Jobs iguais a um que já está em execução esperam ele terminar, e a
+        reserva é condicional ao status, então dois workers nunca pegam o
+        mesmo job.
+        """
+        with SessionLocal() as session:
+            running = {
+                (job.kind, job.mode)
+                for job in session.query(ScrapeJobModel).filter_by(status="running")
+            }
+            pending = (
+                session.query(ScrapeJobModel)
+                .filter_by(status="pending")
+                .order_by(ScrapeJobModel.id)
+                .all()
+            )
+            for job in pending:
+                if (job.kind, job.mode) in running:
+                    continue
+                now = datetime.datetime.utcnow()
+                claimed = session.execute(
+                    update(ScrapeJobModel)
+                    .where(
+                        and_(
+                            ScrapeJobModel.id == job.id,
+                            ScrapeJobModel.status == "pending",
+                        )
+                    )
+                    .values(
+                        status="running",
+                        worker=worker,
+                        started_at=now,
+                        heartbeat_at=now,
+                    )
+                ).rowcount
+                session.commit()
+                if claimed:
+                    return session.get(ScrapeJobModel, job.id, populate_existing=True)
+            return None
+
+    def heartbeat(self, job_id: int):
+        with SessionLocal() as session:
+            session.execute(
+                update(ScrapeJobModel)
+                .where(ScrapeJobModel.id == job_id)
+                .values(heartbeat_at=datetime.datetime.utcnow())
+            )
+            session.commit()
+
+    def finish(self, job_id: int, status: str, result: dict = None, error: str = None):
+        """
+        Registra o fim do job com o resultado ou o erro.
+        """
+        with SessionLocal() as session:
+            session.execute(
+                update(ScrapeJobModel)
+                .where(ScrapeJobModel.id == job_id)
+                .values(
+                    status=status,
+                    finished_at=datetime.datetime.utcnow(),
+                    result=json.dumps(result) if result is not None else None,
+                    error=error,
+                )
+            )
+            session.commit()
+
+    def last_created(self, kind: str, mode: str = None) -> ScrapeJobModel | None:
+        """
+        Retorna o job mais recente do tipo e modo informados.
+        """
+        with SessionLocal() as session:
+            return (
+                session.query(ScrapeJobModel)
+                .filter_by(kind=kind, mode=mode)
+                .order_by(ScrapeJobModel.id.desc())
+                .first()
+            )
+
+    def get(self, job_id: int) -> ScrapeJobModel | None:
+        with SessionLocal() as session:
+            return session.get(ScrapeJobModel, job_id)
+
+    def list_recent(self, limit: int = 20) -> list[ScrapeJobModel]:
+        """
+        Lista os jobs mais recentes primeiro.
+        """
+        with SessionLocal() as session:
+            return (
+                session.query(ScrapeJobModel)
+                .order_by(ScrapeJobModel.id.desc())
+                .limit(limit)
+                .all()
+            )
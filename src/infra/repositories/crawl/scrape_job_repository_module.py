@@ -0,0 +1,7 @@
+from nest.core import Module
+from .scrape_job_repository import ScrapeJobRepository
+
+
+@Module(providers=[ScrapeJobRepository], exports=[ScrapeJobRepository])
+class ScrapeJobRepositoryModule:
+    pass
@@ -0,0 +1,32 @@
+from nest.core import Injectable
+from ...models.scrape_run_model import ScrapeRunModel
+from ...db import SessionLocal
+
+
+@Injectable
+class ScrapeRunRepository:
+    def __init__(self):
+        pass
+
+    def create(self, run: ScrapeRunModel) -> ScrapeRunModel:
+        """
+        Salva o relatório de uma execução de scraping.
+        """
+        with SessionLocal() as session:
+            session.add(run)
+            session.commit()
+            session.refresh(run)
+            return run
+
+    def list_recent(self, limit: int = 20) -> list[ScrapeRunModel]:
+        """
+        Lista as execuções mais recentes primeiro.
+        Exemplo: /scraping/runs?limit=20
+        """
+        with SessionLocal() as session:
+            return (
+                session.query(ScrapeRunModel)
+                .order_by(ScrapeRunModel.id.desc())
+                .limit(limit)
+                .all()
+            )
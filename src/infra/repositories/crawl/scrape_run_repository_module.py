@@ -0,0 +1,7 @@
+from nest.core import Module
+from .scrape_run_repository import ScrapeRunRepository
+
+
+@Module(providers=[ScrapeRunRepository], exports=[ScrapeRunRepository])
+class ScrapeRunRepositoryModule:
+    pass
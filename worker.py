@@ -0,0 +1,42 @@
+"""
+Worker de scraping: consome a fila de jobs criada por /scraping/trigger.
+
+    python worker.py          # fica aguardando jobs
+    python worker.py --once   # executa os jobs pendentes e encerra
+
+Use SCRAPING_WORKER_MODE=external na API quando o worker rodar separado.
+"""
+
+import argparse
+
+from dotenv import load_dotenv
+
+# Antes de importar a aplicação: o banco é configurado na importação
+load_dotenv()
+
+from src.domain.scraping.scrape_worker import ScrapeWorker  # noqa: E402
+from src.infra.migrations import run_migrations  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Worker da fila de scraping")
+    parser.add_argument(
+        "--once", action="store_true", help="executa os jobs pendentes e encerra"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    run_migrations()
+
+    worker = ScrapeWorker()
+    if args.once:
+        while worker.run_once():
+            pass
+    else:
+        worker.run_forever()
+
+
+if __name__ == "__main__":
+    main()